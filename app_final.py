@@ -1,8 +1,18 @@
 import streamlit as st
-import numpy as np
-# import matplotlib.pyplot as plt # Matplotlib 대신 Plotly 사용
-import plotly.graph_objects as go # Plotly 사용
-import scipy.stats as stats
+# import matplotlib.pyplot as plt # Matplotlib 대신 Plotly 사용 (statkit.figures)
+
+from statkit.analysis import AnalysisOptions, InputError, analyze_file, analyze_text, expected_laps
+from statkit.figures import PLOT_MODE_DECIMATE, PLOT_MODE_DENSITY, build_correlation_heatmap, build_scatter_figure
+from statkit.ingest import detect_format, read_column_names
+from statkit.multivar import CrossStats
+from statkit.parsing import parse_table
+from statkit.payload import array_preview
+from statkit.profiling import DEFAULT_LOG_PATH, ProfileCapture, StageTimer, append_jsonl, stop_finished
+from statkit.rank_corr import rank_correlations
+from statkit.resampling import DEFAULT_RESAMPLES
+from statkit.robust import MAX_POINTS as ROBUST_MAX_POINTS
+from statkit.result_cache import ResultCache, content_key
+from statkit.workers import POLL_SECONDS, AnalysisPool, Cancelled, PoolBusy
 
 # --- 웹 페이지 기본 설정 ---
 st.set_page_config(page_title="학생용 통계 분석 웹 프로그램", layout="wide")
@@ -22,117 +32,303 @@ with col_var_name2:
 
 st.write("---") # 구분선 추가
 
-# X, Y 값 입력 (예전처럼 통합된 텍스트 영역 사용)
-col_data_input1, col_data_input2 = st.columns(2)
-with col_data_input1:
-    x_data_str = st.text_area(f"{x_var_name} 값 입력 (각 값은 Enter을 눌러 줄바꿈, X와 Y값은 쌍을 지어 나열):", height=150, key="x_data_text_area")
-with col_data_input2:
-    y_data_str = st.text_area(f"{y_var_name} 값 입력 (각 값은 Enter을 눌러 줄바꿈, X와 Y값은 쌍을 지어 나열):", height=150, key="y_data_text_area")
+# 데이터 입력 방식 선택 (직접 붙여넣기 또는 큰 데이터용 파일 업로드)
+INPUT_TEXT = "직접 입력 (붙여넣기)"
+INPUT_FILE = "파일 업로드 (CSV/TSV/Parquet)"
+INPUT_TABLE = "여러 변수 (표 붙여넣기)"
+input_mode = st.radio("데이터 입력 방식:", [INPUT_TEXT, INPUT_FILE, INPUT_TABLE], horizontal=True, key="input_mode")
+
+x_data_str = ""
+y_data_str = ""
+group_str = ""
+table_str = ""
+uploaded_file = None
+group_column = None
+if input_mode == INPUT_TABLE:
+    # 설문 문항처럼 변수가 여러 개일 때: 첫 줄은 변수명, 다음 줄부터 응답 (엑셀에서 복사하면 탭으로 구분됨)
+    table_str = st.text_area("표 입력 (첫 줄은 변수명, 값은 탭 또는 쉼표로 구분):", height=200, key="table_text_area")
+elif input_mode == INPUT_TEXT:
+    # X, Y 값 입력 (예전처럼 통합된 텍스트 영역 사용)
+    col_data_input1, col_data_input2 = st.columns(2)
+    with col_data_input1:
+        x_data_str = st.text_area(f"{x_var_name} 값 입력 (각 값은 Enter을 눌러 줄바꿈, X와 Y값은 쌍을 지어 나열):", height=150, key="x_data_text_area")
+    with col_data_input2:
+        y_data_str = st.text_area(f"{y_var_name} 값 입력 (각 값은 Enter을 눌러 줄바꿈, X와 Y값은 쌍을 지어 나열):", height=150, key="y_data_text_area")
+    # 반, 성별처럼 나눠서 비교하고 싶을 때만 입력 (비워 두면 그룹별 분석은 하지 않음)
+    group_str = st.text_area("그룹 입력 (선택, 예: 1반/2반, 남/여 - X, Y 값과 같은 줄에 하나씩):", height=100, key="group_text_area")
+else:
+    # 파일은 덩어리 단위로 읽으므로 학년/학교 전체 자료도 메모리 걱정 없이 분석 가능
+    uploaded_file = st.file_uploader("데이터 파일 선택 (첫 줄은 열 이름):", type=["csv", "tsv", "txt", "parquet"], key="data_file")
+    if uploaded_file is not None:
+        file_format = detect_format(uploaded_file.name)
+        column_names = read_column_names(uploaded_file, file_format)
+        if len(column_names) < 2:
+            st.error(f"오류: 파일에 열이 {len(column_names)}개뿐입니다. X, Y로 쓸 열이 2개 이상 있어야 합니다 (첫 줄은 열 이름).")
+            st.stop()
+        col_file1, col_file2 = st.columns(2)
+        with col_file1:
+            x_column = st.selectbox(f"{x_var_name}로 사용할 열:", column_names, index=0, key="x_column")
+        with col_file2:
+            y_column = st.selectbox(f"{y_var_name}로 사용할 열:", column_names, index=1, key="y_column")
+        # 값을 보관하지 않으면 메모리는 덩어리 크기만큼만 쓰지만, 중앙값은 근사값이 되고 최빈값/산점도는 생략
+        streaming_file = st.checkbox("아주 큰 파일: 값을 보관하지 않고 읽으면서 분석 (중앙값은 근사값)", key="streaming_file")
+        if not streaming_file: # 그룹별 분석은 값을 보관해야 가능
+            group_column = st.selectbox("그룹으로 나눌 열 (선택, 예: 반, 성별):", [None] + column_names,
+                                        format_func=lambda name: "(그룹 없음)" if name is None else name, key="group_column")
+
+
+# 점이 아주 많을 때(20만 개 초과)의 산점도 표시 방식
+LARGE_PLOT_MODES = {
+    "밀도 (구간별 점 개수)": PLOT_MODE_DENSITY,
+    "대표점 추리기 (테두리/이상값 유지)": PLOT_MODE_DECIMATE,
+}
+large_plot_label = st.radio("데이터가 아주 많을 때 산점도 표시 방식:", list(LARGE_PLOT_MODES), horizontal=True, key="large_plot_mode")
+large_plot_mode = LARGE_PLOT_MODES[large_plot_label]
+
+# 전송량 절약 모드: 입력값은 앞/뒤 일부만 보여주고, 그래프 데이터는 float32 이진 형식으로 보냄
+compact_payload = st.checkbox("전송량 절약 모드 (입력값 요약 표시, 그래프 데이터 압축)", value=True, key="compact_payload")
+
+# Theil–Sen: 두 점씩 이은 직선 기울기들의 중앙값으로 그은 회귀선 (잘못 입력한 값 하나에 크게 흔들리지 않음)
+# 데이터가 아주 많으면 수십 초가 걸리므로 ROBUST_MAX_POINTS개까지만 계산
+robust_enabled = st.checkbox(f"이상값에 강한 회귀선 (Theil–Sen) 함께 그리기 (데이터 {ROBUST_MAX_POINTS:,}개 이하)", key="robust_enabled")
+
+# 순위 상관계수: 값 대신 순위로 구한 상관계수 (데이터가 많으면 평균/상관계수/회귀식보다 훨씬 오래 걸리므로 선택)
+rank_enabled = st.checkbox("순위 상관계수 계산 (스피어만, 켄달)", key="rank_enabled")
+
+# 부트스트랩: 데이터에서 같은 개수를 복원추출하는 일을 여러 번 반복해 r, 기울기, 절편이 얼마나 흔들리는지 확인
+bootstrap_enabled = st.checkbox("부트스트랩 신뢰구간 계산 (상관계수, 회귀식)", key="bootstrap_enabled")
+# 순열 검정: Y 값의 순서를 무작위로 섞었을 때 지금만큼 강한 상관관계가 우연히 나올 확률(p-값)을 계산
+permutation_enabled = st.checkbox("순열 검정 p-값 계산 (상관계수)", key="permutation_enabled")
+bootstrap_resamples = DEFAULT_RESAMPLES
+random_seed = 0
+if bootstrap_enabled or permutation_enabled:
+    col_boot1, col_boot2 = st.columns(2)
+    with col_boot1:
+        bootstrap_resamples = int(st.number_input("재표본/순열 횟수 (최대):", min_value=100, max_value=100_000, value=DEFAULT_RESAMPLES, step=1000, key="bootstrap_resamples"))
+    with col_boot2:
+        random_seed = int(st.number_input("난수 시드 (같은 시드면 같은 결과):", min_value=0, value=0, step=1, key="random_seed"))
+analysis_options = AnalysisOptions(large_plot_mode, compact_payload, robust_enabled, bootstrap_enabled,
+                                   permutation_enabled, bootstrap_resamples, random_seed, rank_correlation=rank_enabled)
+
+# 개발자용: "버튼이 느려요" 문의가 오면 켜서 단계별 시간/메모리 확인 (결과는 아래 펼침 상자와 로그 파일에 기록)
+profiling_enabled = st.checkbox("성능 측정 표시 (개발자용)", key="profiling_enabled")
+profile_capture_enabled = False
+if profiling_enabled:
+    profile_capture_enabled = st.checkbox("이번 분석을 cProfile/tracemalloc으로 자세히 기록 (보고서 다운로드)", key="profile_capture_enabled")
+
+
+# --- 분석 결과 캐시 (서버 프로세스 하나에 하나, 모든 세션이 공유) ---
+@st.cache_resource
+def get_result_cache():
+    return ResultCache() # 메모리 예산은 환경변수 STATS_RESULT_CACHE_MB (기본 256MB)
+
+
+# --- 분석 작업 풀 (서버 프로세스 하나에 하나, 모든 세션이 공유) ---
+@st.cache_resource
+def get_analysis_pool():
+    return AnalysisPool() # 작업 스레드 수/입장 제한은 환경변수 STATS_WORKERS, STATS_MAX_PENDING
 
 
 # --- 분석 실행 버튼 ---
 analyze_button = st.button("통계 분석 실행", key="analyze_button")
 
+# 진행 중인 분석이 있는데 입력/옵션을 바꿔 페이지가 다시 실행되었으면 그 분석은 더 이상 필요 없으므로 취소
+analysis_pool = get_analysis_pool()
+analysis_job = st.session_state.get("analysis_job")
+cache_key = None
+if analyze_button or analysis_job is not None:
+    # 같은 입력(값 + 변수명 + 분석 옵션)을 이미 분석한 적이 있으면 결과를 그대로 재사용 (모든 세션이 공유)
+    if input_mode == INPUT_FILE and uploaded_file is not None:
+        cache_key = content_key(uploaded_file.getbuffer(), file_format, x_column, y_column, streaming_file, group_column,
+                                x_var_name, y_var_name, analysis_options)
+    elif input_mode == INPUT_TEXT:
+        cache_key = content_key(x_data_str, y_data_str, group_str, x_var_name, y_var_name, analysis_options)
+if analysis_job is not None and analysis_job.key != cache_key:
+    analysis_pool.release(analysis_job) # 같은 분석을 기다리는 다른 세션이 없을 때만 실제로 취소됨
+    del st.session_state["analysis_job"]
+    analysis_job = None
+
+
+# --- 여러 변수 분석 (상관계수 행렬 + 원하는 쌍 자세히 보기) ---
+if input_mode == INPUT_TABLE:
+    if analyze_button:
+        table = parse_table(table_str)
+        if table.bad_lines:
+            for line_no, line in table.bad_lines:
+                st.error(f"표 값 오류 (줄 {line_no}): '{line}'는 변수 {len(table.names)}개의 숫자로 읽을 수 없습니다.")
+            st.warning("입력 데이터에 오류가 있습니다. 분석을 중단합니다.")
+            st.stop()
+        if len(table.names) < 2 or len(table.values) < 2:
+            st.error(f"오류: 변수는 2개 이상, 응답은 2줄 이상이어야 합니다. 현재 변수 {len(table.names)}개, 응답 {len(table.values)}줄입니다.")
+            st.warning("데이터 부족 오류. 분석을 중단합니다.")
+            st.stop()
+        # 모든 변수 쌍의 상관계수/기울기/절편을 행렬곱 한 번(블록 단위)으로 계산
+        st.session_state["multivar_analysis"] = (table.names, table.values, CrossStats.from_matrix(table.values))
+
+    # 쌍 선택 상자를 바꾸면 페이지가 다시 실행되므로 결과는 세션에 보관해 두고 표시
+    multivar_analysis = st.session_state.get("multivar_analysis")
+    if multivar_analysis is not None:
+        var_names, table_values, cross_stats = multivar_analysis
+        st.header("분석 결과 (여러 변수)")
+        st.write(f"변수 {len(var_names)}개, 응답 {cross_stats.n}개")
+
+        st.subheader("상관계수 행렬")
+        correlation_matrix = cross_stats.correlation_matrix()
+        st.plotly_chart(build_correlation_heatmap(correlation_matrix, var_names), use_container_width=False)
+        st.write("_(빨간색일수록 강한 양의 상관관계, 파란색일수록 강한 음의 상관관계입니다. 값이 모두 같은 변수는 빈칸으로 표시됩니다.)_")
+
+        slope_matrix, intercept_matrix = cross_stats.regression_matrices()
+        pair_rows = [(a, b) for a in range(len(var_names)) for b in range(len(var_names)) if a != b]
+        st.dataframe({
+            "X": [var_names[a] for a, b in pair_rows],
+            "Y": [var_names[b] for a, b in pair_rows],
+            "상관계수 r": [correlation_matrix[a, b] for a, b in pair_rows],
+            "기울기": [slope_matrix[a, b] for a, b in pair_rows],
+            "절편": [intercept_matrix[a, b] for a, b in pair_rows],
+        }, hide_index=True)
+
+        st.subheader("두 변수 자세히 보기")
+        col_pair1, col_pair2 = st.columns(2)
+        with col_pair1:
+            pair_x = st.selectbox("X 변수:", range(len(var_names)), format_func=lambda i: var_names[i], index=0, key="pair_x")
+        with col_pair2:
+            pair_y = st.selectbox("Y 변수:", range(len(var_names)), format_func=lambda i: var_names[i], index=1, key="pair_y")
+
+        pair_stats = cross_stats.pair(pair_x, pair_y)
+        if pair_stats.can_calculate_correlation:
+            st.write(f"**{var_names[pair_x]}**와 **{var_names[pair_y]}**의 상관계수 r = **{pair_stats.correlation:.4f}**")
+            if rank_enabled: # 순위 상관계수는 정렬이 필요하므로 옵션을 켰을 때만 계산
+                pair_rank = rank_correlations(table_values[:, pair_x], table_values[:, pair_y])
+                st.write(f"스피어만 ρ = **{pair_rank.spearman:.4f}**, 켄달 τ-b = **{pair_rank.kendall_tau_b:.4f}**")
+        else:
+            st.info("데이터가 모두 같아 상관계수 계산 불가")
+        if pair_stats.can_calculate_regression:
+            st.write(f"회귀식: Ŷ = **{pair_stats.intercept:.4f}** + **{pair_stats.slope:.4f}**X")
+        else:
+            st.warning(f"{var_names[pair_x]} 값이 모두 같아 회귀식 계산 불가 (수직선 형태)")
+        st.plotly_chart(build_scatter_figure(table_values[:, pair_x], table_values[:, pair_y], pair_stats,
+                                             var_names[pair_x], var_names[pair_y], large_plot_mode),
+                        use_container_width=False)
+
 
 # --- 분석 로직 및 결과 표시 섹션 ---
-if analyze_button: # 버튼이 클릭되면 이 블록 실행
+elif analyze_button or analysis_job is not None: # 버튼이 클릭되었거나, 진행 중인 분석을 계속 기다릴 때
     st.header("분석 결과")
 
-    x_data = []
-    y_data = []
-    errors = [] # 데이터 파싱 오류
-
-    # X 값 파싱 (줄바꿈 기준으로 분리)
-    x_lines = x_data_str.strip().splitlines()
-    y_lines = y_data_str.strip().splitlines()
-
-    # 데이터 개수 일치 기본 확인 (파싱 전에)
-    if len(x_lines) != len(y_lines):
-         st.error(f"오류: 입력된 {x_var_name} 값의 줄 수({len(x_lines)})와 {y_var_name} 값의 줄 수({len(y_lines)})가 다릅니다. 쌍으로 입력해주세요.")
-         st.warning("데이터 개수 불일치 오류. 분석을 중단합니다.")
-         st.stop() # 오류 발생 시 분석 중단
-
-    # 각 줄을 숫자로 변환하면서 오류 확인
-    for i, line in enumerate(x_lines):
-        if line.strip(): # 비어있지 않은 줄만 처리
-            try:
-                x_data.append(float(line.strip()))
-            except ValueError:
-                errors.append(f"{x_var_name} 값 오류 (줄 {i+1}): '{line.strip()}'는 유효한 숫자가 아닙니다.")
-        # else: # 빈 줄은 무시
-
-    for i, line in enumerate(y_lines):
-         if line.strip(): # 비어있지 않은 줄만 처리
+    # 성능 측정 (켜지 않았으면 lap()은 아무것도 하지 않음)
+    # 직전 실행이 입력 오류(st.stop)나 입력 변경으로 중간에 끝났으면 켜 둔 tracemalloc이 남아 있으므로 먼저 정리
+    # (작업 스레드가 아직 기록 중인 측정기는 그 작업이 끝난 뒤에 정리)
+    running_timers = stop_finished(st.session_state.pop("profiling_active", []))
+    timer = StageTimer(enabled=profiling_enabled)
+    st.session_state["profiling_active"] = running_timers + [(timer, None)]
+
+    result_cache = get_result_cache()
+    if cache_key is None:
+        st.error("오류: 분석할 파일을 먼저 업로드해주세요.")
+        st.stop()
+    analysis = result_cache.get(cache_key) if analysis_job is None else None
+    cache_hit = analysis is not None
+    timer.lap("cache_lookup")
+    profile_capture = None
+
+    if analysis is None:
+        if analysis_job is None:
+            # 입력 검사부터 통계량, 선택한 추가 분석, 그래프까지 작업 스레드에서 실행 (일괄 분석 statkit.batch와 같은 함수)
+            # 재표본도 작업 스레드 안에서만 계산 (n_jobs=1): 작업마다 프로세스를 따로 띄우면 입장 제한(STATS_WORKERS)을 넘어
+            # CPU를 차지하고, 여러 스레드가 도는 서버 프로세스에서 fork하면 멈출 수 있음 (seed가 같으면 결과는 같음)
+            # (Streamlit은 실행할 때마다 스크립트 변수를 새로 만들므로 아래 함수가 쓰는 값은 이번 실행의 입력 그대로)
+            if input_mode == INPUT_FILE:
+                # 파일을 덩어리 단위로 읽으면서 통계량을 바로 누적
+                def analysis_task(job):
+                    result = analyze_file(uploaded_file, file_format, x_column, y_column, x_var_name, y_var_name,
+                                          analysis_options, streaming=streaming_file, timer=job,
+                                          on_chunk=lambda n_read: job.report(f"파일 읽는 중... {n_read:,}행"),
+                                          group_column=group_column, n_jobs=1)
+                    result_cache.put(cache_key, result)
+                    job.lap("cache_store")
+                    return result, None
+            else:
+                # 직전 분석에서 몇 줄만 추가/수정했으면 바뀐 줄만 다시 계산 (세션마다 직전 상태 보관)
+                previous_state = st.session_state.get("incremental_state")
+
+                def analysis_task(job):
+                    result, state = analyze_text(x_data_str, y_data_str, x_var_name, y_var_name,
+                                                 analysis_options, previous_state, timer=job, group_str=group_str,
+                                                 n_jobs=1)
+                    result_cache.put(cache_key, result)
+                    job.lap("cache_store")
+                    return result, state
             try:
-                y_data.append(float(line.strip()))
-            except ValueError:
-                 errors.append(f"{y_var_name} 값 오류 (줄 {i+1}): '{line.strip()}'는 유효한 숫자가 아닙니다.")
-        # else: # 빈 줄은 무시
-
-    # --- 데이터 유효성 검사 (파싱 후 최종 확인) ---
-
-    if errors:
-        for err in errors:
-            st.error(err) # 개별 입력 오류 표시
-        st.warning("입력 데이터에 오류가 있습니다. 분석을 중단합니다.")
-        st.stop() # 오류 발생 시 분석 중단
-
-    # 파싱 결과의 데이터 개수 최종 확인 (빈 줄 무시 등으로 인해 발생 가능)
-    if len(x_data) != len(y_data):
-         st.error(f"내부 오류: 유효한 {x_var_name} 값 개수({len(x_data)})와 유효한 {y_var_name} 값 개수({len(y_data)})가 다릅니다. 쌍으로 입력해주세요.")
-         st.warning("데이터 개수 불일치 오류. 분석을 중단합니다.")
-         st.stop()
-
-    # 최소 데이터 쌍 개수 확인
-    if len(x_data) < 2:
-         st.error(f"오류: 유효한 데이터 쌍은 최소 2개 이상이어야 합니다. 현재 {len(x_data)}개 입니다.")
-         st.warning("데이터 부족 오류. 분석을 중단합니다.")
-         st.stop()
-
-
-    # 유효성 검사 통과 후 NumPy 배열로 변환
-    x_np = np.array(x_data)
-    y_np = np.array(y_data)
+                analysis_job = analysis_pool.submit(cache_key, analysis_task, timer=timer,
+                                                    profile=ProfileCapture() if profile_capture_enabled else None,
+                                                    total_steps=expected_laps(analysis_options, bool(group_str.strip() or group_column)) + 1)
+            except PoolBusy:
+                st.warning("지금 분석 요청이 많습니다. 잠시 후 다시 '통계 분석 실행'을 눌러 주세요.")
+                st.stop()
+            st.session_state["analysis_job"] = analysis_job
+            st.session_state["profiling_active"][-1] = (timer, analysis_job) # 이제 작업 스레드도 이 측정기에 기록함
+
+        # 여기서는 진행률만 확인 (기다리는 동안 입력을 바꾸면 Streamlit이 곧바로 페이지를 다시 실행함)
+        progress_bar = st.progress(0.0, text="분석 대기 중...")
+        while not analysis_job.wait(POLL_SECONDS):
+            progress_bar.progress(analysis_job.fraction, text=analysis_job.message)
+        progress_bar.empty()
+        timer.lap("worker_wait")
+        del st.session_state["analysis_job"]
+        analysis_pool.release(analysis_job)
+        profile_capture = analysis_job.profile
+        try:
+            analysis, incremental_state = analysis_job.result()
+        except InputError as e:
+            for message in e.messages:
+                st.error(message) # 개별 입력 오류 표시
+            st.warning(e.summary)
+            st.stop() # 오류 발생 시 분석 중단
+        except Cancelled:
+            st.info("분석이 취소되었습니다. 다시 '통계 분석 실행'을 눌러 주세요.")
+            st.stop()
+        if input_mode == INPUT_TEXT:
+            st.session_state["incremental_state"] = incremental_state
+
+    if analysis.n_dropped:
+        st.warning(f"숫자가 아니거나 비어 있는 값이 있는 {analysis.n_dropped:,}개 행은 제외했습니다.")
+
+    x_np = analysis.x
+    y_np = analysis.y
+    summary = analysis.summary
+    n_pairs = summary.pair.n
 
     st.success("데이터 입력 및 유효성 검사 통과. 분석을 진행합니다.")
 
     # --- 간결한 결과 출력 시작 ---
 
     st.write("입력된 데이터 요약:")
-    st.text(f"  {x_var_name} 값 ({len(x_np)}개): {x_np}") # st.text는 고정폭 글꼴로 표시
-    st.text(f"  {y_var_name} 값 ({len(y_np)}개): {y_np}")
+    if x_np is None: # 스트리밍 분석은 값을 보관하지 않음
+        x_echo = f"  {x_var_name} 값 ({n_pairs}개): 값을 보관하지 않는 분석이라 목록을 표시하지 않습니다."
+        y_echo = f"  {y_var_name} 값 ({n_pairs}개): 값을 보관하지 않는 분석이라 목록을 표시하지 않습니다."
+    elif compact_payload: # 값이 아무리 많아도 앞/뒤 몇 개와 개수만 표시
+        x_echo = f"  {x_var_name} 값 ({n_pairs}개): {array_preview(x_np)}"
+        y_echo = f"  {y_var_name} 값 ({n_pairs}개): {array_preview(y_np)}"
+    else:
+        x_echo = f"  {x_var_name} 값 ({n_pairs}개): {x_np}"
+        y_echo = f"  {y_var_name} 값 ({n_pairs}개): {y_np}"
+    st.text(x_echo) # st.text는 고정폭 글꼴로 표시
+    st.text(y_echo)
     st.write("---") # 구분선 추가
 
 
-    # 기술 통계 (평균, 중앙값, 최빈값, 표준편차 추가)
-    mean_x = np.mean(x_np)
-    mean_y = np.mean(y_np)
-
-    # 중앙값 계산
-    median_x = np.median(x_np)
-    median_y = np.median(y_np)
-
-    # 최빈값 계산 (데이터가 1개 이상일 때만 시도)
-    mode_x_result = None
-    mode_y_result = None
-    if len(x_np) > 0:
-        try:
-            mode_x_result = stats.mode(x_np, keepdims=False)
-        except Exception as e:
-            st.warning(f"{x_var_name} 최빈값 계산 중 오류 발생: {e}")
-            mode_x_result = None
-
-    if len(y_np) > 0:
-        try:
-            mode_y_result = stats.mode(y_np, keepdims=False)
-        except Exception as e:
-            st.warning(f"{y_var_name} 최빈값 계산 중 오류 발생: {e}")
-            mode_y_result = None
+    # 기술 통계 (평균, 중앙값, 표준편차, 상관계수, 회귀식)
+    pair_stats = summary.pair
+    mean_x = pair_stats.mean_x
+    mean_y = pair_stats.mean_y
 
+    # 중앙값
+    median_x = summary.median_x
+    median_y = summary.median_y
 
-    # 표준편차 계산 (표본 표준편차: ddof=1) - 데이터가 1개 초과일 때만 계산
-    std_x = np.std(x_np, ddof=1) if len(x_np) > 1 else None
-    std_y = np.std(y_np, ddof=1) if len(y_np) > 1 else None
+    # 표준편차 (표본 표준편차: ddof=1) - 데이터가 1개 이하면 None
+    std_x = pair_stats.std_x
+    std_y = pair_stats.std_y
 
 
     st.subheader("기술 통계")
@@ -146,49 +342,42 @@ if analyze_button: # 버튼이 클릭되면 이 블록 실행
     # 중앙값 출력
     st.write(f"**{x_var_name}**의 중앙값: {median_x:.4f}")
     st.write(f"**{y_var_name}**의 중앙값: {median_y:.4f}")
+    if summary.median_error_x or summary.median_error_y: # 스케치로 구한 근사 중앙값
+        st.info(f"  참고: 값이 많아 근사 계산한 중앙값입니다. 실제 순위와의 차이는 최대 "
+                f"{x_var_name} ±{summary.median_error_x:.2%}, {y_var_name} ±{summary.median_error_y:.2%} 입니다.")
     st.write("_(중앙값은 데이터를 크기 순서대로 나열했을 때 가장 중앙에 위치하는 값으로, 극단적인 값에 영향을 덜 받습니다.)_")
     st.write("---") # 구분선
 
-    # 최빈값 출력
-    st.write(f"**{x_var_name}**의 최빈값:")
-    if mode_x_result is not None and len(x_np) > 0:
-        mode_val_x = mode_x_result.mode
-        count_x = mode_x_result.count[0] if not np.isscalar(mode_x_result.count) else mode_x_result.count
+    # 최빈값 출력 (같은 횟수로 가장 많이 나온 값은 모두 표시)
+    mode_x_result = summary.mode_x
+    mode_y_result = summary.mode_y
 
-        if count_x == 1 and len(x_np) == len(np.unique(x_np)):
-             st.info(f"  모든 {x_var_name} 값이 한 번씩만 나타나 최빈값이 없습니다.")
-        else:
-             if isinstance(mode_val_x, np.ndarray):
-                 if mode_val_x.size > 1:
-                      st.write(f"  {mode_val_x} (개수: {count_x}회)")
-                      st.info("  참고: 최빈값이 여러 개입니다.")
-                 else:
-                      st.write(f"  {mode_val_x.item()} (개수: {count_x}회)")
-             else:
-                  st.write(f"  {mode_val_x} (개수: {count_x}회)")
-
-    elif len(x_np) == 0:
+    st.write(f"**{x_var_name}**의 최빈값:")
+    if mode_x_result is None:
+         st.info("  값을 보관하지 않는 분석이라 최빈값을 계산하지 않았습니다.")
+    elif n_pairs == 0:
          st.info(f"  {x_var_name} 값이 없어 최빈값을 계산할 수 없습니다.")
+    elif not mode_x_result.has_mode:
+         st.info(f"  모든 {x_var_name} 값이 한 번씩만 나타나 최빈값이 없습니다.")
+    elif mode_x_result.modes.size > 1:
+         st.write(f"  {mode_x_result.modes} (개수: {mode_x_result.count}회)")
+         st.info(f"  참고: 최빈값이 여러 개입니다 ({mode_x_result.modes.size}개).")
+    else:
+         st.write(f"  {mode_x_result.modes[0]} (개수: {mode_x_result.count}회)")
 
 
     st.write(f"**{y_var_name}**의 최빈값:")
-    if mode_y_result is not None and len(y_np) > 0:
-        mode_val_y = mode_y_result.mode
-        count_y = mode_y_result.count[0] if not np.isscalar(mode_y_result.count) else mode_y_result.count
-
-        if count_y == 1 and len(y_np) == len(np.unique(y_np)):
-             st.info(f"  모든 {y_var_name} 값이 한 번씩만 나타나 최빈값이 없습니다.")
-        else:
-             if isinstance(mode_val_y, np.ndarray):
-                 if mode_val_y.size > 1:
-                      st.write(f"  {mode_val_y} (개수: {count_y}회)")
-                      st.info("  참고: 최빈값이 여러 개입니다.")
-                 else:
-                      st.write(f"  {mode_val_y.item()} (개수: {count_y}회)")
-             else:
-                  st.write(f"  {mode_val_y} (개수: {count_y}회)")
-    elif len(y_np) == 0:
+    if mode_y_result is None:
+         st.info("  값을 보관하지 않는 분석이라 최빈값을 계산하지 않았습니다.")
+    elif n_pairs == 0:
          st.info(f"  {y_var_name} 값이 없어 최빈값을 계산할 수 없습니다.")
+    elif not mode_y_result.has_mode:
+         st.info(f"  모든 {y_var_name} 값이 한 번씩만 나타나 최빈값이 없습니다.")
+    elif mode_y_result.modes.size > 1:
+         st.write(f"  {mode_y_result.modes} (개수: {mode_y_result.count}회)")
+         st.info(f"  참고: 최빈값이 여러 개입니다 ({mode_y_result.modes.size}개).")
+    else:
+         st.write(f"  {mode_y_result.modes[0]} (개수: {mode_y_result.count}회)")
 
     st.write("_(최빈값은 데이터에서 가장 자주 나타나는 값으로, 하나 이상이거나 없을 수도 있습니다.)_")
     st.write("---") # 구분선
@@ -199,38 +388,39 @@ if analyze_button: # 버튼이 클릭되면 이 블록 실행
     if std_x is not None:
          st.write(f"  {std_x:.4f}")
     else:
-         st.info(f"  데이터 부족 ({len(x_np)}개)으로 계산 불가")
+         st.info(f"  데이터 부족 ({n_pairs}개)으로 계산 불가")
 
     st.write(f"**{y_var_name}**의 표준편차 (Sy):")
     if std_y is not None:
          st.write(f"  {std_y:.4f}")
     else:
-         st.info(f"  데이터 부족 ({len(y_np)}개)으로 계산 불가")
+         st.info(f"  데이터 부족 ({n_pairs}개)으로 계산 불가")
     st.write("_(표준편차는 데이터가 평균으로부터 얼마나 퍼져있는지(산포도)를 나타내는 값입니다.)_")
 
     st.write("---") # 구분선
 
 
-    # 상관계수 계산
-    x_deviations = x_np - mean_x
-    y_deviations = y_np - mean_y
-    sum_of_products_of_deviations = np.sum(x_deviations * y_deviations)
-    sum_of_sq_x_deviations = np.sum(x_deviations**2)
-    sum_of_sq_y_deviations = np.sum(y_deviations**2)
-
-    numerator = sum_of_products_of_deviations
-    denominator = np.sqrt(sum_of_sq_x_deviations * sum_of_sq_y_deviations)
-
+    # 상관계수 (편차곱의 합 / sqrt(X 편차제곱합 * Y 편차제곱합), 엔진에서 이미 계산됨)
     correlation_coefficient = 0
-    can_calculate_correlation = denominator != 0
+    can_calculate_correlation = pair_stats.can_calculate_correlation
 
     if can_calculate_correlation:
-        correlation_coefficient = numerator / denominator
+        correlation_coefficient = pair_stats.correlation
 
     st.subheader("상관계수 (r)")
     st.write(f"**{x_var_name}**와 **{y_var_name}**의 상관계수 r = **{correlation_coefficient:.4f}**")
+    permutation = analysis.permutation
+    if permutation is not None:
+        st.write(f"순열 검정 p-값 = **{permutation.p_value:.4f}** (순열 {permutation.n_permutations:,}개)")
+        if permutation.p_value < 0.05:
+            st.info("p-값이 0.05보다 작아, 이 정도 상관관계가 우연히 나왔다고 보기는 어렵습니다.")
+        else:
+            st.info("p-값이 0.05 이상이라, 이 정도 상관관계는 우연히도 나올 수 있습니다.")
+        st.write("_(p-값은 Y 값의 순서를 무작위로 섞었을 때 지금 이상으로 강한 상관관계가 나오는 비율입니다. 정규분포를 가정하지 않아 데이터가 적거나 한쪽으로 치우쳐도 쓸 수 있습니다.)_")
+    elif permutation_enabled and x_np is None:
+        st.info("값을 보관하지 않는 분석이라 순열 검정을 하지 않았습니다.")
 
-    if not can_calculate_correlation and len(x_np) >= 2:
+    if not can_calculate_correlation and n_pairs >= 2:
          st.info(f"데이터가 모두 같아 상관계수 계산 불가")
     elif abs(correlation_coefficient) >= 0.7:
         st.info("강한 양/음의 상관관계")
@@ -238,7 +428,7 @@ if analyze_button: # 버튼이 클릭되면 이 블록 실행
         st.info("보통 양/음의 상관관계")
     elif abs(correlation_coefficient) >= 0.1:
          st.info("약한 양/음의 상관관계")
-    elif len(x_np) >= 2 :
+    elif n_pairs >= 2 :
         st.info("거의 상관관계 없음")
 
 
@@ -247,9 +437,26 @@ if analyze_button: # 버튼이 클릭되면 이 블록 실행
             st.info("양의 상관관계: 한 변수 증가 시 다른 변수도 증가 경향")
         elif correlation_coefficient < 0:
             st.info("음의 상관관계: 한 변수 증가 시 다른 변수는 감소 경향")
-    elif len(x_np) < 2:
+    elif n_pairs < 2:
          st.info("데이터 부족으로 상관계수 계산 불가")
 
+    # 순위 상관계수 (값의 크기 대신 순서만 사용하므로 리커트 척도 같은 순서형 자료에 적합)
+    rank_correlation = analysis.rank_correlation
+    if rank_correlation is not None and rank_correlation.spearman is not None:
+        st.write(f"스피어만 순위상관계수 ρ = **{rank_correlation.spearman:.4f}**, "
+                 f"켄달 순위상관계수 τ-b = **{rank_correlation.kendall_tau_b:.4f}**")
+        st.write("_(순위 상관계수는 값 대신 크기 순서(순위)로 계산해서, 설문 문항처럼 순서만 의미 있는 자료나 이상값이 있는 자료에 알맞습니다. 같은 값은 같은 순위로 처리합니다.)_")
+    elif rank_enabled and x_np is None:
+        st.info("값을 보관하지 않는 분석이라 순위 상관계수를 계산하지 않았습니다.")
+
+    bootstrap = analysis.bootstrap
+    if bootstrap is not None:
+        r_low, r_high = bootstrap.r
+        st.write(f"r의 {bootstrap.confidence:.0%} 부트스트랩 신뢰구간: [{r_low:.4f}, {r_high:.4f}] (재표본 {bootstrap.n_resamples:,}개)")
+        st.write(f"_(데이터에서 같은 개수를 복원추출해 r을 여러 번 다시 구했을 때 가운데 {bootstrap.confidence:.0%}가 들어가는 범위입니다. 데이터가 적을수록 넓어집니다.)_")
+    elif bootstrap_enabled and x_np is None:
+        st.info("값을 보관하지 않는 분석이라 부트스트랩 신뢰구간을 계산하지 않았습니다.")
+
 
     # 회귀식 계산
     st.subheader("회귀식")
@@ -257,18 +464,27 @@ if analyze_button: # 버튼이 클릭되면 이 블록 실행
     st.write("회귀식은 두 변수(X와 Y) 사이의 가장 잘 맞는 직선 관계를 나타내는 공식이에요. 이 공식을 이용하면 X 값을 알 때 Y 값을 예측해 볼 수 있습니다.")
 
 
-    slope = None
-    intercept = mean_y
+    slope = pair_stats.slope
+    intercept = pair_stats.intercept
 
-    can_calculate_regression = sum_of_sq_x_deviations != 0
+    can_calculate_regression = pair_stats.can_calculate_regression
 
     if can_calculate_regression:
-        slope = sum_of_products_of_deviations / sum_of_sq_x_deviations
-        intercept = mean_y - slope * mean_x
 
         st.write(f"회귀식: Ŷ = **{intercept:.4f}** + **{slope:.4f}**X")
         st.write(f"_(여기서 X는 '{x_var_name}', Ŷ는 '{y_var_name}'에 대한 예측값)_")
-    elif len(x_np) >= 2:
+        if bootstrap is not None:
+            st.write(f"기울기의 {bootstrap.confidence:.0%} 부트스트랩 신뢰구간: [{bootstrap.slope[0]:.4f}, {bootstrap.slope[1]:.4f}]")
+            st.write(f"절편의 {bootstrap.confidence:.0%} 부트스트랩 신뢰구간: [{bootstrap.intercept[0]:.4f}, {bootstrap.intercept[1]:.4f}]")
+        robust_line = analysis.robust_line
+        if robust_line is not None:
+            st.write(f"이상값에 강한 회귀식 (Theil–Sen): Ŷ = **{robust_line.intercept:.4f}** + **{robust_line.slope:.4f}**X")
+            st.write("_(두 점씩 이은 모든 직선의 기울기 중 가운데 값을 쓰므로, 잘못 입력한 값이 몇 개 있어도 회귀식이 크게 바뀌지 않습니다. 위 회귀식과 차이가 크면 이상값이 있는지 확인해 보세요.)_")
+        elif robust_enabled and x_np is None:
+            st.info("값을 보관하지 않는 분석이라 Theil–Sen 회귀선을 계산하지 않았습니다.")
+        elif robust_enabled and n_pairs > ROBUST_MAX_POINTS:
+            st.info(f"데이터가 {ROBUST_MAX_POINTS:,}개를 넘어 Theil–Sen 회귀선을 계산하지 않았습니다 (계산 시간이 너무 깁니다).")
+    elif n_pairs >= 2:
         st.warning(f"{x_var_name} 값이 모두 같아 회귀식 계산 불가 (수직선 형태)")
         st.write(f"'{x_var_name}'는 고정값(**{mean_x:.4f}**), '{y_var_name}'의 평균값은 **{mean_y:.4f}**")
     else:
@@ -285,74 +501,73 @@ if analyze_button: # 버튼이 클릭되면 이 블록 실행
     
 
 
-    # --- 그래프 그리기 시작 (Plotly에 표시) ---
-    # Plotly를 사용합니다.
-    fig = go.Figure() # Plotly Figure 객체 생성
-
-    if len(x_np) >= 2:
-        # 산점도 데이터 추가
-        fig.add_trace(go.Scatter(
-            x=x_np,
-            y=y_np,
-            mode='markers', # 점으로 표시
-            name='Data Points' # 범례 이름
-        ))
-
-        # 회귀선 추가 (계산 가능할 때만)
-        if can_calculate_regression:
-            if np.max(x_np) - np.min(x_np) == 0:
-                 x_range = np.array([x_np[0] - 1, x_np[0] + 1])
-            else:
-                x_range = np.array([np.min(x_np) - (np.max(x_np) - np.min(x_np)) * 0.1,
-                                    np.max(x_np) + (np.max(x_np) - np.min(x_np)) * 0.1])
-
-            y_line = intercept + slope * x_range
-            fig.add_trace(go.Scatter(
-                x=x_range,
-                y=y_line,
-                mode='lines', # 선으로 표시
-                name=f'회귀선 (Ŷ = {intercept:.2f} + {slope:.2f}X)', # 범례 이름
-                line=dict(color='red') # 선 색상
-            ))
-
-        elif len(np.unique(x_np)) == 1: # X 값이 모두 같아서 수직선 형태일 때
-             fig.add_trace(go.Scatter(
-                x=[mean_x, mean_x], # X 값 고정
-                y=[np.min(y_np), np.max(y_np)], # Y 값 최소~최대 범위
-                mode='lines',
-                name=f'X = {mean_x:.2f} ({x_var_name})',
-                line=dict(color='red', dash='dash') # 점선
-            ))
-
-
-        # 그래프 레이아웃 업데이트 (제목, 축 이름)
-        if can_calculate_regression:
-             fig.update_layout(title=f'[{x_var_name}]와 [{y_var_name}]의 산점도 및 회귀선',
-                               xaxis_title=x_var_name,
-                               yaxis_title=y_var_name,
-                               width=700, # 예시 너비 (픽셀 단위)
-                               height=500) # 예시 높이 (픽셀 단위)
-        elif len(np.unique(x_np)) == 1:
-              fig.update_layout(title=f'[{x_var_name}] 값이 고정된 산점도',
-                               xaxis_title=x_var_name,
-                               yaxis_title=y_var_name, 
-                               width=700, # 예시 너비 (픽셀 단위)
-                               height=500) # 예시 높이 (픽셀 단위)
-        else:
-             fig.update_layout(title=f'[{x_var_name}]와 [{y_var_name}]의 산점도', # 데이터 2개 이상이지만 회귀선/수직선 없는 경우
-                               xaxis_title=x_var_name,
-                               yaxis_title=y_var_name,
-                               width=700, # 예시 너비 (픽셀 단위)
-                               height=500) # 예시 높이 (픽셀 단위)
-    
+    # --- 그래프 표시 (Plotly) ---
+    # 그래프는 분석 단계에서 미리 만들어 캐시에 함께 저장해 둔 것을 사용합니다.
+    fig = analysis.figure
 
+    if fig is not None:
+        timer.lap("render.text")
         # Streamlit에 Plotly 그래프 표시
         st.plotly_chart(fig, use_container_width=False) # use_container_width로 화면 너비에 맞춤
+        timer.lap("chart_send")
+        echo_nbytes = len(x_echo.encode("utf-8")) + len(y_echo.encode("utf-8"))
+        st.caption(f"이번 분석 전송량: 그래프 {analysis.figure_nbytes / 1024:,.1f}KB + 입력값 표시 {echo_nbytes / 1024:,.1f}KB")
 
 
+    elif x_np is None:
+        st.info("값을 보관하지 않는 분석이라 산점도를 그리지 않았습니다.")
     else: # 데이터 쌍이 2개 미만이어서 산점도를 그릴 수 없을 때
         st.info("데이터 쌍이 2개 미만이라 산점도를 그릴 수 없습니다.")
 
 
+    # --- 그룹별 분석 (그룹을 입력한 경우) ---
+    group_stats = analysis.groups
+    if group_stats is not None:
+        st.subheader("그룹별 분석")
+        st.write(f"그룹 {group_stats.labels.size:,}개로 나눠 계산한 기술 통계, 상관계수, 회귀식입니다. 계산할 수 없는 값(데이터가 1개뿐이거나 값이 모두 같은 경우)은 빈칸으로 표시됩니다.")
+        st.dataframe({
+            "그룹": group_stats.labels,
+            "개수": group_stats.n,
+            f"{x_var_name} 평균": group_stats.mean_x,
+            f"{y_var_name} 평균": group_stats.mean_y,
+            f"{x_var_name} 중앙값": group_stats.median_x,
+            f"{y_var_name} 중앙값": group_stats.median_y,
+            f"{x_var_name} 표준편차": group_stats.std_x,
+            f"{y_var_name} 표준편차": group_stats.std_y,
+            "상관계수 r": group_stats.r,
+            "기울기": group_stats.slope,
+            "절편": group_stats.intercept,
+        }, hide_index=True)
+        if analysis.group_figure is not None:
+            st.plotly_chart(analysis.group_figure, use_container_width=False)
+            st.write("_(점의 색은 그룹을, 선은 그룹마다 따로 구한 회귀선을 나타냅니다. 그룹끼리 기울기를 비교해 보세요.)_")
+
+
     st.write("--- 통계 분석 완료 ---")
+    cache_stats = result_cache.stats()
+    pool_stats = analysis_pool.stats()
+    st.caption(f"결과 캐시: 적중 {cache_stats['hits']}회 / 미적중 {cache_stats['misses']}회, "
+               f"사용 메모리 {cache_stats['nbytes'] / 1024**2:.1f}MB / {cache_stats['max_bytes'] / 1024**2:.0f}MB · "
+               f"분석 작업: 진행 중 {pool_stats['jobs']}개 (동시 실행 {pool_stats['max_workers']}개, 대기 포함 최대 {pool_stats['max_pending']}개)")
     st.caption("제작: 도담고 사회문제탐구 교사가 도담고 3학년 학생들을 사랑하고 응원하는 마음으로 제작함")
+
+    # --- 성능 측정 결과 (개발자용) ---
+    if profiling_enabled:
+        timer.lap("render.rest")
+        st.session_state["profiling_active"] = stop_finished(st.session_state.pop("profiling_active", []))
+        try:
+            append_jsonl(timer.to_record(input_mode=input_mode, n=n_pairs, cache_hit=cache_hit))
+            log_note = f"로그 파일: {DEFAULT_LOG_PATH}"
+        except OSError as e:
+            log_note = f"로그 파일에 기록하지 못했습니다 ({e})"
+        with st.expander(f"성능 측정 결과: 합계 {timer.total_seconds * 1000:,.1f}ms ({'캐시 적중' if cache_hit else '새로 계산'})"):
+            st.dataframe({
+                "단계": [r["stage"] for r in timer.records],
+                "시간 (ms)": [r["seconds"] * 1000 for r in timer.records],
+                "남은 할당 (KB)": [r["allocated_bytes"] / 1024 for r in timer.records],
+                "최대 할당 (KB)": [r["peak_bytes"] / 1024 for r in timer.records],
+            }, hide_index=True)
+            st.caption(log_note)
+            if profile_capture is not None:
+                st.download_button("프로파일 보고서 다운로드 (cProfile + tracemalloc)", profile_capture.report(),
+                                   file_name="stats_profile.txt", key="profile_download")
@@ -0,0 +1,291 @@
+"""app_final.py / new2.py 성능 측정 스크립트.
+
+단계별(파싱, 검증, 통계량, 그래프 생성/직렬화) 시간과 Streamlit AppTest로 스크립트 전체를
+다시 실행하는 시간을 데이터 크기별로 재고, 최대 메모리(tracemalloc)와 함께 JSON으로 저장합니다.
+새 프로세스에서 첫 입력 화면이 나오기까지의 시간(콜드 스타트)과 그때 불러온 무거운 모듈도 기록합니다.
+결과 파일끼리 비교하면 느려진 단계를 찾을 수 있습니다.
+
+    python benchmarks/run_benchmarks.py                          # 기본 크기 (10², 10⁴, 10⁶, 10⁷)
+    python benchmarks/run_benchmarks.py --sizes 100 10000 --output before.json
+    python benchmarks/run_benchmarks.py --skip-apptest            # 단계별 측정만
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from statkit.figures import PLOT_MODE_DENSITY, build_scatter_figure  # noqa: E402
+from statkit.parsing import parse_lines, split_lines  # noqa: E402
+from statkit.payload import figure_nbytes  # noqa: E402
+from statkit.rank_corr import rank_correlations  # noqa: E402
+from statkit.stats_engine import PairStats, mode, summarize  # noqa: E402
+
+DEFAULT_SIZES = (10**2, 10**4, 10**6, 10**7)
+DEFAULT_APPTEST_MAX = 10**6 # AppTest는 입력 글자를 위젯으로 보내므로 이보다 큰 n은 기본으로 생략
+DEFAULT_RESPONDENTS = (10, 100, 1_000, 5_000)
+HEAVY_MODULES = ("plotly", "pandas", "pyarrow", "matplotlib", "scipy") # 첫 화면에서 불러왔는지 기록할 모듈
+APP_FINAL = os.path.join(ROOT, "app_final.py")
+NEW2 = os.path.join(ROOT, "new2.py")
+
+
+def measure(fn, repeat, track_memory=True, setup=None):
+    """fn()을 repeat번 실행한 시간(초)과, 한 번 더 tracemalloc으로 잰 최대 할당량(바이트).
+
+    setup을 주면 매번 setup()의 결과를 fn에 넘기고, setup 시간은 재지 않습니다.
+    """
+    call = fn if setup is None else (lambda prepared: fn(prepared))
+    seconds = []
+    result = None
+    for _ in range(repeat):
+        args = () if setup is None else (setup(),)
+        start = time.perf_counter()
+        result = call(*args)
+        seconds.append(time.perf_counter() - start)
+    peak = None
+    if track_memory: # tracemalloc은 실행을 느리게 하므로 시간 측정과 따로 실행
+        args = () if setup is None else (setup(),)
+        tracemalloc.start()
+        call(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, {
+        "seconds_min": min(seconds),
+        "seconds_median": statistics.median(seconds),
+        "repeat": repeat,
+        "peak_bytes": peak,
+    }
+
+
+def make_data(n, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.round(rng.normal(170, 8, n), 1) # 소수점 한 자리 (최빈값이 생기도록)
+    y = np.round(0.9 * x + rng.normal(0, 6, n), 1)
+    return x, y
+
+
+def to_text(values):
+    return "\n".join(map(str, values.tolist()))
+
+
+def validate(x_parsed, y_parsed):
+    # app_final.py의 파싱 후 검사와 같은 조건
+    return not x_parsed.bad_lines and not y_parsed.bad_lines and len(x_parsed.values) == len(y_parsed.values) >= 2
+
+
+def bench_stages(n, repeat, track_memory):
+    """app_final.py 분석 흐름의 단계별 측정."""
+    x, y = make_data(n)
+    x_text, y_text = to_text(x), to_text(y)
+    rows = []
+
+    def record(stage, fn):
+        result, timing = measure(fn, repeat, track_memory)
+        rows.append({"suite": "stages", "script": "app_final.py", "n": n, "stage": stage, **timing})
+        return result
+
+    x_parsed, y_parsed = record("parse", lambda: (parse_lines(split_lines(x_text)), parse_lines(split_lines(y_text))))
+    record("validate", lambda: validate(x_parsed, y_parsed))
+    x_np, y_np = x_parsed.values, y_parsed.values
+
+    # 평균/표준편차/상관계수/회귀식은 모두 블록 단위 편차곱 누적(PairStats) 한 번에서 나오고,
+    # 각 값은 누적 결과에서 O(1)로 읽으므로 따로 재지 않고 누적 단계만 잼
+    pair = record("stats.moments", lambda: PairStats.from_arrays(x_np, y_np))
+    record("stats.sort", lambda: (np.sort(x_np), np.sort(y_np))) # 중앙값과 최빈값이 같이 쓰는 정렬
+    record("stats.median", lambda: (np.median(x_np), np.median(y_np))) # 중앙값만 구할 때 (부분 정렬)
+    record("stats.mode", lambda: (mode(x_np), mode(y_np))) # 정렬 + 같은 값끼리 개수 세기
+    summary = record("stats.summarize", lambda: summarize(x_np, y_np, pair=pair)) # 중앙값 + 최빈값 (정렬 한 번)
+    record("stats.rank_correlation", lambda: rank_correlations(x_np, y_np))
+
+    fig = record("figure.build", lambda: build_scatter_figure(x_np, y_np, summary.pair, "X", "Y", PLOT_MODE_DENSITY))
+    record("figure.float32", lambda: build_scatter_figure(x_np, y_np, summary.pair, "X", "Y", PLOT_MODE_DENSITY, compact=True))
+    nbytes = record("figure.serialize", lambda: figure_nbytes(fig))
+    rows[-1]["payload_bytes"] = nbytes
+    return rows
+
+
+def bench_app_final(n, repeat, track_memory):
+    """AppTest로 app_final.py 전체 실행: 첫 화면, 분석(캐시 없음), 같은 입력으로 다시 분석(캐시 적중)."""
+    from streamlit.testing.v1 import AppTest
+
+    x, y = make_data(n)
+    x_text, y_text = to_text(x), to_text(y)
+
+    def initial():
+        at = AppTest.from_file(APP_FINAL, default_timeout=600)
+        at.run()
+        return at
+
+    def analyze(at):
+        at.text_area(key="x_data_text_area").input(x_text)
+        at.text_area(key="y_data_text_area").input(y_text)
+        at.button(key="analyze_button").click().run()
+        _check(at)
+        return at
+
+    rows = []
+    _, timing = measure(initial, repeat, track_memory)
+    rows.append({"suite": "apptest", "script": "app_final.py", "n": n, "stage": "rerun.initial", **timing})
+    # 결과 캐시는 서버 프로세스 전체가 공유하므로, 캐시 없는 분석은 매번 비운 뒤 측정
+    _, timing = measure(analyze, repeat, track_memory, setup=lambda: _cleared(initial()))
+    rows.append({"suite": "apptest", "script": "app_final.py", "n": n, "stage": "rerun.analyze_cold", **timing})
+    at = analyze(initial())
+    _, timing = measure(lambda: _check(at.button(key="analyze_button").click().run()), repeat, track_memory)
+    rows.append({"suite": "apptest", "script": "app_final.py", "n": n, "stage": "rerun.analyze_cached", **timing})
+    return rows
+
+
+def bench_new2(n_respondents, repeat, track_memory):
+    """AppTest로 new2.py 전체 실행: 응답자 수를 바꾼 화면 다시 그리기, 모든 칸을 채운 뒤 분석."""
+    from streamlit.testing.v1 import AppTest
+
+    x, y = make_data(n_respondents)
+    edits = {"edited_rows": {i: {"x": str(a), "y": str(b)} for i, (a, b) in enumerate(zip(x.tolist(), y.tolist()))},
+             "added_rows": [], "deleted_rows": []}
+
+    def resize():
+        at = AppTest.from_file(NEW2, default_timeout=600)
+        at.run()
+        at.number_input[0].set_value(n_respondents).run()
+        return at
+
+    def filled():
+        at = resize()
+        at.session_state["respondent_table"] = edits # 표 편집기에 입력한 것과 같은 상태
+        return at
+
+    def analyze(at):
+        at.button[0].click().run()
+        _check(at)
+        return at
+
+    rows = []
+    _, timing = measure(resize, repeat, track_memory)
+    rows.append({"suite": "apptest", "script": "new2.py", "n": n_respondents, "stage": "rerun.resize", **timing})
+    _, timing = measure(analyze, repeat, track_memory, setup=filled)
+    rows.append({"suite": "apptest", "script": "new2.py", "n": n_respondents, "stage": "rerun.analyze", **timing})
+    return rows
+
+
+# 새 프로세스에서 streamlit import + 첫 화면(입력 위젯만) 실행 시간과 첫 화면이 새로 불러온 무거운 모듈
+# (streamlit이 스스로 불러오는 모듈(예: plotly)은 스크립트와 관계없으므로 import 직후 목록을 빼고 보고)
+_COLDSTART_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import streamlit
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+preloaded = set(sys.modules)
+AppTest.from_file(sys.argv[1], default_timeout=600).run()
+done = time.perf_counter()
+print(json.dumps({"import_seconds": imported - start, "first_run_seconds": done - imported,
+                  "loaded": [m for m in sys.argv[2:] if m in sys.modules and m not in preloaded],
+                  "preloaded": [m for m in sys.argv[2:] if m in preloaded]}))
+"""
+
+
+def bench_coldstart(script, repeat):
+    """새 프로세스(컨테이너 콜드 스타트/새 세션 첫 실행과 같은 상황)에서 첫 입력 화면까지 걸리는 시간."""
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, "-c", _COLDSTART_SNIPPET, script, *HEAVY_MODULES],
+                                   capture_output=True, text=True, check=True, cwd=ROOT)
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    first_run = [run["first_run_seconds"] for run in runs]
+    return [{
+        "suite": "coldstart",
+        "script": os.path.basename(script),
+        "n": 0,
+        "stage": "first_run",
+        "seconds_min": min(first_run),
+        "seconds_median": statistics.median(first_run),
+        "repeat": repeat,
+        "peak_bytes": None,
+        "import_seconds_median": statistics.median(run["import_seconds"] for run in runs),
+        "heavy_modules_loaded": runs[-1]["loaded"], # 첫 화면 스크립트 때문에 불러온 모듈
+        "heavy_modules_preloaded": runs[-1]["preloaded"], # streamlit/AppTest import만으로 이미 불러온 모듈
+    }]
+
+
+def _cleared(at):
+    from streamlit import cache_resource
+    cache_resource.clear()
+    return at
+
+
+def _check(at):
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    if at.error:
+        raise RuntimeError(at.error[0].value)
+    return at
+
+
+def environment():
+    import streamlit
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "streamlit": streamlit.__version__,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="데이터 쌍 개수 목록")
+    parser.add_argument("--respondents", type=int, nargs="+", default=list(DEFAULT_RESPONDENTS), help="new2.py 응답자 수 목록")
+    parser.add_argument("--apptest-max", type=int, default=DEFAULT_APPTEST_MAX, help="app_final.py AppTest를 실행할 최대 n")
+    parser.add_argument("--repeat", type=int, default=3, help="단계마다 반복 횟수 (최솟값/중앙값 기록)")
+    parser.add_argument("--skip-apptest", action="store_true", help="AppTest 전체 실행 측정 생략")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 최대 메모리 측정 생략")
+    parser.add_argument("--output", default=os.path.join(ROOT, "benchmarks", "results.json"), help="결과 JSON 경로")
+    args = parser.parse_args(argv)
+
+    track_memory = not args.no_memory
+    results = []
+    for n in args.sizes:
+        print(f"[stages] n={n:,}", file=sys.stderr)
+        results += bench_stages(n, args.repeat, track_memory)
+    if not args.skip_apptest:
+        for script in (APP_FINAL, NEW2):
+            print(f"[coldstart] {os.path.basename(script)}", file=sys.stderr)
+            results += bench_coldstart(script, args.repeat)
+        for n in args.sizes:
+            if n <= args.apptest_max:
+                print(f"[apptest] app_final.py n={n:,}", file=sys.stderr)
+                results += bench_app_final(n, args.repeat, track_memory)
+        for n in args.respondents:
+            print(f"[apptest] new2.py 응답자 {n:,}명", file=sys.stderr)
+            results += bench_new2(n, args.repeat, track_memory)
+
+    report = {"environment": environment(), "results": results}
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    for row in results:
+        peak = f"{row['peak_bytes'] / 1024**2:9.1f}MB" if row["peak_bytes"] is not None else ""
+        heavy = f"  불러온 모듈: {', '.join(row['heavy_modules_loaded']) or '없음'}" if "heavy_modules_loaded" in row else ""
+        print(f"{row['script']:13} {row['stage']:24} n={row['n']:>10,}  {row['seconds_median'] * 1000:10.2f}ms {peak}{heavy}")
+    print(f"결과 저장: {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
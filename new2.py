@@ -1,9 +1,9 @@
 import streamlit as st
-import numpy as np
-import matplotlib.pyplot as plt
-# Matplotlib 한글 설정 (웹 환경에서도 적용되도록 코드에 포함)
-plt.rcParams['font.family'] = 'Malgun Gothic' # 예시: Windows 사용자라면 'Malgun Gothic' 시도
-plt.rcParams['axes.unicode_minus'] = False # 마이너스 부호 깨짐 방지
+import pandas as pd # 첫 화면의 표 편집기(st.data_editor)가 어차피 pandas/pyarrow를 불러오므로 미루지 않음
+
+from statkit.parsing import parse_cells
+from statkit.result_cache import ResultCache, content_key
+from statkit.stats_engine import PairStats
 
 # --- 웹 페이지 기본 설정 ---
 st.set_page_config(page_title="학생용 통계 분석 웹 프로그램", layout="wide")
@@ -26,20 +26,38 @@ st.write("---") # 구분선 추가
 # 응답자 수 입력
 num_respondents = st.number_input("총 응답자(데이터 쌍) 수 입력:", min_value=2, value=2, step=1)
 
-st.write(f"아래에 {num_respondents}명의 응답자 데이터를 입력해주세요.")
-
-# 각 응답자별 데이터 입력 칸 생성
-# 사용자 입력에 따라 동적으로 위젯을 생성할 때는 Streamlit의 'key'가 중요합니다.
-input_cols = st.columns(2) # X와 Y 입력을 나란히 배치할 열
-x_inputs = {} # X 입력 위젯 값 저장 딕셔너리
-y_inputs = {} # Y 입력 위젯 값 저장 딕셔너리
-input_errors = [] # 입력별 오류 저장 리스트
-
-# 응답자 수 만큼 입력 칸 생성
-for i in range(int(num_respondents)):
-    # 각 입력 칸에 고유한 'key'를 부여해야 Streamlit이 값을 제대로 추적합니다.
-    x_inputs[i] = input_cols[0].text_input(f"응답자 {i+1}: {x_var_name} 값", key=f"x_input_{i}")
-    y_inputs[i] = input_cols[1].text_input(f"응답자 {i+1}: {y_var_name} 값", key=f"y_input_{i}")
+st.write(f"아래 표에 {num_respondents}명의 응답자 데이터를 입력해주세요. (엑셀에서 복사한 여러 칸을 한 번에 붙여넣을 수도 있습니다.)")
+
+# 응답자마다 입력 칸 위젯을 만드는 대신 표 편집기 하나 사용 (응답자가 많아져도 위젯 수는 그대로)
+# 칸은 글자로 받아 두었다가 분석할 때 열 단위로 한 번에 숫자로 변환
+# 표는 세션에 보관해 두고, 응답자 수를 바꾸면 입력한 값은 그대로 둔 채 끝에서 줄만 더하거나 뺌
+respondent_labels = [f"응답자 {i+1}" for i in range(int(num_respondents))]
+respondent_frame = st.session_state.get("respondent_frame")
+if respondent_frame is None or len(respondent_frame) != len(respondent_labels):
+    previous_values = st.session_state.get("respondent_values") # 직전 실행에서 편집기가 돌려준 표
+    if previous_values is None:
+        respondent_frame = pd.DataFrame({"x": [""] * len(respondent_labels), "y": [""] * len(respondent_labels)},
+                                        index=respondent_labels)
+    else:
+        respondent_frame = previous_values.reindex(respondent_labels, fill_value="")
+    st.session_state["respondent_frame"] = respondent_frame
+    st.session_state.pop("respondent_table", None) # 편집 내용은 새 표에 이미 들어 있으므로 편집기 상태는 비움
+respondent_table = st.data_editor(
+    respondent_frame,
+    column_config={
+        "x": st.column_config.TextColumn(f"{x_var_name} 값"),
+        "y": st.column_config.TextColumn(f"{y_var_name} 값"),
+    },
+    num_rows="fixed",
+    key="respondent_table",
+)
+st.session_state["respondent_values"] = respondent_table
+
+
+# --- 산점도 PNG 캐시 (서버 프로세스 하나에 하나, 같은 데이터/변수명이면 다시 그리지 않음) ---
+@st.cache_resource
+def get_png_cache():
+    return ResultCache() # 메모리 예산은 환경변수 STATS_RESULT_CACHE_MB (기본 256MB)
 
 
 # --- 분석 실행 버튼 ---
@@ -50,32 +68,19 @@ analyze_button = st.button("통계 분석 실행")
 if analyze_button: # 버튼이 클릭되면 이 블록 실행
     st.header("분석 결과")
 
-    x_data = []
-    y_data = []
-    errors = [] # 데이터 파싱 오류
-
-    # 각 응답자 입력 칸에서 값 읽어오기 및 파싱
-    for i in range(int(num_respondents)):
-        x_val_str = x_inputs[i].strip() # 입력 값 가져와서 좌우 공백 제거
-        y_val_str = y_inputs[i].strip()
-
-        # X 값 파싱 및 검증
-        if not x_val_str:
-             errors.append(f"응답자 {i+1}: {x_var_name} 값이 비어 있습니다.")
-        else:
-            try:
-                x_data.append(float(x_val_str))
-            except ValueError:
-                errors.append(f"응답자 {i+1}: '{x_val_str}'는 유효한 {x_var_name} 숫자가 아닙니다.")
-
-        # Y 값 파싱 및 검증
-        if not y_val_str:
-             errors.append(f"응답자 {i+1}: {y_var_name} 값이 비어 있습니다.")
-        else:
-            try:
-                y_data.append(float(y_val_str))
-            except ValueError:
-                 errors.append(f"응답자 {i+1}: '{y_val_str}'는 유효한 {y_var_name} 숫자가 아닙니다.")
+    # 표의 X, Y 열을 각각 한 번에 float64 배열로 변환 (빈칸/오류 칸은 행 번호로 돌려받음)
+    x_parsed = parse_cells(respondent_table["x"].to_numpy())
+    y_parsed = parse_cells(respondent_table["y"].to_numpy())
+
+    # 오류 메시지는 예전처럼 응답자 순서대로 (같은 응답자는 X, Y 순서)
+    error_rows = [] # (행 번호, 열 순서, 메시지)
+    for column_order, var_name, parsed in ((0, x_var_name, x_parsed), (1, y_var_name, y_parsed)):
+        error_rows += [(i, column_order, f"응답자 {i+1}: {var_name} 값이 비어 있습니다.") for i in parsed.empty_rows.tolist()]
+        error_rows += [(i, column_order, f"응답자 {i+1}: '{token}'는 유효한 {var_name} 숫자가 아닙니다.") for i, token in parsed.bad_cells]
+    errors = [message for _, _, message in sorted(error_rows)] # 데이터 파싱 오류
+
+    x_data = x_parsed.values
+    y_data = y_parsed.values
 
     # --- 데이터 유효성 검사 (파싱 후) ---
     # 이 단계에서는 파싱 오류, 개수 불일치(이 방식에서는 발생 어려움), 최소 개수만 확인
@@ -86,9 +91,9 @@ if analyze_button: # 버튼이 클릭되면 이 블록 실행
         st.warning("입력 데이터에 오류가 있습니다. 분석을 중단합니다.")
         st.stop() # 오류 발생 시 분석 중단
 
-    # 응답자 수와 실제 파싱된 데이터 개수 일치 확인 (이미 반복문에서 처리되므로 형식상 확인)
+    # 응답자 수와 실제 파싱된 데이터 개수 일치 확인 (같은 표의 두 열이므로 형식상 확인)
     if len(x_data) != len(y_data):
-         # 이 경우는 위의 반복문에서 파싱 오류로 이미 걸러졌을 가능성이 높지만 안전을 위해 둠
+         # 이 경우는 위의 파싱 오류로 이미 걸러졌을 가능성이 높지만 안전을 위해 둠
          st.error(f"내부 오류: 파싱된 {x_var_name} 값 개수({len(x_data)})와 {y_var_name} 값 개수({len(y_data)})가 다릅니다.")
          st.warning("데이터 개수 불일치 오류. 분석을 중단합니다.")
          st.stop()
@@ -101,9 +106,9 @@ if analyze_button: # 버튼이 클릭되면 이 블록 실행
          st.stop()
 
 
-    # 유효성 검사 통과 후 NumPy 배열로 변환
-    x_np = np.array(x_data)
-    y_np = np.array(y_data)
+    # 파서가 이미 NumPy 배열(float64)로 돌려줌
+    x_np = x_data
+    y_np = y_data
 
     st.success("데이터 입력 및 유효성 검사 통과. 분석을 진행합니다.")
 
@@ -114,12 +119,13 @@ if analyze_button: # 버튼이 클릭되면 이 블록 실행
     st.text(f"  {y_var_name} 값 ({len(y_np)}개): {y_np}")
 
 
-    # 기술 통계 (평균 및 표준편차)
-    mean_x = np.mean(x_np)
-    mean_y = np.mean(y_np)
-    # 표준편차 계산 (표본 표준편차: ddof=1) - 데이터가 1개 이하면 표준편차 계산 불가하므로 조건 추가
-    std_x = np.std(x_np, ddof=1) if len(x_np) > 1 else None
-    std_y = np.std(y_np, ddof=1) if len(y_np) > 1 else None
+    # 기술 통계 (평균 및 표준편차) - 통계 엔진이 편차제곱합/편차곱 합까지 한 번에 계산
+    pair_stats = PairStats.from_arrays(x_np, y_np)
+    mean_x = pair_stats.mean_x
+    mean_y = pair_stats.mean_y
+    # 표준편차 (표본 표준편차: ddof=1) - 데이터가 1개 이하면 None
+    std_x = pair_stats.std_x
+    std_y = pair_stats.std_y
 
 
     st.subheader("기술 통계")
@@ -156,39 +162,19 @@ if analyze_button: # 버튼이 클릭되면 이 블록 실행
     st.write(f"'{x_var_name}'와 '{y_var_name}'의 산점도 그래프:")
 
     # --- 그래프 그리기 시작 (Streamlit에 표시) ---
-    fig, ax = plt.subplots(figsize=(8, 6))
-
-    ax.scatter(x_np, y_np, color='blue', label='Data Points')
-
-    # 회귀선 추가 (기울기를 계산할 수 있을 때만)
-    can_calculate_correlation = sum_of_sq_x_deviations != 0 # 상관계수 분모 0 아니면 회귀선 가능
-    can_calculate_regression = sum_of_sq_x_deviations != 0 # 회귀식 분모 0 아니면 회귀선 가능
-
-    if can_calculate_regression:
-        if np.max(x_np) - np.min(x_np) == 0:
-            x_range = np.array([x_np[0] - 1 if x_np[0] - 1 < x_np[0] else x_np[0], x_np[0] + 1 if x_np[0] + 1 > x_np[0] else x_np[0] + 1])
-        else:
-            x_range = np.array([np.min(x_np) - (np.max(x_np) - np.min(x_np)) * 0.1,
-                                np.max(x_np) + (np.max(x_np) - np.min(x_np)) * 0.1])
-
-        y_line = intercept + slope * x_range
-        ax.plot(x_range, y_line, color='red', label=f'회귀선 (Ŷ = {intercept:.2f} + {slope:.2f}X)')
-        ax.set_title(f'[{x_var_name}]와 [{y_var_name}]의 산점도 및 회귀선')
-
-    elif len(np.unique(x_np)) == 1: # X 값이 모두 같아서 수직선 형태일 때
-         ax.axvline(x=mean_x, color='red', linestyle='--', label=f'X = {mean_x:.2f} ({x_var_name})')
-         ax.set_title(f'[{x_var_name}] 값이 고정된 산점도')
-    else:
-         ax.set_title('산점도 (데이터 부족)')
-
-
-    ax.set_xlabel(x_var_name)
-    ax.set_ylabel(y_var_name)
-    ax.grid(True)
-    ax.legend()
-
-    st.pyplot(fig)
-    plt.close(fig)
+    # Matplotlib은 분석할 때 처음 불러옴 (첫 화면 로딩 시간 단축). 한글 글꼴은 처음 그릴 때 한 번만 찾아 기억
+    from statkit.mpl_render import configure_korean_font, render_scatter_png
+    if configure_korean_font() is None:
+        st.info("서버에 한글 글꼴이 없어 그래프의 한글이 네모로 보일 수 있습니다. (관리자: 나눔고딕 등 한글 글꼴 설치 필요)")
+    # 같은 데이터와 변수명으로 이미 그린 적이 있으면 PNG를 그대로 재사용
+    png_cache = get_png_cache()
+    png_key = content_key(x_np.tobytes(), y_np.tobytes(), x_var_name, y_var_name)
+    png = png_cache.get(png_key)
+    if png is None:
+        png = render_scatter_png(x_np, y_np, pair_stats, x_var_name, y_var_name)
+        png_cache.put(png_key, png)
+
+    st.image(png)
 
 
     st.write("--- 통계 분석 완료 ---")
@@ -0,0 +1 @@
+"""통계 분석 웹 프로그램에서 쓰는 계산 모듈 모음 (Streamlit 없이 import 가능)."""
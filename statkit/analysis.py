@@ -0,0 +1,211 @@
+"""한 번의 분석 결과를 담는 객체와, 웹 화면/일괄 분석이 같이 쓰는 분석 순서.
+
+run_analysis는 app_final.py의 "통계 분석 실행"과 statkit.batch가 모두 부르므로
+두 곳의 숫자가 항상 같습니다 (Streamlit 없이 import 가능).
+analyze_text/analyze_file은 입력 검사까지 포함하고 화면에 보여줄 입력 오류는 InputError로 알리므로,
+스크립트 스레드 밖(statkit.workers)에서도 실행할 수 있습니다.
+"""
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+from statkit import incremental
+from statkit.figures import PLOT_MODE_DENSITY, build_group_figure, build_scatter_figure
+from statkit.grouped import GroupStats, grouped_stats
+from statkit.ingest import ingest
+from statkit.parsing import parse_lines, split_lines
+from statkit.payload import figure_nbytes
+from statkit.rank_corr import RankCorrelation, rank_correlations
+from statkit.resampling import DEFAULT_RESAMPLES, BootstrapCI, PermutationResult, auto_jobs, bootstrap_ci, permutation_test
+from statkit.robust import MAX_POINTS as ROBUST_MAX_POINTS, TheilSen, theil_sen
+from statkit.stats_engine import Summary, summarize
+
+
+@dataclass
+class AnalysisResult:
+    x: np.ndarray
+    y: np.ndarray
+    summary: Summary
+    figure: Optional[Any] = None # 데이터 쌍이 2개 미만이면 None
+    figure_nbytes: int = 0 # 그래프를 브라우저로 보낼 때의 크기 (바이트)
+    rank_correlation: Optional[RankCorrelation] = None # 스피어만/켄달 (선택하고 값을 보관한 경우만)
+    robust_line: Optional[TheilSen] = None # 이상값에 강한 회귀선 (선택했고 ROBUST_MAX_POINTS개 이하인 경우만)
+    bootstrap: Optional[BootstrapCI] = None # 부트스트랩 신뢰구간 (선택한 경우만)
+    permutation: Optional[PermutationResult] = None # 순열 검정 p-값 (선택한 경우만)
+    n_dropped: int = 0 # 파일에서 숫자가 아니거나 비어 있어서 버린 행 수
+    groups: Optional[GroupStats] = None # 그룹별 통계 (그룹을 입력한 경우만)
+    group_figure: Optional[Any] = None # 그룹별 색/회귀선 산점도
+
+
+@dataclass(frozen=True)
+class AnalysisOptions:
+    """화면의 분석 선택 항목 (결과 캐시 키에도 그대로 들어감)."""
+    large_plot_mode: str = PLOT_MODE_DENSITY
+    compact_payload: bool = True # 그래프 데이터를 float32로 보냄
+    robust: bool = False # Theil–Sen 회귀선
+    bootstrap: bool = False
+    permutation: bool = False
+    n_resamples: int = DEFAULT_RESAMPLES # 부트스트랩 재표본 수 = 순열 검정 최대 횟수
+    seed: int = 0
+    figure: bool = True # False면 Plotly 그래프를 만들지 않음 (일괄 분석에서 그래프가 필요 없을 때)
+    rank_correlation: bool = False # 스피어만 ρ, 켄달 τ-b (큰 n에서는 통계량 계산보다 훨씬 오래 걸림)
+
+
+class InputError(ValueError):
+    """입력 데이터 오류. 화면에는 messages를 하나씩 보여주고 summary로 분석 중단을 알립니다."""
+
+    def __init__(self, messages, summary):
+        super().__init__("\n".join(messages))
+        self.messages = list(messages)
+        self.summary = summary
+
+
+def expected_laps(options, grouped=False):
+    """analyze_text/analyze_file이 lap()을 부르는 최대 횟수 (진행률 표시용)."""
+    return 4 + options.robust + options.figure + options.rank_correlation + options.bootstrap + options.permutation + grouped * (1 + options.figure)
+
+
+def analyze_text(x_data_str, y_data_str, x_var_name, y_var_name, options, previous_state=None, timer=None,
+                 group_str="", n_jobs=None):
+    """붙여넣은 X, Y 값(한 줄에 하나)을 검사하고 분석합니다. (AnalysisResult, 다음 증분 갱신 상태)를 돌려줍니다.
+
+    직전 상태(previous_state)에서 몇 줄만 추가/수정했으면 바뀐 줄만 다시 계산합니다.
+    group_str에 X, Y와 같은 줄 순서로 그룹 이름을 넣으면 그룹별 통계도 계산합니다.
+    """
+    lap = timer.lap if timer is not None else (lambda stage: None)
+    # X, Y 값 줄 단위로 분리 (줄바꿈 기준)
+    x_lines = split_lines(x_data_str)
+    y_lines = split_lines(y_data_str)
+
+    # 데이터 개수 일치 기본 확인 (파싱 전에)
+    if len(x_lines) != len(y_lines):
+        raise InputError([f"오류: 입력된 {x_var_name} 값의 줄 수({len(x_lines)})와 {y_var_name} 값의 줄 수({len(y_lines)})가 다릅니다. 쌍으로 입력해주세요."],
+                         "데이터 개수 불일치 오류. 분석을 중단합니다.")
+    groups = None
+    if group_str.strip():
+        group_lines = split_lines(group_str)
+        if len(group_lines) != len(x_lines):
+            raise InputError([f"오류: 그룹의 줄 수({len(group_lines)})와 {x_var_name} 값의 줄 수({len(x_lines)})가 다릅니다. 같은 줄에 입력해주세요."],
+                             "데이터 개수 불일치 오류. 분석을 중단합니다.")
+        # 빈 줄은 값 배열에서 빠지므로 그룹 이름도 같은 줄을 뺌
+        groups = [group for group, line in zip(group_lines, x_lines) if line.strip()]
+
+    state = incremental.update(previous_state, x_lines, y_lines)
+    if state is not None:
+        x, y, pair = state.x, state.y, state.pair
+        lap("incremental_update")
+    else:
+        # 줄 전체를 한 번에 float64 배열로 변환 (빈 줄은 무시, 오류 줄은 번호와 원문을 돌려받음)
+        x_parsed = parse_lines(x_lines)
+        y_parsed = parse_lines(y_lines)
+        lap("parse")
+
+        errors = [f"{x_var_name} 값 오류 (줄 {line_no}): '{token}'는 유효한 숫자가 아닙니다." for line_no, token in x_parsed.bad_lines]
+        errors += [f"{y_var_name} 값 오류 (줄 {line_no}): '{token}'는 유효한 숫자가 아닙니다." for line_no, token in y_parsed.bad_lines]
+        if errors:
+            raise InputError(errors, "입력 데이터에 오류가 있습니다. 분석을 중단합니다.")
+
+        x, y = x_parsed.values, y_parsed.values
+        # 파싱 결과의 데이터 개수 최종 확인 (빈 줄 무시 등으로 인해 발생 가능)
+        if len(x) != len(y):
+            raise InputError([f"내부 오류: 유효한 {x_var_name} 값 개수({len(x)})와 유효한 {y_var_name} 값 개수({len(y)})가 다릅니다. 쌍으로 입력해주세요."],
+                             "데이터 개수 불일치 오류. 분석을 중단합니다.")
+        if len(x) < 2:
+            raise InputError([f"오류: 유효한 데이터 쌍은 최소 2개 이상이어야 합니다. 현재 {len(x)}개 입니다."],
+                             "데이터 부족 오류. 분석을 중단합니다.")
+        pair = None # 아래 run_analysis에서 전체 계산
+        lap("validate")
+
+    analysis = run_analysis(x, y, x_var_name, y_var_name, options, pair=pair, timer=timer, n_jobs=n_jobs, groups=groups)
+    if state is None:
+        state = incremental.IncrementalState.from_full(x_lines, y_lines, x, y, analysis.summary.pair)
+    return analysis, state
+
+
+def analyze_file(source, fmt, x_column, y_column, x_var_name, y_var_name, options, streaming=False,
+                 timer=None, on_chunk=None, n_jobs=None, group_column=None):
+    """파일을 덩어리 단위로 읽으면서 통계량을 누적하고 분석합니다.
+
+    streaming=True이면 값을 보관하지 않고 충분통계량과 중앙값 스케치만 씁니다 (순위 상관/재표본/산점도/그룹 없음).
+    """
+    lap = timer.lap if timer is not None else (lambda stage: None)
+    try:
+        ingested = ingest(source, x_column, y_column, fmt, keep_arrays=not streaming, sketch=streaming, on_chunk=on_chunk,
+                          group_col=group_column)
+    except Exception as e:
+        raise InputError([f"오류: 파일을 읽을 수 없습니다 ({e})"], "파일 읽기 오류. 분석을 중단합니다.") from e
+    lap("ingest (읽기 + 충분통계량)")
+
+    # 최소 데이터 쌍 개수 확인
+    if ingested.pair.n < 2:
+        raise InputError([f"오류: 유효한 데이터 쌍은 최소 2개 이상이어야 합니다. 현재 {ingested.pair.n}개 입니다."],
+                         "데이터 부족 오류. 분석을 중단합니다.")
+    if streaming:
+        summary = Summary.from_sketches(ingested.pair, ingested.x_sketch, ingested.y_sketch)
+        lap("stats.summary (평균/중앙값/최빈값/표준편차/r/회귀식)")
+        return AnalysisResult(None, None, summary, n_dropped=ingested.n_dropped)
+    analysis = run_analysis(ingested.x, ingested.y, x_var_name, y_var_name, options, pair=ingested.pair,
+                            timer=timer, n_jobs=n_jobs, groups=ingested.groups)
+    analysis.n_dropped = ingested.n_dropped
+    return analysis
+
+
+def run_analysis(x, y, x_var_name, y_var_name, options, pair=None, timer=None, n_jobs=None, groups=None):
+    """통계량 → Theil–Sen → 그래프 → 순위 상관 → 부트스트랩 → 순열 검정 순서로 계산합니다 (통계량 외에는 선택한 것만).
+
+    pair를 주면 (증분 갱신/파일 읽기에서 이미 구한 경우) 충분통계량은 다시 계산하지 않습니다.
+    groups(점마다 그룹 이름)를 주면 그룹별 통계와 그룹별 산점도도 만듭니다.
+    n_jobs가 None이면 작업량을 보고 재표본 프로세스 수를 정합니다 (seed가 같으면 프로세스 수와 관계없이 같은 결과).
+    statkit.workers의 작업 스레드처럼 프로세스 수를 따로 제한하는 곳에서는 n_jobs=1을 넘깁니다.
+    """
+    lap = timer.lap if timer is not None else (lambda stage: None)
+    summary = summarize(x, y, pair=pair)
+    lap("stats.summary (평균/중앙값/최빈값/표준편차/r/회귀식)")
+
+    # 이상값에 강한 회귀선 (작은 n은 모든 기울기로 정확히, 큰 n은 O(n log n) 선택 알고리즘, 너무 크면 생략)
+    robust_line = None
+    if options.robust and summary.pair.can_calculate_regression and len(x) <= ROBUST_MAX_POINTS:
+        robust_line = theil_sen(x, y, seed=options.seed)
+        lap("stats.theil_sen")
+
+    # 산점도 그래프도 미리 만들어 두면 다시 분석할 때 그대로 재사용 가능
+    fig = None
+    if options.figure and len(x) >= 2:
+        fig = build_scatter_figure(x, y, summary.pair, x_var_name, y_var_name, options.large_plot_mode, robust_line,
+                                   compact=options.compact_payload)
+        lap("figure.build")
+
+    # 순위 상관계수 (스피어만, 켄달): 변수마다 정렬 한 번, 켄달은 병합 정렬 방식으로 O(n log n)
+    rank_correlation = None
+    if options.rank_correlation:
+        rank_correlation = rank_correlations(x, y)
+        lap("stats.rank_correlation")
+
+    jobs = auto_jobs(len(x), options.n_resamples) if n_jobs is None else n_jobs
+    # 부트스트랩 신뢰구간 (재표본을 묶음 단위로 한꺼번에 뽑아 계산)
+    bootstrap = None
+    if options.bootstrap and summary.pair.can_calculate_regression:
+        bootstrap = bootstrap_ci(x, y, options.n_resamples, seed=options.seed, n_jobs=jobs)
+        lap("stats.bootstrap")
+
+    # 순열 검정 (p-값이 유의수준 0.05보다 확실히 크거나 작아지면 최대 횟수 전에 멈춤)
+    permutation = None
+    if options.permutation and summary.pair.can_calculate_correlation:
+        permutation = permutation_test(x, y, options.n_resamples, seed=options.seed, n_jobs=jobs)
+        lap("stats.permutation")
+
+    # 그룹별 통계 (그룹 순으로 한 번 정렬한 뒤 구간 합으로 모든 그룹을 한꺼번에 계산)
+    group_stats = None
+    group_fig = None
+    if groups is not None:
+        group_stats = grouped_stats(x, y, groups)
+        lap("stats.grouped")
+        if options.figure:
+            group_fig = build_group_figure(x, y, group_stats, x_var_name, y_var_name, compact=options.compact_payload)
+            lap("figure.grouped")
+
+    fig_nbytes = sum(figure_nbytes(f) for f in (fig, group_fig) if f is not None)
+    lap("figure.serialize")
+    return AnalysisResult(x, y, summary, fig, fig_nbytes, rank_correlation, robust_line, bootstrap, permutation,
+                          groups=group_stats, group_figure=group_fig)
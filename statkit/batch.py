@@ -0,0 +1,249 @@
+"""여러 데이터 파일을 화면 없이 한꺼번에 분석하기 (학기말 보고서용).
+
+    python -m statkit.batch data/                          # 폴더 안의 CSV/TSV/Parquet 파일 전부 (하위 폴더 포함)
+    python -m statkit.batch manifest.csv                   # 목록 파일 (path, x_column, y_column, x_name, y_name 열)
+    python -m statkit.batch data/ --robust --rank-correlation --bootstrap --permutation --png --html --output-dir report
+
+파일마다 웹 화면의 파일 업로드와 같은 함수(statkit.analysis.analyze_file)로 계산하므로
+숫자가 웹 화면과 같습니다. 파일들은 프로세스 풀에서 나눠 계산하고, 결과는 입력 순서대로
+report.json(모든 값)과 report.csv(한 파일에 한 줄)로 저장합니다. 읽을 수 없거나 데이터가 부족한 파일은
+error 열에 이유를 적고 나머지는 계속 분석합니다.
+"""
+import argparse
+import csv
+import functools
+import hashlib
+import json
+import os
+import re
+import sys
+from typing import NamedTuple, Optional
+
+from statkit.analysis import AnalysisOptions, analyze_file
+from statkit.ingest import detect_format, read_column_names
+from statkit.resampling import DEFAULT_RESAMPLES
+
+# .txt는 메모나 한 열짜리 값 목록인 경우가 많아 폴더에서 찾을 때는 제외 (목록 파일에 적으면 CSV로 읽음)
+DATA_EXTENSIONS = (".csv", ".tsv", ".tab", ".parquet", ".pq")
+DEFAULT_OUTPUT_DIR = "batch_report"
+
+# report.csv의 열 순서 (report.json에도 같은 키가 들어감)
+REPORT_COLUMNS = (
+    "dataset", "path", "x_column", "y_column", "x_name", "y_name", "n", "n_dropped",
+    "mean_x", "mean_y", "median_x", "median_y",
+    "mode_x", "mode_x_count", "mode_y", "mode_y_count", "std_x", "std_y",
+    "r", "slope", "intercept", "spearman", "kendall_tau_b",
+    "theil_sen_slope", "theil_sen_intercept", "theil_sen_exact",
+    "bootstrap_r_low", "bootstrap_r_high", "bootstrap_slope_low", "bootstrap_slope_high",
+    "bootstrap_intercept_low", "bootstrap_intercept_high", "bootstrap_resamples",
+    "permutation_p_value", "permutation_n",
+    "png", "html", "error",
+)
+
+
+class BatchJob(NamedTuple):
+    """분석할 데이터 파일 하나. 열/변수 이름이 None이면 첫 두 열과 그 열 이름을 사용 (열이 하나뿐이면 오류)."""
+    dataset: str # 보고서에 쓰는 이름 (입력 폴더/목록 파일 기준 상대 경로)
+    path: str
+    x_column: Optional[str] = None
+    y_column: Optional[str] = None
+    x_name: Optional[str] = None
+    y_name: Optional[str] = None
+
+
+def find_jobs(source, x_column=None, y_column=None):
+    """폴더면 안의 데이터 파일을 모두, 파일이면 목록(CSV)에 적힌 파일을 분석 대상으로 만듭니다."""
+    if os.path.isdir(source):
+        paths = []
+        for folder, _, files in os.walk(source):
+            paths += [os.path.join(folder, name) for name in files if name.lower().endswith(DATA_EXTENSIONS)]
+        return [BatchJob(os.path.relpath(path, source), path, x_column, y_column) for path in sorted(paths)]
+    return read_manifest(source, x_column, y_column)
+
+
+def read_manifest(manifest_path, x_column=None, y_column=None):
+    """목록 CSV를 읽습니다. path 열만 필수이고, 상대 경로는 목록 파일이 있는 폴더 기준입니다."""
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    with open(manifest_path, newline="", encoding="utf-8-sig") as f: # 엑셀에서 저장한 BOM 허용
+        rows = list(csv.DictReader(f))
+    if rows and "path" not in rows[0]:
+        raise ValueError(f"목록 파일 {manifest_path}에 path 열이 없습니다.")
+    jobs = []
+    for row in rows:
+        path = row["path"].strip()
+        if not path:
+            continue
+        jobs.append(BatchJob(
+            path,
+            os.path.join(base, path),
+            row.get("x_column") or x_column,
+            row.get("y_column") or y_column,
+            row.get("x_name") or None,
+            row.get("y_name") or None,
+        ))
+    return jobs
+
+
+def analyze_job(job, options, figure_dir=None, png=False, html=False):
+    """파일 하나를 분석해 보고서 한 줄(dict)을 돌려줍니다 (프로세스 풀에서 실행)."""
+    record = dict.fromkeys(REPORT_COLUMNS)
+    record.update(dataset=job.dataset, path=job.path)
+    try:
+        fmt = detect_format(job.path)
+        x_column, y_column = job.x_column, job.y_column
+        if x_column is None or y_column is None:
+            names = read_column_names(job.path, fmt)
+            x_column = x_column or (names[0] if names else None)
+            y_candidates = [name for name in names if name != x_column] # Y는 X와 다른 열이어야 함
+            if y_column is None and not y_candidates:
+                raise ValueError(f"열이 {len(names)}개뿐이라 Y로 쓸 열이 없습니다 (X, Y 두 열이 필요합니다).")
+            y_column = y_column or y_candidates[0]
+        x_name, y_name = job.x_name or x_column, job.y_name or y_column
+        record.update(x_column=x_column, y_column=y_column, x_name=x_name, y_name=y_name)
+
+        # 이미 여러 프로세스로 파일을 나눠 계산하므로 재표본은 프로세스 하나로 (seed가 같으면 결과는 같음)
+        analysis = analyze_file(job.path, fmt, x_column, y_column, x_name, y_name, options, n_jobs=1)
+        record.update(analysis_record(analysis))
+
+        stem = os.path.join(figure_dir or "", _figure_file_stem(job))
+        if png:
+            from statkit.mpl_render import render_scatter_png # 그림을 저장할 때만 불러옴
+            with open(stem + ".png", "wb") as f:
+                f.write(render_scatter_png(analysis.x, analysis.y, analysis.summary.pair, x_name, y_name))
+            record["png"] = stem + ".png"
+        if html and analysis.figure is not None:
+            analysis.figure.write_html(stem + ".html", include_plotlyjs="cdn")
+            record["html"] = stem + ".html"
+    except Exception as e: # 한 파일의 오류로 전체 일괄 분석이 멈추지 않도록 기록만 함
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+
+def analysis_record(analysis):
+    """AnalysisResult에서 웹 화면에 보이는 값을 모두 꺼냅니다 (계산할 수 없는 값은 None)."""
+    summary = analysis.summary
+    pair = summary.pair
+    record = {
+        "n": pair.n,
+        "n_dropped": analysis.n_dropped,
+        "mean_x": pair.mean_x,
+        "mean_y": pair.mean_y,
+        "median_x": summary.median_x,
+        "median_y": summary.median_y,
+        "std_x": pair.std_x,
+        "std_y": pair.std_y,
+        "r": pair.correlation,
+        "slope": pair.slope,
+        "intercept": pair.intercept if pair.can_calculate_regression else None,
+    }
+    for axis, result in (("x", summary.mode_x), ("y", summary.mode_y)):
+        # 모든 값이 한 번씩만 나오면 최빈값 없음 (빈 목록)
+        record[f"mode_{axis}"] = result.modes.tolist() if result.has_mode else []
+        record[f"mode_{axis}_count"] = result.count
+    if analysis.rank_correlation is not None:
+        record["spearman"] = analysis.rank_correlation.spearman
+        record["kendall_tau_b"] = analysis.rank_correlation.kendall_tau_b
+    if analysis.robust_line is not None:
+        record["theil_sen_slope"] = analysis.robust_line.slope
+        record["theil_sen_intercept"] = analysis.robust_line.intercept
+        record["theil_sen_exact"] = analysis.robust_line.exact
+    if analysis.bootstrap is not None:
+        bootstrap = analysis.bootstrap
+        record["bootstrap_r_low"], record["bootstrap_r_high"] = bootstrap.r
+        record["bootstrap_slope_low"], record["bootstrap_slope_high"] = bootstrap.slope
+        record["bootstrap_intercept_low"], record["bootstrap_intercept_high"] = bootstrap.intercept
+        record["bootstrap_resamples"] = bootstrap.n_resamples
+    if analysis.permutation is not None:
+        record["permutation_p_value"] = analysis.permutation.p_value
+        record["permutation_n"] = analysis.permutation.n_permutations
+    return record
+
+
+def run_batch(jobs, options, n_workers=None, figure_dir=None, png=False, html=False, on_done=None):
+    """jobs를 프로세스 풀에서 분석하고 입력 순서대로 보고서 줄 목록을 돌려줍니다.
+
+    on_done(완료 개수, 보고서 줄)을 주면 파일 하나가 끝날 때마다 호출합니다 (진행 표시용).
+    """
+    task = functools.partial(analyze_job, options=options, figure_dir=figure_dir, png=png, html=html)
+    n_workers = min(n_workers or os.cpu_count() or 1, max(1, len(jobs)))
+    if n_workers == 1:
+        results = map(task, jobs)
+        pool = None
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=n_workers)
+        results = pool.map(task, jobs)
+    records = []
+    try:
+        for record in results:
+            records.append(record)
+            if on_done is not None:
+                on_done(len(records), record)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return records
+
+
+def write_report(records, output_dir):
+    """report.json(값 그대로)과 report.csv(최빈값 목록은 ';'로 이어 붙임)를 저장합니다."""
+    json_path = os.path.join(output_dir, "report.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(records, f, ensure_ascii=False, indent=1)
+    csv_path = os.path.join(output_dir, "report.csv")
+    with open(csv_path, "w", newline="", encoding="utf-8-sig") as f: # 엑셀에서 한글이 깨지지 않도록 BOM
+        writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow({key: ";".join(map(repr, value)) if isinstance(value, list) else value
+                             for key, value in record.items()})
+    return json_path, csv_path
+
+
+def _figure_file_stem(job):
+    # 하위 폴더 구분자와 파일 이름에 쓸 수 없는 글자를 '_'로 바꾸고, 작업 전체(경로, 확장자, 열)의 짧은 해시를 붙임
+    # (sub/a.csv와 sub_a.csv, c0.csv와 c0.tsv, 같은 파일의 다른 열 조합이 서로 덮어쓰지 않도록)
+    digest = hashlib.blake2b(repr(tuple(job)).encode("utf-8"), digest_size=4).hexdigest()
+    return re.sub(r'[\\/:*?"<>|]+', "_", os.path.splitext(job.dataset)[0]) + "-" + digest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="데이터 파일이 있는 폴더 또는 목록 CSV (path, x_column, y_column, x_name, y_name)")
+    parser.add_argument("--x-column", help="X로 사용할 열 이름 (기본: 첫 번째 열)")
+    parser.add_argument("--y-column", help="Y로 사용할 열 이름 (기본: 두 번째 열)")
+    parser.add_argument("--robust", action="store_true", help="이상값에 강한 회귀선 (Theil–Sen, 10만 개 이하인 파일만)")
+    parser.add_argument("--rank-correlation", action="store_true", help="순위 상관계수 (스피어만, 켄달)")
+    parser.add_argument("--bootstrap", action="store_true", help="부트스트랩 신뢰구간 (r, 기울기, 절편)")
+    parser.add_argument("--permutation", action="store_true", help="순열 검정 p-값")
+    parser.add_argument("--resamples", type=int, default=DEFAULT_RESAMPLES, help="재표본/순열 횟수 (최대)")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드 (웹 화면과 같은 시드면 같은 결과)")
+    parser.add_argument("--png", action="store_true", help="파일마다 산점도 PNG 저장 (Matplotlib)")
+    parser.add_argument("--html", action="store_true", help="파일마다 산점도 HTML 저장 (Plotly)")
+    parser.add_argument("--jobs", type=int, default=None, help="동시에 분석할 프로세스 수 (기본: CPU 개수)")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="보고서와 그림을 저장할 폴더")
+    args = parser.parse_args(argv)
+
+    jobs = find_jobs(args.source, args.x_column, args.y_column)
+    if not jobs:
+        parser.error(f"{args.source}에서 분석할 데이터 파일을 찾지 못했습니다.")
+    figure_dir = os.path.join(args.output_dir, "figures")
+    os.makedirs(figure_dir if args.png or args.html else args.output_dir, exist_ok=True)
+    # HTML은 화면과 같은 그래프를 float64 그대로 저장 (전송량 절약은 브라우저로 보낼 때만 의미 있음)
+    options = AnalysisOptions(compact_payload=False, robust=args.robust, bootstrap=args.bootstrap,
+                              permutation=args.permutation, n_resamples=args.resamples, seed=args.seed,
+                              figure=args.html, rank_correlation=args.rank_correlation)
+
+    def report_progress(done, record):
+        status = f"오류 - {record['error']}" if record["error"] else f"n={record['n']:,}"
+        print(f"[{done}/{len(jobs)}] {record['dataset']}: {status}", file=sys.stderr)
+
+    records = run_batch(jobs, options, args.jobs, figure_dir, args.png, args.html, on_done=report_progress)
+    json_path, csv_path = write_report(records, args.output_dir)
+    n_failed = sum(record["error"] is not None for record in records)
+    print(f"{len(records) - n_failed}개 분석 완료, {n_failed}개 오류 → {json_path}, {csv_path}")
+    return 1 if n_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""산점도 + 회귀선 Plotly 그래프 만들기.
+
+점이 많으면 브라우저가 멈추고 전송량이 커지므로 점 개수에 따라 그리는 방식을 바꿉니다.
+  - WEBGL_THRESHOLD 이하: 일반 SVG 산점도 (go.Scatter)
+  - DENSITY_THRESHOLD 이하: WebGL 산점도 (go.Scattergl)
+  - 그보다 많으면: 서버에서 2D 구간별 개수를 센 밀도 그림, 또는 극값을 남기는 대표점 추리기
+plotly는 그래프를 만들 때 처음 불러오므로, 상수만 쓰는 입력 화면에서는 불러오지 않습니다.
+compact=True이면 점/밀도 배열을 처음부터 float32로 넣습니다. Plotly는 NumPy 배열을 dtype 그대로
+base64로 보내므로 전송량이 절반이 됩니다 (유효숫자 약 7자리).
+"""
+import numpy as np
+
+FIG_WIDTH = 700 # 예시 너비 (픽셀 단위)
+FIG_HEIGHT = 500 # 예시 높이 (픽셀 단위)
+
+WEBGL_THRESHOLD = 10_000
+DENSITY_THRESHOLD = 200_000
+DENSITY_BINS = 200 # 밀도 그림의 가로/세로 구간 수
+DECIMATE_BINS = 2_000 # 대표점 추리기에서 X, Y 각각의 구간 수 (최대 8천 개 점 남음)
+LEGEND_GROUPS = 10 # 그룹이 이 개수 이하면 그룹마다 trace를 따로 만들어 범례에 표시
+
+# 큰 데이터 그래프 방식
+PLOT_MODE_DENSITY = "density"
+PLOT_MODE_DECIMATE = "decimate"
+
+
+def regression_x_range(x, pair_stats):
+    """회귀선을 그릴 X 범위 (데이터 범위의 양쪽으로 10%씩 여유)."""
+    x_min, x_max = pair_stats.min_x, pair_stats.max_x
+    if x_max - x_min == 0:
+        return np.array([x[0] - 1, x[0] + 1])
+    return np.array([x_min - (x_max - x_min) * 0.1,
+                     x_max + (x_max - x_min) * 0.1])
+
+
+def build_scatter_figure(x, y, pair_stats, x_var_name, y_var_name, large_mode=PLOT_MODE_DENSITY, robust_line=None,
+                         compact=False):
+    """산점도에 회귀선(또는 X가 고정일 때 점선)을 겹친 Figure를 만듭니다.
+
+    데이터 쌍이 2개 이상일 때만 호출합니다. large_mode는 점이 DENSITY_THRESHOLD보다
+    많을 때 쓸 방식(PLOT_MODE_DENSITY 또는 PLOT_MODE_DECIMATE)입니다.
+    robust_line(statkit.robust.TheilSen)을 주면 이상값에 강한 회귀선도 함께 그립니다.
+    compact=True이면 점/밀도 배열을 float32로 보냅니다.
+    """
+    import plotly.graph_objects as go # 분석할 때만 불러옴 (첫 화면 로딩 시간 단축)
+
+    fig = go.Figure() # Plotly Figure 객체 생성
+
+    # 산점도 데이터 추가 (점 개수에 따라 방식 선택)
+    n = len(x)
+    if n <= WEBGL_THRESHOLD:
+        fig.add_trace(go.Scatter(
+            x=_sent(x, compact),
+            y=_sent(y, compact),
+            mode='markers', # 점으로 표시
+            name='Data Points' # 범례 이름
+        ))
+    elif n <= DENSITY_THRESHOLD:
+        fig.add_trace(go.Scattergl(x=_sent(x, compact), y=_sent(y, compact), mode='markers', name='Data Points'))
+    elif large_mode == PLOT_MODE_DECIMATE:
+        keep = decimate_extremes(x, y)
+        fig.add_trace(go.Scattergl(x=_sent(x[keep], compact), y=_sent(y[keep], compact), mode='markers',
+                                   name=f'Data Points (대표점 {keep.size:,}개 / 전체 {n:,}개)'))
+    else:
+        fig.add_trace(density_heatmap(x, y, pair_stats, compact=compact))
+    add_reference_line(fig, x, pair_stats, x_var_name)
+    if robust_line is not None:
+        add_robust_line(fig, x, pair_stats, robust_line)
+
+    # 그래프 레이아웃 업데이트 (제목, 축 이름)
+    if pair_stats.can_calculate_regression:
+        title = f'[{x_var_name}]와 [{y_var_name}]의 산점도 및 회귀선'
+    elif pair_stats.min_x == pair_stats.max_x:
+        title = f'[{x_var_name}] 값이 고정된 산점도'
+    else: # 데이터 2개 이상이지만 회귀선/수직선 없는 경우
+        title = f'[{x_var_name}]와 [{y_var_name}]의 산점도'
+    fig.update_layout(title=title,
+                      xaxis_title=x_var_name,
+                      yaxis_title=y_var_name,
+                      width=FIG_WIDTH,
+                      height=FIG_HEIGHT)
+    return fig
+
+
+def add_reference_line(fig, x, pair_stats, x_var_name):
+    """회귀선(계산 가능할 때) 또는 X 고정 점선을 추가합니다."""
+    import plotly.graph_objects as go
+    if pair_stats.can_calculate_regression:
+        slope, intercept = pair_stats.slope, pair_stats.intercept
+        x_range = regression_x_range(x, pair_stats)
+        y_line = intercept + slope * x_range
+        fig.add_trace(go.Scatter(
+            x=x_range,
+            y=y_line,
+            mode='lines', # 선으로 표시
+            name=f'회귀선 (Ŷ = {intercept:.2f} + {slope:.2f}X)', # 범례 이름
+            line=dict(color='red') # 선 색상
+        ))
+    elif pair_stats.min_x == pair_stats.max_x: # X 값이 모두 같아서 수직선 형태일 때
+        mean_x = pair_stats.mean_x
+        fig.add_trace(go.Scatter(
+            x=[mean_x, mean_x], # X 값 고정
+            y=[pair_stats.min_y, pair_stats.max_y], # Y 값 최소~최대 범위
+            mode='lines',
+            name=f'X = {mean_x:.2f} ({x_var_name})',
+            line=dict(color='red', dash='dash') # 점선
+        ))
+
+
+def add_robust_line(fig, x, pair_stats, robust_line):
+    """Theil–Sen 회귀선을 최소제곱 회귀선과 같은 X 범위에 점선으로 추가합니다."""
+    import plotly.graph_objects as go
+    x_range = regression_x_range(x, pair_stats)
+    slope, intercept = robust_line.slope, robust_line.intercept
+    fig.add_trace(go.Scatter(
+        x=x_range,
+        y=intercept + slope * x_range,
+        mode='lines',
+        name=f'Theil–Sen 회귀선 (Ŷ = {intercept:.2f} + {slope:.2f}X)',
+        line=dict(color='green', dash='dash')
+    ))
+
+
+def density_heatmap(x, y, pair_stats, bins=DENSITY_BINS, compact=False):
+    """X, Y를 2D 구간으로 나눠 구간별 점 개수를 색으로 나타낸 Heatmap trace."""
+    import plotly.graph_objects as go
+    x_edges = _edges(pair_stats.min_x, pair_stats.max_x, bins)
+    y_edges = _edges(pair_stats.min_y, pair_stats.max_y, bins)
+    counts = np.bincount(_bin_index(x, x_edges) * bins + _bin_index(y, y_edges), minlength=bins * bins)
+    counts = counts.reshape(bins, bins).astype(np.float64)
+    counts[counts == 0] = np.nan # 빈 구간은 투명하게
+    return go.Heatmap(
+        x=_sent((x_edges[:-1] + x_edges[1:]) / 2, compact),
+        y=_sent((y_edges[:-1] + y_edges[1:]) / 2, compact),
+        z=_sent(counts.T, compact), # counts는 [x, y] 순서, Heatmap은 [행=y, 열=x] 순서
+        colorscale='Blues',
+        colorbar=dict(title='점 개수'),
+        name=f'Data Points (밀도, 전체 {len(x):,}개)',
+        hovertemplate='X: %{x}<br>Y: %{y}<br>개수: %{z}<extra></extra>',
+    )
+
+
+def decimate_extremes(x, y, bins=DECIMATE_BINS):
+    """모양과 이상값을 유지하는 대표점의 인덱스를 돌려줍니다.
+
+    X 구간마다 Y가 가장 작은 점/큰 점, Y 구간마다 X가 가장 작은 점/큰 점을 남기므로
+    점 구름의 테두리와 멀리 떨어진 점(이상값)은 항상 남습니다.
+    """
+    keep = np.concatenate((_extremes_per_bin(x, y, bins), _extremes_per_bin(y, x, bins)))
+    return np.unique(keep)
+
+
+def _extremes_per_bin(key, value, bins):
+    # key 기준 구간마다 value의 최솟값/최댓값 위치 (정렬 한 번으로 구간별 첫/마지막 원소 선택)
+    lo, hi = key.min(), key.max()
+    width = (hi - lo) / bins if hi > lo else 1.0
+    bin_index = np.minimum(((key - lo) / width).astype(np.int64), bins - 1)
+    order = np.lexsort((value, bin_index))
+    sorted_bins = bin_index[order]
+    boundaries = np.flatnonzero(np.diff(sorted_bins)) + 1
+    first = np.concatenate(([0], boundaries))
+    last = np.concatenate((boundaries - 1, [order.size - 1]))
+    return np.concatenate((order[first], order[last]))
+
+
+def _sent(values, compact):
+    # 브라우저로 보낼 배열 (compact면 float32로 만들어 넣음: 나중에 바꾸면 값이 같을 때 Plotly가 무시함)
+    return values.astype(np.float32) if compact and values.dtype == np.float64 else values
+
+
+def _bin_index(values, edges):
+    # np.histogram2d와 같은 구간 번호 (마지막 구간은 오른쪽 끝 포함). 간격이 같으므로 searchsorted 대신 나눗셈으로 구함
+    bins = edges.size - 1
+    index = ((values - edges[0]) * (bins / (edges[-1] - edges[0]))).astype(np.int64)
+    np.clip(index, 0, bins - 1, out=index)
+    # 구간 경계에 딱 걸린 값은 나눗셈 반올림 오차로 한 칸 어긋날 수 있으므로 실제 경계와 비교해 바로잡음
+    index -= (values < edges[index]) & (index > 0)
+    index += (values >= edges[index + 1]) & (index < bins - 1)
+    return index
+
+
+def _edges(lo, hi, bins):
+    if hi == lo: # 값이 모두 같으면 폭 1짜리 구간 하나로
+        lo, hi = lo - 0.5, hi + 0.5
+    return np.linspace(lo, hi, bins + 1)
+
+
+def build_group_figure(x, y, group_stats, x_var_name, y_var_name, compact=False):
+    """그룹별 색으로 점을 찍고 그룹마다 회귀선을 그린 Figure (group_stats: statkit.grouped.GroupStats).
+
+    그룹이 LEGEND_GROUPS개 이하면 그룹마다 점/선 trace를 만들어 범례로 켜고 끌 수 있게 하고,
+    그보다 많으면 점은 그룹 번호를 색으로 쓴 trace 하나, 회귀선은 그룹 사이를 NaN으로 끊은 trace 하나로
+    그리므로 그룹이 수천 개여도 trace는 두 개입니다. compact=True이면 점/선 배열을 float32로 보냅니다.
+    """
+    import plotly.colors
+    import plotly.graph_objects as go
+    n = len(x)
+    codes = group_stats.codes
+    if n > DENSITY_THRESHOLD: # 점이 아주 많으면 테두리/이상값을 남기는 대표점만 표시
+        keep = decimate_extremes(x, y)
+        x, y, codes = x[keep], y[keep], codes[keep]
+    scatter = go.Scatter if len(x) <= WEBGL_THRESHOLD else go.Scattergl
+    x, y = _sent(np.asarray(x), compact), _sent(np.asarray(y), compact)
+
+    # 회귀선: 그룹마다 (X 최솟값, X 최댓값, NaN) 세 점 (기울기를 계산할 수 없는 그룹은 제외)
+    has_line = ~np.isnan(group_stats.slope)
+    line_x = np.column_stack((group_stats.min_x, group_stats.max_x, np.full(group_stats.n.size, np.nan)))
+    line_y = group_stats.intercept[:, None] + group_stats.slope[:, None] * line_x
+    line_x, line_y = _sent(line_x, compact), _sent(line_y, compact)
+
+    fig = go.Figure()
+    k = group_stats.labels.size
+    if k <= LEGEND_GROUPS:
+        palette = plotly.colors.qualitative.Plotly
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(k + 1))
+        for g, label in enumerate(group_stats.labels):
+            color = palette[g % len(palette)]
+            members = order[bounds[g]:bounds[g + 1]]
+            fig.add_trace(scatter(x=x[members], y=y[members], mode='markers', name=str(label),
+                                  legendgroup=str(label), marker=dict(color=color)))
+            if has_line[g]:
+                fig.add_trace(go.Scatter(x=line_x[g, :2], y=line_y[g, :2], mode='lines', legendgroup=str(label),
+                                         name=f'{label} 회귀선 (Ŷ = {group_stats.intercept[g]:.2f} + {group_stats.slope[g]:.2f}X)',
+                                         line=dict(color=color)))
+    else:
+        fig.add_trace(scatter(
+            x=x, y=y, mode='markers', name=f'Data Points (그룹 {k:,}개)',
+            marker=dict(color=codes, colorscale='Turbo', size=5),
+            text=group_stats.labels[codes] if len(x) <= WEBGL_THRESHOLD else None, # 점이 많으면 이름은 생략 (전송량)
+            hovertemplate='%{text}<br>X: %{x}<br>Y: %{y}<extra></extra>' if len(x) <= WEBGL_THRESHOLD else None,
+        ))
+        fig.add_trace(go.Scatter(
+            x=line_x[has_line].ravel(), y=line_y[has_line].ravel(), mode='lines', name='그룹별 회귀선',
+            text=np.repeat(group_stats.labels[has_line], 3), hovertemplate='%{text}<extra></extra>',
+            line=dict(color='rgba(0, 0, 0, 0.5)', width=1),
+        ))
+    fig.update_layout(title=f'[{x_var_name}]와 [{y_var_name}]의 그룹별 산점도 및 회귀선',
+                      xaxis_title=x_var_name,
+                      yaxis_title=y_var_name,
+                      width=FIG_WIDTH,
+                      height=FIG_HEIGHT)
+    return fig
+
+
+def build_correlation_heatmap(r, names):
+    """상관계수 행렬 Heatmap (-1 파랑 ~ +1 빨강, 칸마다 값 표시)."""
+    import plotly.graph_objects as go
+    k = len(names)
+    fig = go.Figure(go.Heatmap(
+        z=r,
+        x=names,
+        y=names,
+        zmin=-1,
+        zmax=1,
+        colorscale='RdBu_r',
+        text=np.round(r, 2),
+        texttemplate='%{text}' if k <= 20 else None, # 변수가 많으면 글자는 생략 (마우스를 올리면 보임)
+        hovertemplate='%{y} - %{x}<br>r = %{z:.4f}<extra></extra>',
+        colorbar=dict(title='r'),
+    ))
+    size = min(max(FIG_HEIGHT, 40 * k + 150), 1000)
+    fig.update_layout(title='상관계수 행렬', width=size + 100, height=size, yaxis_autorange='reversed')
+    return fig
@@ -0,0 +1,91 @@
+"""그룹(반, 성별 등)별 기술 통계와 회귀식.
+
+그룹마다 배열을 잘라 반복하지 않고, 그룹 번호 순으로 한 번 정렬한 뒤 그룹 경계(starts)에서
+np.add.reduceat 같은 구간 합으로 모든 그룹의 합/편차제곱합/공편차합을 한꺼번에 구합니다.
+정렬 키를 (그룹, 값)으로 잡으면 같은 정렬로 그룹별 중앙값도 구간의 가운데 원소로 바로 얻습니다.
+그룹이 수천 개여도 계산량은 정렬 두 번(X, Y 중앙값용)과 배열 연산 몇 번입니다.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+EMPTY_LABEL = "(빈칸)" # 그룹 칸이 비어 있는 행의 그룹 이름
+
+
+class GroupStats(NamedTuple):
+    """그룹별 통계 (모든 배열은 labels 순서, 계산할 수 없는 값은 NaN)."""
+    labels: np.ndarray # 그룹 이름 (정렬 순서)
+    codes: np.ndarray # 입력 순서대로 각 점의 그룹 번호 (labels의 위치)
+    n: np.ndarray
+    mean_x: np.ndarray
+    mean_y: np.ndarray
+    median_x: np.ndarray
+    median_y: np.ndarray
+    std_x: np.ndarray # 표본 표준편차 (ddof=1)
+    std_y: np.ndarray
+    min_x: np.ndarray
+    max_x: np.ndarray
+    r: np.ndarray
+    slope: np.ndarray
+    intercept: np.ndarray
+
+
+def group_codes(groups):
+    """그룹 이름 목록을 (정렬된 이름, 점마다 그룹 번호)로 바꿉니다. 빈 이름은 EMPTY_LABEL."""
+    labels = np.char.strip(np.asarray(groups, dtype=str))
+    labels = np.where(labels == "", EMPTY_LABEL, labels) # 글자 폭이 좁은 배열에 바로 넣으면 잘리므로 np.where로
+    return np.unique(labels, return_inverse=True)
+
+
+def grouped_stats(x, y, groups):
+    """그룹별 개수, 평균, 중앙값, 표준편차, 상관계수, 회귀식을 한 번에 계산합니다."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    labels, codes = group_codes(groups)
+    codes = codes.reshape(-1) # NumPy 2.0의 return_inverse는 입력과 같은 모양
+    n = np.bincount(codes, minlength=labels.size)
+    starts = np.concatenate(([0], np.cumsum(n)[:-1])) # 모든 그룹이 1개 이상이라 경계가 겹치지 않음
+    segment = np.repeat(np.arange(labels.size), n) # 정렬된 위치별 그룹 번호
+
+    # (그룹, X) 순으로 정렬: 구간 합과 X 중앙값/최솟값/최댓값을 같은 순서에서 구함 (X, Y 쌍은 함께 이동)
+    order = np.lexsort((x, codes))
+    xs, ys = x[order], y[order]
+    mean_x = np.add.reduceat(xs, starts) / n
+    mean_y = np.add.reduceat(ys, starts) / n
+    dx = xs - mean_x[segment] # 그룹 평균을 뺀 편차로 합을 구하면 큰 값에서도 상쇄 오차가 작음
+    dy = ys - mean_y[segment]
+    m2_x = np.add.reduceat(dx * dx, starts)
+    m2_y = np.add.reduceat(dy * dy, starts)
+    c_xy = np.add.reduceat(dx * dy, starts)
+    ends = starts + n - 1
+    y_sorted = y[np.lexsort((y, codes))] # Y 중앙값/최솟값/최댓값용
+
+    # 값이 모두 같은지는 최솟값/최댓값으로 판단 (평균이 반올림되면 편차제곱합이 0이 아닌 아주 작은 값이 됨)
+    varies_x = xs[starts] != xs[ends]
+    varies_y = y_sorted[starts] != y_sorted[ends]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        std_x = np.where(n > 1, np.sqrt(m2_x / (n - 1)), np.nan)
+        std_y = np.where(n > 1, np.sqrt(m2_y / (n - 1)), np.nan)
+        r = np.where(varies_x & varies_y, np.clip(c_xy / np.sqrt(m2_x * m2_y), -1.0, 1.0), np.nan)
+        slope = np.where(varies_x, c_xy / m2_x, np.nan)
+    return GroupStats(
+        labels=labels,
+        codes=codes,
+        n=n,
+        mean_x=mean_x,
+        mean_y=mean_y,
+        median_x=_segment_median(xs, starts, n),
+        median_y=_segment_median(y_sorted, starts, n),
+        std_x=std_x,
+        std_y=std_y,
+        min_x=xs[starts],
+        max_x=xs[ends],
+        r=r,
+        slope=slope,
+        intercept=mean_y - slope * mean_x, # 기울기가 NaN이면 절편도 NaN
+    )
+
+
+def _segment_median(sorted_values, starts, n):
+    # 그룹 안에서 정렬된 배열이므로 구간 가운데 원소(짝수 개면 가운데 두 원소의 평균)가 중앙값
+    return (sorted_values[starts + (n - 1) // 2] + sorted_values[starts + n // 2]) / 2
@@ -0,0 +1,102 @@
+"""학생이 몇 줄만 추가/수정했을 때 이전 분석 결과를 이어서 갱신하기.
+
+이전 입력 줄과 새 입력 줄의 공통 앞부분/뒷부분을 찾아 바뀐 구간만 다시 파싱하고,
+충분통계량(평균, 편차제곱합, 공편차합)은 바뀐 줄 수에 비례하는 시간으로 갱신합니다.
+바뀐 구간이 크거나 빈 줄/오류 줄이 섞여 있으면 None을 돌려주고, 호출한 쪽에서 전체를 다시 계산합니다.
+그 뒤의 중앙값/최빈값(정렬)과 그래프는 전체 배열로 다시 만드므로, 절약되는 것은 파싱과 충분통계량 시간입니다.
+"""
+import copy
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from statkit.parsing import parse_lines
+from statkit.stats_engine import PairStats
+
+MAX_CHANGED_FRACTION = 0.1 # 바뀐 줄이 전체의 10%를 넘으면 전체 재계산
+MAX_INCREMENTAL_STEPS = 50 # 빼기 연산의 반올림 오차가 쌓이지 않도록 주기적으로 전체 재계산
+
+_CHUNK = 4096 # 공통 앞/뒷부분 비교 단위 (리스트 슬라이스 비교는 C 수준에서 처리됨)
+
+
+@dataclass
+class IncrementalState:
+    """세션에 보관하는 직전 분석 상태."""
+    x_lines: List[str]
+    y_lines: List[str]
+    x: np.ndarray
+    y: np.ndarray
+    pair: PairStats
+    steps: int = 0 # 마지막 전체 계산 이후 증분 갱신 횟수
+
+    @classmethod
+    def from_full(cls, x_lines, y_lines, x, y, pair):
+        """전체 계산 결과로 상태를 만듭니다. 빈 줄이 있으면 줄 번호와 값 위치가 달라 None."""
+        if len(x) != len(x_lines) or len(y) != len(y_lines):
+            return None
+        return cls(x_lines, y_lines, x, y, pair)
+
+
+def common_prefix_len(a, b):
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i:i + _CHUNK] == b[i:i + _CHUNK]:
+        i += _CHUNK
+    i = min(i, n)
+    # 마지막으로 다른 덩어리 안에서는 한 줄씩 확인
+    end = min(i + _CHUNK, n)
+    while i < end and a[i] == b[i]:
+        i += 1
+    return i
+
+
+def changed_span(old, new):
+    """old와 new에서 바뀐 구간을 (시작, old 끝, new 끝) 형태로 돌려줍니다."""
+    start = common_prefix_len(old, new)
+    limit = min(len(old), len(new)) - start # 앞부분과 겹치지 않도록 뒷부분 길이 제한
+    suffix = common_prefix_len(old[-limit:][::-1], new[-limit:][::-1]) if limit > 0 else 0
+    return start, len(old) - suffix, len(new) - suffix
+
+
+def update(state, x_lines, y_lines) -> Optional[IncrementalState]:
+    """이전 상태에서 바뀐 줄만 반영한 새 상태를 돌려줍니다. 증분 갱신이 어려우면 None."""
+    if state is None or state.steps >= MAX_INCREMENTAL_STEPS:
+        return None
+    if len(x_lines) != len(y_lines):
+        return None
+
+    # X와 Y는 같은 줄끼리 쌍이므로, 두 변화 구간을 합친 범위를 다시 계산
+    spans = [span for span in (changed_span(state.x_lines, x_lines), changed_span(state.y_lines, y_lines))
+             if not span[0] == span[1] == span[2]] # 바뀐 것이 없는 쪽은 제외
+    if not spans:
+        return state
+    start = min(span[0] for span in spans)
+    old_end = max(span[1] for span in spans)
+    new_end = max(span[2] for span in spans)
+    # 두 구간을 합치면 뒷부분 길이가 old/new에서 같아야 쌍이 맞음
+    if len(state.x_lines) - old_end != len(x_lines) - new_end:
+        return None
+
+    n_changed = (old_end - start) + (new_end - start)
+    if n_changed > MAX_CHANGED_FRACTION * max(len(x_lines), 1):
+        return None
+
+    new_x = parse_lines(x_lines[start:new_end])
+    new_y = parse_lines(y_lines[start:new_end])
+    n_new = new_end - start
+    # 빈 줄이나 오류 줄이 있으면 줄 번호를 맞춰 오류를 보여줘야 하므로 전체 경로로
+    if new_x.bad_lines or new_y.bad_lines or len(new_x.values) != n_new or len(new_y.values) != n_new:
+        return None
+
+    pair = copy.copy(state.pair)
+    pair.remove(PairStats.from_arrays(state.x[start:old_end], state.y[start:old_end]))
+    pair.merge(PairStats.from_arrays(new_x.values, new_y.values))
+
+    x = np.concatenate((state.x[:start], new_x.values, state.x[old_end:]))
+    y = np.concatenate((state.y[:start], new_y.values, state.y[old_end:]))
+    if pair.n < 2: # 최소 개수 오류 메시지는 전체 경로에서 보여줌
+        return None
+    if not pair.extremes_valid:
+        pair.refresh_extremes(x, y)
+    return IncrementalState(x_lines, y_lines, x, y, pair, state.steps + 1)
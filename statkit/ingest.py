@@ -0,0 +1,181 @@
+"""CSV/TSV/Parquet 파일에서 X, Y 열을 덩어리(chunk) 단위로 읽기.
+
+파일 전체를 글자/리스트로 들고 있지 않고 CHUNK_ROWS 행씩 읽어 바로 float64로 바꾼 뒤
+통계 엔진(PairStats)에 더합니다. 파일 경로를 주면 메모리 매핑으로 읽습니다.
+keep_arrays=False이면 평균/표준편차/상관계수/회귀식만 구하고 값은 보관하지 않으므로
+최대 메모리가 파일 크기가 아니라 덩어리 크기에 비례합니다.
+"""
+import io
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from statkit.quantiles import QuantileSketch
+from statkit.stats_engine import PairStats
+
+CHUNK_ROWS = 100_000
+
+FORMAT_CSV = "csv"
+FORMAT_TSV = "tsv"
+FORMAT_PARQUET = "parquet"
+
+_SEPARATORS = {FORMAT_CSV: ",", FORMAT_TSV: "\t"}
+
+
+def detect_format(file_name):
+    """확장자로 파일 형식을 정합니다 (.tsv/.tab → TSV, .parquet/.pq → Parquet, 나머지 CSV)."""
+    ext = os.path.splitext(file_name)[1].lower()
+    if ext in (".tsv", ".tab"):
+        return FORMAT_TSV
+    if ext in (".parquet", ".pq"):
+        return FORMAT_PARQUET
+    return FORMAT_CSV
+
+
+def read_column_names(source, fmt):
+    """첫 행(헤더) 또는 Parquet 스키마에서 열 이름 목록을 읽습니다."""
+    if fmt == FORMAT_PARQUET:
+        import pyarrow.parquet as pq
+        return list(pq.ParquetFile(_open(source)).schema_arrow.names)
+    import pandas as pd
+    header = pd.read_csv(_open(source), sep=_SEPARATORS[fmt], nrows=0)
+    return [str(name) for name in header.columns]
+
+
+def iter_chunks(source, x_col, y_col, fmt, chunk_rows=CHUNK_ROWS, group_col=None):
+    """(x, y, 그룹 이름, 버린 행 수) 덩어리를 차례로 돌려줍니다 (group_col이 없으면 그룹 이름은 None).
+
+    숫자로 바꿀 수 없거나 비어 있거나 nan/inf인 값이 있는 행은 버리고 개수만 셉니다.
+    """
+    # X, Y, 그룹에 같은 열을 골라도 되도록 중복은 빼고 읽은 뒤 열 이름으로 꺼냄
+    columns = list(dict.fromkeys([x_col, y_col] + ([group_col] if group_col is not None else [])))
+    if fmt == FORMAT_PARQUET:
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(_open(source), memory_map=isinstance(source, (str, os.PathLike)))
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns):
+            groups = _to_labels(batch.column(group_col).to_pandas()) if group_col is not None else None
+            yield _clean(_to_float(batch.column(x_col).to_pandas()), _to_float(batch.column(y_col).to_pandas()), groups)
+        return
+
+    import pandas as pd
+    reader = pd.read_csv(
+        _open(source),
+        sep=_SEPARATORS[fmt],
+        usecols=columns,
+        dtype=str, # 숫자 변환은 아래에서 한꺼번에 (잘못된 값은 NaN으로)
+        chunksize=chunk_rows,
+        memory_map=isinstance(source, (str, os.PathLike)),
+    )
+    with reader:
+        for frame in reader:
+            groups = _to_labels(frame[group_col]) if group_col is not None else None
+            yield _clean(_to_float(frame[x_col].str.strip()), _to_float(frame[y_col].str.strip()), groups)
+
+
+@dataclass
+class IngestResult:
+    pair: PairStats
+    x: Optional[np.ndarray] # keep_arrays=False이면 None
+    y: Optional[np.ndarray]
+    n_dropped: int # 숫자가 아니거나 비어 있거나 nan/inf여서 버린 행 수
+    x_sketch: Optional[QuantileSketch] = None # sketch=True일 때 중앙값/분위수 스케치
+    y_sketch: Optional[QuantileSketch] = None
+    groups: Optional[np.ndarray] = None # group_col을 주고 값을 보관할 때 행마다 그룹 이름 (문자열)
+
+
+def ingest(source, x_col, y_col, fmt, chunk_rows=CHUNK_ROWS, keep_arrays=True, sketch=False, on_chunk=None,
+           group_col=None):
+    """파일을 덩어리 단위로 읽으면서 통계량을 누적합니다.
+
+    sketch=True이면 중앙값용 분위수 스케치도 덩어리마다 갱신합니다 (값을 보관하지 않을 때 사용).
+    on_chunk(읽은 행 수)를 주면 덩어리마다 호출합니다 (진행 표시용).
+    group_col을 주면 그 열의 값(그룹 이름)도 함께 보관합니다 (keep_arrays=True일 때만).
+    """
+    pair = PairStats()
+    # 시드를 고정해야 같은 파일의 근사 중앙값이 매번 같음 (결과 캐시와도 맞음)
+    x_sketch = QuantileSketch(seed=0) if sketch else None
+    y_sketch = QuantileSketch(seed=0) if sketch else None
+    x_buffer = _GrowableArray() if keep_arrays else None
+    y_buffer = _GrowableArray() if keep_arrays else None
+    group_chunks = [] if keep_arrays and group_col is not None else None
+    n_dropped = 0
+    n_read = 0
+    for x, y, groups, dropped in iter_chunks(source, x_col, y_col, fmt, chunk_rows, group_col):
+        pair.update(x, y)
+        if keep_arrays:
+            x_buffer.extend(x)
+            y_buffer.extend(y)
+            if group_chunks is not None:
+                group_chunks.append(groups)
+        if sketch:
+            x_sketch.update(x)
+            y_sketch.update(y)
+        n_dropped += dropped
+        n_read += x.size + dropped
+        if on_chunk is not None:
+            on_chunk(n_read)
+    return IngestResult(
+        pair,
+        x_buffer.to_array() if keep_arrays else None,
+        y_buffer.to_array() if keep_arrays else None,
+        n_dropped,
+        x_sketch,
+        y_sketch,
+        np.concatenate(group_chunks) if group_chunks else None,
+    )
+
+
+def _to_float(series):
+    import pandas as pd
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _to_labels(series):
+    # 그룹 이름은 글자로 (비어 있으면 빈 문자열, 숫자 반 번호 1, 2도 "1", "2")
+    return series.fillna("").astype(str).str.strip().to_numpy(dtype=str)
+
+
+def _clean(x, y, groups=None):
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = np.isfinite(x) & np.isfinite(y)
+    if valid.all():
+        return x, y, groups, 0
+    return (x[valid], y[valid], groups[valid] if groups is not None else None,
+            int(valid.size - np.count_nonzero(valid)))
+
+
+def _open(source):
+    # 경로는 그대로, 업로드된 파일(BytesIO 등)은 처음부터 다시 읽도록 되감기
+    if isinstance(source, (str, os.PathLike)):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
+class _GrowableArray:
+    """덩어리를 이어 붙이는 float64 버퍼 (용량을 두 배씩 늘려 복사 횟수를 줄임)."""
+
+    def __init__(self, capacity=CHUNK_ROWS):
+        self._data = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+
+    def extend(self, values):
+        end = self._size + values.size
+        if end > self._data.size:
+            grown = np.empty(max(end, 2 * self._data.size), dtype=np.float64)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size:end] = values
+        self._size = end
+
+    def to_array(self):
+        # 남는 용량만 잘라냄 (가능하면 복사 없이 제자리에서 줄어듦)
+        data = self._data
+        self._data = np.empty(0, dtype=np.float64)
+        data.resize(self._size, refcheck=False)
+        return data
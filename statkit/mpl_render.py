@@ -0,0 +1,98 @@
+"""new2.py의 Matplotlib 산점도를 화면 없이(Agg) PNG로 그리기.
+
+- pyplot 대신 Figure + Agg 캔버스를 직접 써서 GUI 백엔드/전역 상태 없이 그립니다.
+- 한글 글꼴은 설치된 글꼴 목록에서 처음 한 번만 찾아 기억합니다
+  (없는 글꼴 이름을 지정하면 그릴 때마다 대체 글꼴 검색과 경고가 반복됨).
+  한글 글꼴이 하나도 없으면 경고를 한 번만 내고, 그릴 때마다 글자별로 나오는 "Glyph ... missing" 경고는
+  그리는 동안에만 끕니다 (warnings.catch_warnings로 범위를 제한해 프로세스 전체의 경고 설정은 바꾸지 않음).
+- Figure 객체 하나를 잠금과 함께 재사용합니다 (Streamlit 세션은 스레드로 동시에 실행됨).
+- 점이 RASTERIZE_THRESHOLD개보다 많으면 작은 점 마커를 래스터화해 그립니다.
+"""
+import functools
+import io
+import threading
+import warnings
+
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib import font_manager
+
+from statkit.figures import regression_x_range
+
+FIG_SIZE = (8, 6) # 인치
+FIG_DPI = 100
+RASTERIZE_THRESHOLD = 5_000
+
+# 앞에 있을수록 먼저 사용 (Windows, 리눅스 나눔/Noto, macOS 순)
+KOREAN_FONT_CANDIDATES = (
+    "Malgun Gothic",
+    "NanumGothic",
+    "NanumBarunGothic",
+    "Noto Sans CJK KR",
+    "Noto Sans KR",
+    "AppleGothic",
+    "UnDotum",
+)
+
+MISSING_GLYPH_WARNING = r"Glyph \d+ .* missing from font"
+
+_figure = None
+_figure_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def configure_korean_font():
+    """설치된 한글 글꼴을 찾아 rcParams에 설정하고 그 이름을 돌려줍니다 (없으면 None, 기본 글꼴 사용)."""
+    installed = {font.name for font in font_manager.fontManager.ttflist}
+    font_name = next((name for name in KOREAN_FONT_CANDIDATES if name in installed), None)
+    if font_name is not None:
+        matplotlib.rcParams["font.family"] = font_name
+    else:
+        warnings.warn("한글 글꼴이 설치되어 있지 않아 그래프의 한글이 네모로 표시됩니다 "
+                      f"(다음 중 하나를 설치하세요: {', '.join(KOREAN_FONT_CANDIDATES)}).", RuntimeWarning, stacklevel=2)
+    matplotlib.rcParams["axes.unicode_minus"] = False # 마이너스 부호 깨짐 방지
+    return font_name
+
+
+def render_scatter_png(x, y, pair_stats, x_var_name, y_var_name):
+    """산점도와 회귀선(또는 X 고정 점선)을 PNG 바이트로 그립니다."""
+    global _figure
+    font_name = configure_korean_font()
+    with _figure_lock, warnings.catch_warnings():
+        if font_name is None: # 글꼴이 없다는 경고는 이미 한 번 냈으므로 글자마다 반복되는 경고는 그리는 동안 끔
+            warnings.filterwarnings("ignore", message=MISSING_GLYPH_WARNING, category=UserWarning)
+        if _figure is None:
+            _figure = Figure(figsize=FIG_SIZE, dpi=FIG_DPI)
+            FigureCanvasAgg(_figure)
+        fig = _figure
+        fig.clear()
+        ax = fig.add_subplot()
+
+        if len(x) > RASTERIZE_THRESHOLD:
+            ax.plot(x, y, linestyle='none', marker='.', markersize=2, color='blue',
+                    label='Data Points', rasterized=True)
+        else:
+            ax.scatter(x, y, color='blue', label='Data Points')
+
+        # 회귀선 추가 (기울기를 계산할 수 있을 때만)
+        if pair_stats.can_calculate_regression:
+            slope, intercept = pair_stats.slope, pair_stats.intercept
+            x_range = regression_x_range(x, pair_stats)
+            ax.plot(x_range, intercept + slope * x_range, color='red', label=f'회귀선 (Ŷ = {intercept:.2f} + {slope:.2f}X)')
+            ax.set_title(f'[{x_var_name}]와 [{y_var_name}]의 산점도 및 회귀선')
+        elif pair_stats.min_x == pair_stats.max_x: # X 값이 모두 같아서 수직선 형태일 때
+            mean_x = pair_stats.mean_x
+            ax.axvline(x=mean_x, color='red', linestyle='--', label=f'X = {mean_x:.2f} ({x_var_name})')
+            ax.set_title(f'[{x_var_name}] 값이 고정된 산점도')
+        else:
+            ax.set_title('산점도 (데이터 부족)')
+
+        ax.set_xlabel(x_var_name)
+        ax.set_ylabel(y_var_name)
+        ax.grid(True)
+        ax.legend()
+
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png')
+        return buffer.getvalue()
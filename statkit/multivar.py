@@ -0,0 +1,80 @@
+"""여러 변수(k개 열)의 상관계수 행렬과 모든 쌍의 회귀식.
+
+중심화한 데이터 행렬의 곱 Xcᵀ·Xc (편차곱 합 행렬) 하나에서 k×k개의 상관계수, 기울기, 절편을
+모두 구합니다. 행을 블록으로 나눠 BLAS 행렬곱으로 계산하고 블록 결과는
+PairStats와 같은 Chan 방식으로 합치므로, 임시 메모리는 블록 크기만큼만 사용합니다.
+"""
+import numpy as np
+
+from statkit.stats_engine import BLOCK_SIZE, PairStats
+
+
+class CrossStats:
+    """k개 변수의 충분통계량: 개수, 평균 벡터, 편차곱 합 행렬, 최솟값/최댓값 벡터."""
+
+    def __init__(self, k):
+        self.n = 0
+        self.means = np.zeros(k)
+        self.cross = np.zeros((k, k)) # cross[i, j] = Σ (x_i - 평균_i)(x_j - 평균_j)
+        self.mins = np.full(k, np.inf)
+        self.maxs = np.full(k, -np.inf)
+
+    @classmethod
+    def from_matrix(cls, data, block_size=BLOCK_SIZE):
+        data = np.asarray(data, dtype=np.float64)
+        result = cls(data.shape[1])
+        rows = max(1, block_size // max(data.shape[1], 1)) # 블록 원소 수가 block_size 정도가 되도록
+        for start in range(0, data.shape[0], rows):
+            result.update(data[start:start + rows])
+        return result
+
+    def update(self, block):
+        m = block.shape[0]
+        if m == 0:
+            return self
+        block_means = block.mean(axis=0)
+        centered = block - block_means
+        block_cross = centered.T @ centered
+        if self.n == 0:
+            self.means, self.cross = block_means, block_cross
+        else:
+            n = self.n + m
+            delta = block_means - self.means
+            self.cross = self.cross + block_cross + np.outer(delta, delta) * (self.n * m / n)
+            self.means = self.means + delta * (m / n)
+        self.n += m
+        self.mins = np.minimum(self.mins, block.min(axis=0))
+        self.maxs = np.maximum(self.maxs, block.max(axis=0))
+        return self
+
+    def correlation_matrix(self):
+        """피어슨 상관계수 행렬. 값이 모두 같은 변수가 들어간 칸은 NaN."""
+        diag = np.diag(self.cross)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = self.cross / np.sqrt(np.outer(diag, diag))
+        r[~np.isfinite(r)] = np.nan
+        return np.clip(r, -1.0, 1.0)
+
+    def regression_matrices(self):
+        """(기울기, 절편) 행렬. [i, j]는 i번째 변수로 j번째 변수를 예측하는 회귀식입니다."""
+        diag = np.diag(self.cross)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slopes = self.cross / diag[:, None]
+        slopes[~np.isfinite(slopes)] = np.nan
+        intercepts = self.means[None, :] - slopes * self.means[:, None]
+        return slopes, intercepts
+
+    def pair(self, i, j):
+        """i번째 변수를 X, j번째 변수를 Y로 한 PairStats (산점도/회귀식 화면 재사용용)."""
+        return PairStats(
+            n=self.n,
+            mean_x=float(self.means[i]),
+            mean_y=float(self.means[j]),
+            m2_x=float(self.cross[i, i]),
+            m2_y=float(self.cross[j, j]),
+            c_xy=float(self.cross[i, j]),
+            min_x=float(self.mins[i]),
+            max_x=float(self.maxs[i]),
+            min_y=float(self.mins[j]),
+            max_y=float(self.maxs[j]),
+        )
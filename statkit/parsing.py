@@ -0,0 +1,143 @@
+"""텍스트 영역에 붙여넣은 값을 한 번에 float64 배열로 바꾸는 파서.
+
+float()가 받아들이는 'nan', 'inf'도 통계에 쓸 수 없으므로 숫자가 아닌 값과 같이 오류 줄로 알려줍니다.
+"""
+import math
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+
+
+class ParsedColumn(NamedTuple):
+    values: np.ndarray                 # 유효한 값 (빈 줄 제외, float64)
+    n_lines: int                       # strip() 후 splitlines() 기준 줄 수
+    bad_lines: List[Tuple[int, str]]   # (줄 번호(1부터), strip() 한 원문) 목록
+
+
+def split_lines(text):
+    """앱과 같은 규칙(strip 후 splitlines)으로 줄을 나눕니다."""
+    return text.strip().splitlines()
+
+
+def parse_lines(lines):
+    """줄 목록을 float64 배열로 변환합니다.
+
+    빈 줄은 건너뜁니다. 모든 값이 유한한 숫자이면 NumPy가 한 번에 변환하고,
+    변환에 실패했거나 nan/inf가 있을 때만 줄 단위로 다시 확인해서 오류 줄 번호와 원문을 모읍니다.
+    """
+    tokens = [s for s in map(str.strip, lines) if s]
+    try:
+        values = np.array(tokens, dtype=np.float64)
+        if not np.isfinite(values).all():
+            raise ValueError
+        bad_lines = []
+    except ValueError:
+        values, bad_lines = _parse_slow(lines)
+    return ParsedColumn(values, len(lines), bad_lines)
+
+
+def parse_column(text):
+    """텍스트 영역 내용 전체를 파싱합니다."""
+    return parse_lines(split_lines(text))
+
+
+def _parse_slow(lines):
+    # 오류가 있을 때만 쓰는 경로: 어느 줄이 잘못됐는지 찾아야 하므로 한 줄씩 확인
+    values = []
+    bad_lines = []
+    for i, line in enumerate(lines):
+        token = line.strip()
+        if not token: # 빈 줄은 무시
+            continue
+        try:
+            value = float(token)
+        except ValueError:
+            value = math.nan
+        if math.isfinite(value):
+            values.append(value)
+        else:
+            bad_lines.append((i + 1, token))
+    return np.array(values, dtype=np.float64), bad_lines
+
+
+class ParsedTable(NamedTuple):
+    names: List[str]                   # 첫 줄의 열 이름
+    values: np.ndarray                 # (행 수, 열 수) float64, 빈 줄 제외
+    bad_lines: List[Tuple[int, str]]   # (줄 번호(1부터), 원문) - 칸 수가 다르거나 숫자가 아닌 줄
+
+
+def parse_table(text):
+    """첫 줄이 열 이름인 표(엑셀에서 복사하면 탭, CSV면 쉼표로 구분)를 한 번에 파싱합니다."""
+    lines = split_lines(text)
+    if not lines:
+        return ParsedTable([], np.empty((0, 0)), [])
+    sep = "\t" if "\t" in lines[0] else ","
+    names = [name.strip() for name in lines[0].split(sep)]
+    rows = [(i + 2, line) for i, line in enumerate(lines[1:]) if line.strip()]
+    try:
+        values = np.array([line.split(sep) for _, line in rows], dtype=np.float64).reshape(len(rows), len(names))
+        if not np.isfinite(values).all():
+            raise ValueError
+        bad_lines = []
+    except ValueError: # 칸 수가 다르거나 숫자가 아닌(nan/inf 포함) 줄이 있으면 한 줄씩 확인
+        values, bad_lines = _parse_table_slow(rows, sep, len(names))
+    return ParsedTable(names, values, bad_lines)
+
+
+def _parse_table_slow(rows, sep, n_columns):
+    values = []
+    bad_lines = []
+    for line_no, line in rows:
+        cells = line.split(sep)
+        try:
+            if len(cells) != n_columns:
+                raise ValueError
+            row = [float(cell.strip()) for cell in cells]
+            if not all(map(math.isfinite, row)):
+                raise ValueError
+            values.append(row)
+        except ValueError:
+            bad_lines.append((line_no, line.strip()))
+    return np.array(values, dtype=np.float64).reshape(len(values), n_columns), bad_lines
+
+
+class ParsedCells(NamedTuple):
+    values: np.ndarray                 # float64, 빈칸과 오류 칸은 NaN (행 수는 입력과 같음)
+    empty_rows: np.ndarray             # 빈칸의 행 번호 (0부터)
+    bad_cells: List[Tuple[int, str]]   # (행 번호(0부터), strip() 한 원문) - 숫자가 아니거나 nan/inf인 칸
+
+
+def parse_cells(cells):
+    """표 편집기의 한 열(문자열, 빈칸은 None/NaN 또는 "")을 한 번에 float64 배열로 바꿉니다.
+
+    parse_lines와 달리 빈칸도 행 번호를 유지한 채 따로 알려줍니다 (응답자 번호 = 행 번호 + 1).
+    """
+    cells = np.asarray(cells, dtype=object)
+    missing = np.equal(cells, None) | np.not_equal(cells, cells) # None 또는 NaN (pandas가 빈칸을 NaN으로 바꿈)
+    tokens = np.char.strip(np.where(missing, "", cells).astype(str))
+    empty = tokens == ""
+    try:
+        values = np.where(empty, "nan", tokens).astype(np.float64)
+        if not (np.isfinite(values) | empty).all():
+            raise ValueError
+        bad_cells = []
+    except ValueError:
+        values, bad_cells = _parse_cells_slow(tokens)
+    return ParsedCells(values, np.flatnonzero(empty), bad_cells)
+
+
+def _parse_cells_slow(tokens):
+    values = np.full(tokens.size, np.nan)
+    bad_cells = []
+    for i, token in enumerate(tokens.tolist()):
+        if not token:
+            continue
+        try:
+            value = float(token)
+        except ValueError:
+            value = math.nan
+        if math.isfinite(value):
+            values[i] = value
+        else:
+            bad_cells.append((i, token))
+    return values, bad_cells
@@ -0,0 +1,21 @@
+"""브라우저로 보내는 데이터 양 줄이기.
+
+- 입력 배열 전체를 글자로 보내는 대신 앞/뒤 몇 개와 개수만 보여주는 요약 문자열
+- 그래프 데이터는 NumPy 배열 그대로 두면 Plotly(6 이상)가 base64 typed array로 보내므로,
+  필요하면 float32로 만들어 한 번 더 절반으로 줄임 (statkit.figures의 compact=True)
+- 실제로 보낸 바이트 수 측정
+"""
+import numpy as np
+
+PREVIEW_EDGE_ITEMS = 5 # 요약 문자열에서 앞/뒤로 보여줄 값 개수
+
+
+def array_preview(values, edge_items=PREVIEW_EDGE_ITEMS):
+    """배열을 '[앞 ... 뒤]' 형태의 짧은 문자열로 만듭니다 (길이가 개수와 무관하게 일정)."""
+    return np.array2string(np.asarray(values), threshold=2 * edge_items, edgeitems=edge_items)
+
+
+def figure_nbytes(fig):
+    """st.plotly_chart가 보내는 것과 같은 방식으로 직렬화했을 때의 바이트 수."""
+    import plotly.io as pio
+    return len(pio.to_json(fig, validate=False).encode("utf-8"))
@@ -0,0 +1,129 @@
+"""분석 단계별 시간/메모리 측정과 1회 프로파일 캡처 ("버튼이 느려요" 문의 확인용).
+
+StageTimer는 lap(단계 이름)을 부를 때마다 직전 lap 이후 걸린 시간과 늘어난 메모리를 기록하므로,
+기존 코드를 with 블록으로 감싸지 않고 단계 끝에 한 줄씩만 넣으면 됩니다.
+메모리는 tracemalloc으로 재는데, tracemalloc은 프로세스 전체에 하나라서
+여러 세션이 동시에 측정하면 서로의 할당이 섞일 수 있습니다 (시간은 세션별로 정확).
+"""
+import datetime
+import io
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+DEFAULT_LOG_PATH = os.environ.get("STATS_PROFILE_LOG", "stats_profile.jsonl")
+PROFILE_TOP = 40 # 프로파일 보고서에 보여줄 함수/할당 위치 개수
+
+_log_lock = threading.Lock()
+
+
+class StageTimer:
+    """단계별 벽시계 시간과 메모리 할당량 기록. enabled=False이면 아무것도 하지 않습니다."""
+
+    def __init__(self, enabled=True, trace_memory=True):
+        self.enabled = enabled
+        self.records = []
+        self._owns_tracing = False
+        if enabled and trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        self._last_time = time.perf_counter()
+        self._last_memory = self._current_memory()
+
+    def lap(self, stage):
+        """직전 lap(또는 생성) 이후를 stage 단계로 기록합니다."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        self.records.append({
+            "stage": stage,
+            "seconds": now - self._last_time,
+            "allocated_bytes": current - self._last_memory, # 단계가 끝난 뒤에도 남아 있는 할당
+            "peak_bytes": max(0, peak - self._last_memory), # 단계 중 가장 많이 늘었을 때
+        })
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        self._last_time = time.perf_counter()
+        self._last_memory = current
+
+    @property
+    def total_seconds(self):
+        return sum(record["seconds"] for record in self.records)
+
+    def stop(self):
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def to_record(self, **context):
+        """JSONL 한 줄로 남길 dict (context에는 입력 방식, 데이터 개수 등)."""
+        return {
+            "time": datetime.datetime.now().isoformat(timespec="seconds"),
+            **context,
+            "total_seconds": self.total_seconds,
+            "stages": self.records,
+        }
+
+    def _current_memory(self):
+        return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+
+def stop_finished(active):
+    """(StageTimer, 작업 또는 None) 목록에서 작업이 끝난 측정기만 멈추고, 아직 작업 스레드가 기록 중인 항목은 돌려줍니다.
+
+    작업이 도는 동안 측정기를 멈추면 그 작업의 나머지 단계는 메모리가 0으로 기록되므로 작업이 끝날 때까지 미룹니다.
+    """
+    running = []
+    for timer, job in active:
+        if job is not None and not job.done():
+            running.append((timer, job))
+        else:
+            timer.stop()
+    return running
+
+
+def append_jsonl(record, path=DEFAULT_LOG_PATH):
+    """측정 결과를 JSONL 로그 파일 끝에 한 줄로 추가합니다 (세션 여러 개가 동시에 써도 줄이 섞이지 않게 잠금)."""
+    line = json.dumps(record, ensure_ascii=False)
+    with _log_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+class ProfileCapture:
+    """한 번의 실행을 cProfile과 tracemalloc 스냅샷으로 기록하고 글자 보고서로 만듭니다."""
+
+    def __init__(self):
+        import cProfile # 캡처할 때만 불러옴
+        self._profiler = cProfile.Profile()
+        self._owns_tracing = False
+        self._snapshot = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        self._profiler.enable()
+        return self
+
+    def stop(self):
+        self._profiler.disable()
+        if tracemalloc.is_tracing():
+            self._snapshot = tracemalloc.take_snapshot()
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+        return self
+
+    def report(self, top=PROFILE_TOP):
+        import pstats
+        out = io.StringIO()
+        out.write("=== cProfile (누적 시간 순) ===\n")
+        pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(top)
+        if self._snapshot is not None:
+            out.write("\n=== tracemalloc (실행이 끝난 시점에 남아 있는 할당, 코드 위치별) ===\n")
+            for stat in self._snapshot.statistics("lineno")[:top]:
+                out.write(f"{stat}\n")
+        return out.getvalue()
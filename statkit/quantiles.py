@@ -0,0 +1,86 @@
+"""메모리에 다 올릴 수 없는 데이터의 중앙값/분위수를 구하는 병합 가능한 스케치.
+
+KLL 계열 압축기(compactor)를 사용합니다. 레벨 h의 값 하나는 원래 값 2^h개를 대표하고,
+레벨이 가득 차면 정렬 후 한 칸씩 건너 절반만 다음 레벨로 올립니다.
+압축 한 번이 만드는 순위(rank) 오차는 최대 2^h이므로, 이를 모두 더한 값을
+사용자에게 보여줄 수 있는 확실한(결정적) 오차 한계로 기록합니다.
+스케치끼리 merge할 수 있어 덩어리별/프로세스별로 따로 만든 뒤 합칠 수 있습니다.
+아직 한 번도 압축하지 않았으면(값이 capacity개 이하) 모든 값을 그대로 갖고 있으므로 정확한 분위수를 돌려줍니다.
+"""
+import math
+
+import numpy as np
+
+DEFAULT_CAPACITY = 2048 # 레벨 하나에 담을 수 있는 값 개수 (클수록 정확, 메모리는 레벨 수 × 이 값)
+
+
+class QuantileSketch:
+    def __init__(self, capacity=DEFAULT_CAPACITY, seed=None):
+        self.capacity = capacity
+        self.n = 0
+        self.max_rank_error = 0 # 순위 오차의 상한 (개수 단위)
+        self._levels = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        """값 덩어리를 추가합니다."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return self
+        self.n += values.size
+        self._levels[0] = np.concatenate((self._levels[0], values))
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """다른 스케치를 합칩니다 (같은 capacity 권장)."""
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0, dtype=np.float64))
+        for h, level in enumerate(other._levels):
+            self._levels[h] = np.concatenate((self._levels[h], level))
+        self.n += other.n
+        self.max_rank_error += other.max_rank_error
+        self._compress()
+        return self
+
+    def _compress(self):
+        h = 0
+        while h < len(self._levels):
+            level = self._levels[h]
+            if level.size > self.capacity:
+                level = np.sort(level)
+                if level.size % 2: # 홀수 개면 하나는 남겨 두고 나머지를 압축
+                    keep, level = level[-1:], level[:-1]
+                else:
+                    keep = level[:0]
+                offset = int(self._rng.integers(2)) # 짝수/홀수 위치 중 무작위로 선택 (편향 방지)
+                promoted = level[offset::2]
+                self.max_rank_error += 2 ** h
+                self._levels[h] = keep
+                if h + 1 == len(self._levels):
+                    self._levels.append(np.empty(0, dtype=np.float64))
+                self._levels[h + 1] = np.concatenate((self._levels[h + 1], promoted))
+            h += 1
+
+    @property
+    def rank_error(self):
+        """분위수 오차 한계 (전체 개수 대비 비율). 0.001이면 순위가 ±0.1% 이내."""
+        return self.max_rank_error / self.n if self.n else 0.0
+
+    def quantile(self, q):
+        """q(0~1) 분위수의 근사값. 압축한 적이 없으면 정확한 값 (np.quantile처럼 두 순위 사이를 보간)."""
+        if self.n == 0:
+            return math.nan
+        if self.max_rank_error == 0:
+            return float(np.quantile(self._levels[0], q))
+        values = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(level.size, 2 ** h, dtype=np.int64)
+                                  for h, level in enumerate(self._levels)])
+        order = np.argsort(values, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        target = q * (cumulative[-1] - 1)
+        index = int(np.searchsorted(cumulative, target, side="right"))
+        return float(values[order[min(index, order.size - 1)]])
+
+    def median(self):
+        return self.quantile(0.5)
@@ -0,0 +1,110 @@
+"""순위 상관계수: 스피어만 ρ와 켄달 τ-b (같은 값(동점) 처리 포함).
+
+설문 문항(리커트 척도)처럼 순서만 의미 있는 자료에 씁니다.
+변수마다 argsort를 한 번만 해서 평균 순위(스피어만), 조밀 순위와 동점 개수(켄달)를 함께 구하고,
+켄달의 불일치 쌍 개수는 병합 정렬 방식으로 단계마다 배열 전체를 한꺼번에 처리해 O(n log n)에 셉니다.
+"""
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from statkit.stats_engine import PairStats
+
+
+class Ranking(NamedTuple):
+    """변수 하나의 순위 정보 (argsort 한 번으로 계산)."""
+    average: np.ndarray # 평균 순위 (동점은 순위의 평균, 1부터 시작)
+    dense: np.ndarray # 조밀 순위 (동점은 같은 정수, 0부터 시작)
+    tied_pairs: int # 같은 값끼리 만들어지는 쌍의 개수 Σ t(t-1)/2
+
+
+class RankCorrelation(NamedTuple):
+    spearman: Optional[float] # 값이 모두 같은 변수가 있으면 None
+    kendall_tau_b: Optional[float]
+
+
+def rank(values):
+    values = np.asarray(values, dtype=np.float64)
+    n = values.size
+    order = np.argsort(values, kind="stable")
+    sorted_values = values[order]
+    is_start = np.empty(n, dtype=bool)
+    is_start[:1] = True
+    np.not_equal(sorted_values[1:], sorted_values[:-1], out=is_start[1:])
+    starts = np.flatnonzero(is_start)
+    sizes = np.diff(np.append(starts, n))
+    group = np.cumsum(is_start) - 1 # 정렬된 위치별 동점 그룹 번호
+
+    average = np.empty(n, dtype=np.float64)
+    average[order] = (starts + (sizes - 1) / 2 + 1)[group]
+    dense = np.empty(n, dtype=np.int64)
+    dense[order] = group
+    return Ranking(average, dense, _tied_pairs(sizes))
+
+
+def spearman(x_rank, y_rank):
+    """평균 순위의 피어슨 상관계수."""
+    return PairStats.from_arrays(x_rank.average, y_rank.average).correlation
+
+
+def kendall_tau_b(x_rank, y_rank):
+    n = x_rank.dense.size
+    total_pairs = n * (n - 1) // 2
+    denominator = (total_pairs - x_rank.tied_pairs) * (total_pairs - y_rank.tied_pairs)
+    if denominator == 0:
+        return None
+    # X 순(같으면 Y 순)으로 정렬한 뒤 Y 순서가 뒤집힌 쌍 = 불일치 쌍
+    joint = x_rank.dense * n + y_rank.dense
+    order = np.argsort(joint, kind="stable")
+    joint_sorted = joint[order]
+    is_start = np.empty(n, dtype=bool)
+    is_start[:1] = True
+    np.not_equal(joint_sorted[1:], joint_sorted[:-1], out=is_start[1:])
+    both_tied = _tied_pairs(np.diff(np.append(np.flatnonzero(is_start), n)))
+    discordant = count_inversions(y_rank.dense[order])
+
+    concordant_minus_discordant = total_pairs - x_rank.tied_pairs - y_rank.tied_pairs + both_tied - 2 * discordant
+    tau = concordant_minus_discordant / np.sqrt(float(denominator))
+    return float(np.clip(tau, -1.0, 1.0))
+
+
+def rank_correlations(x, y):
+    """(스피어만 ρ, 켄달 τ-b). 데이터가 2개 미만이면 둘 다 None."""
+    if len(x) < 2:
+        return RankCorrelation(None, None)
+    x_rank = rank(x)
+    y_rank = rank(y)
+    return RankCorrelation(spearman(x_rank, y_rank), kendall_tau_b(x_rank, y_rank))
+
+
+def count_inversions(values):
+    """i < j 이면서 values[i] > values[j]인 쌍의 개수 (같은 값은 세지 않음).
+
+    아래에서 위로 올라가는 병합 정렬: 폭 width의 정렬된 구간 두 개씩을 한 단계에 모두 병합합니다.
+    구간 번호를 키에 더해 안정 정렬하면 구간끼리 섞이지 않고(이미 정렬된 두 구간이라 timsort가 선형 시간에 병합),
+    오른쪽 구간 원소가 왼쪽으로 이동한 거리의 합이 그 단계에서 뒤집힌 쌍의 개수입니다.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    n = values.size
+    if n < 2:
+        return 0
+    values = values - values.min() # 구간 번호 × span을 더해도 구간끼리 겹치지 않도록
+    span = int(values.max()) + 1
+    index = np.arange(n, dtype=np.int64)
+    position = np.empty(n, dtype=np.int64)
+    inversions = 0
+    width = 1
+    while width < n:
+        keys = values + (index // (2 * width)) * span
+        order = np.argsort(keys, kind="stable")
+        position[order] = index
+        in_right = (index // width) % 2 == 1
+        inversions += int((index[in_right] - position[in_right]).sum())
+        values = values[order]
+        width *= 2
+    return inversions
+
+
+def _tied_pairs(sizes):
+    sizes = sizes.astype(np.int64)
+    return int((sizes * (sizes - 1) // 2).sum())
@@ -0,0 +1,169 @@
+"""재표본(resampling) 기반 추론: 부트스트랩 신뢰구간, 순열 검정.
+
+재표본은 (묶음 크기 × n) 인덱스 행렬로 한꺼번에 뽑아 NumPy 연산으로 평가합니다.
+묶음 크기는 메모리 예산(block_bytes)에 맞춰 정해지고, 전체 작업은 TASK_SIZE개씩의 작업으로 나눠
+작업마다 SeedSequence에서 파생한 난수 생성기를 쓰므로, 같은 seed면 프로세스 수와 관계없이 결과가 같습니다.
+"""
+import os
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+DEFAULT_RESAMPLES = 10_000
+DEFAULT_BLOCK_BYTES = 64 * 1024 * 1024 # 묶음 하나의 임시 메모리 상한
+TASK_SIZE = 1_000 # 작업 하나가 맡는 재표본 수 (난수 스트림 단위)
+PARALLEL_THRESHOLD = 200_000_000 # 재표본 수 × n이 이보다 크면 auto_jobs가 여러 프로세스 사용
+ROUND_TASKS = 4 # 순열 검정에서 조기 종료 여부를 확인하는 간격 (작업 개수)
+WILSON_Z = 3.29 # p-값 신뢰구간의 z (99.9%, 조기 종료 판단이 흔들리지 않도록 넉넉하게)
+
+
+class BootstrapCI(NamedTuple):
+    r: Tuple[float, float]
+    slope: Tuple[float, float]
+    intercept: Tuple[float, float]
+    confidence: float
+    n_resamples: int
+
+
+def auto_jobs(n, n_resamples):
+    """작업량이 클 때만 여러 프로세스를 쓰도록 프로세스 수를 정합니다."""
+    if n * n_resamples < PARALLEL_THRESHOLD:
+        return 1
+    return max(1, min(os.cpu_count() or 1, 4))
+
+
+def bootstrap_ci(x, y, n_resamples=DEFAULT_RESAMPLES, confidence=0.95, seed=None,
+                 block_bytes=DEFAULT_BLOCK_BYTES, n_jobs=1):
+    """r, 기울기, 절편의 백분위수 부트스트랩 신뢰구간."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = x.size
+    # 평균을 빼 둔 값으로 합을 구하면 큰 값에서도 상쇄 오차가 작음
+    mean_x, mean_y = x.mean(), y.mean()
+    xc, yc = x - mean_x, y - mean_y
+    block_rows = max(1, block_bytes // (24 * n)) # 인덱스(int64) + X, Y 재표본(float64)
+
+    task_sizes = [min(TASK_SIZE, n_resamples - start) for start in range(0, n_resamples, TASK_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(task_sizes))
+    args = [(xc, yc, size, task_seed, block_rows) for size, task_seed in zip(task_sizes, seeds)]
+    if n_jobs > 1 and len(args) > 1:
+        from concurrent.futures import ProcessPoolExecutor # 여러 프로세스를 쓸 때만 불러옴
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            parts = list(pool.map(_bootstrap_task, *zip(*args)))
+    else:
+        parts = [_bootstrap_task(*a) for a in args]
+    r, slope, intercept_shift = (np.concatenate(values) for values in zip(*parts))
+    intercept = mean_y + intercept_shift - slope * mean_x
+
+    tail = (1 - confidence) / 2 * 100
+    bounds = (tail, 100 - tail)
+
+    def interval(values):
+        lo, hi = np.nanpercentile(values, bounds) if np.isfinite(values).any() else (np.nan, np.nan)
+        return float(lo), float(hi)
+
+    return BootstrapCI(interval(r), interval(slope), interval(intercept), confidence, n_resamples)
+
+
+def _bootstrap_task(xc, yc, n_resamples, seed_seq, block_rows):
+    # 재표본 n_resamples개의 r, 기울기, (절편 - 원래 평균 기준 보정 전 값)을 묶음 단위로 계산
+    rng = np.random.default_rng(seed_seq)
+    n = xc.size
+    r_parts, slope_parts, shift_parts = [], [], []
+    for start in range(0, n_resamples, block_rows):
+        rows = min(block_rows, n_resamples - start)
+        index = rng.integers(0, n, size=(rows, n))
+        xs = xc[index]
+        ys = yc[index]
+        sx = xs.sum(axis=1)
+        sy = ys.sum(axis=1)
+        m2x = np.einsum("ij,ij->i", xs, xs) - sx * sx / n
+        m2y = np.einsum("ij,ij->i", ys, ys) - sy * sy / n
+        cxy = np.einsum("ij,ij->i", xs, ys) - sx * sy / n
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = cxy / np.sqrt(m2x * m2y)
+            slope = cxy / m2x
+        r[~np.isfinite(r)] = np.nan # X 또는 Y가 모두 같은 값으로 뽑힌 재표본은 제외
+        slope[~np.isfinite(slope)] = np.nan
+        r_parts.append(np.clip(r, -1.0, 1.0))
+        slope_parts.append(slope)
+        # 절편 = (ȳ + sy/n) - 기울기 × (x̄ + sx/n) 중 원래 평균이 들어가지 않는 부분
+        shift_parts.append(sy / n - slope * sx / n)
+    return np.concatenate(r_parts), np.concatenate(slope_parts), np.concatenate(shift_parts)
+
+
+class PermutationResult(NamedTuple):
+    p_value: float
+    p_interval: Tuple[float, float] # p-값 추정의 신뢰구간 (순열 개수가 유한해서 생기는 오차)
+    n_permutations: int # 실제로 계산한 순열 개수 (조기 종료하면 최대값보다 적음)
+    stopped_early: bool
+
+
+def permutation_test(x, y, max_permutations=DEFAULT_RESAMPLES, alpha=0.05, seed=None,
+                     block_bytes=DEFAULT_BLOCK_BYTES, n_jobs=1, round_tasks=ROUND_TASKS):
+    """상관계수의 양측 순열 검정 p-값 (정규분포 가정 없음).
+
+    Y를 섞어도 편차제곱합은 그대로이므로 r 대신 편차곱의 합 Σ(x-X̄)(y-ȳ)만 비교하면 됩니다.
+    편차는 한 번만 구하고, 순열은 묶음 단위로 섞어 행렬-벡터 곱으로 계산합니다.
+    round_tasks개 작업마다 p-값의 신뢰구간을 확인해서 alpha보다 확실히 크거나 작으면 멈춥니다.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x_deviations = x - x.mean()
+    y_deviations = y - y.mean()
+    observed = abs(float(x_deviations @ y_deviations))
+    block_rows = max(1, block_bytes // (8 * x.size))
+
+    task_sizes = [min(TASK_SIZE, max_permutations - start) for start in range(0, max_permutations, TASK_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(task_sizes))
+    args = [(x_deviations, y_deviations, observed, size, task_seed, block_rows)
+            for size, task_seed in zip(task_sizes, seeds)]
+
+    # 한 라운드의 작업 수를 고정해 두면 프로세스 수와 관계없이 같은 지점에서 멈춤
+    pool = None
+    if n_jobs > 1 and len(args) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=n_jobs)
+    n_extreme = 0
+    n_done = 0
+    interval = (0.0, 1.0)
+    try:
+        for start in range(0, len(args), round_tasks):
+            round_args = args[start:start + round_tasks]
+            if pool is not None:
+                counts = pool.map(_permutation_task, *zip(*round_args))
+            else:
+                counts = [_permutation_task(*a) for a in round_args]
+            n_extreme += sum(counts)
+            n_done += sum(a[3] for a in round_args)
+            interval = _wilson_interval(n_extreme + 1, n_done + 1)
+            if n_done < max_permutations and (interval[1] < alpha or interval[0] > alpha):
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # 관측값 자신도 순열 하나로 세어 p-값이 0이 되지 않게 함
+    return PermutationResult((n_extreme + 1) / (n_done + 1), interval, n_done, n_done < max_permutations)
+
+
+def _permutation_task(x_deviations, y_deviations, observed, n_permutations, seed_seq, block_rows):
+    # 편차곱의 합 절댓값이 관측값 이상인 순열 개수
+    rng = np.random.default_rng(seed_seq)
+    n = y_deviations.size
+    threshold = observed * (1 - 1e-12) # 같은 값인데 반올림 오차로 작게 나오는 경우도 포함
+    count = 0
+    for start in range(0, n_permutations, block_rows):
+        rows = min(block_rows, n_permutations - start)
+        shuffled = rng.permuted(np.broadcast_to(y_deviations, (rows, n)), axis=1)
+        count += int(np.count_nonzero(np.abs(shuffled @ x_deviations) >= threshold))
+    return count
+
+
+def _wilson_interval(successes, trials, z=WILSON_Z):
+    # 이항 비율의 Wilson 점수 신뢰구간
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    half_width = z * np.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return float(max(0.0, center - half_width)), float(min(1.0, center + half_width))
@@ -0,0 +1,113 @@
+"""입력 내용 해시로 분석 결과를 저장하는 LRU 캐시.
+
+같은 데이터를 여러 학생이 동시에 분석해도 한 번만 계산하도록,
+서버 프로세스 하나에서 모든 세션이 공유하는 것을 전제로 합니다 (스레드 안전).
+메모리 사용량은 max_bytes 이하로 유지되며, 넘치면 가장 오래 안 쓴 결과부터 버립니다.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = int(os.environ.get("STATS_RESULT_CACHE_MB", "256")) * 1024 * 1024
+
+_OBJECT_OVERHEAD = 256 # 배열 외 파이썬 객체 하나에 대한 대략적인 크기
+
+
+def content_key(*parts):
+    """문자열(또는 업로드 파일 같은 바이트) 여러 개를 구분 가능한 형태로 이어 붙여 해시합니다."""
+    h = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        if isinstance(part, (bytes, bytearray, memoryview)):
+            data = memoryview(part).cast("B")
+        else:
+            data = str(part).encode("utf-8")
+        h.update(len(data).to_bytes(8, "little")) # 길이를 앞에 붙여 ("ab","c")와 ("a","bc")를 구분
+        h.update(data)
+    return h.hexdigest()
+
+
+def estimate_nbytes(value):
+    """캐시 예산 계산용으로 값이 차지하는 메모리를 대략 추정합니다."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, dict):
+        return _OBJECT_OVERHEAD + sum(estimate_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return _OBJECT_OVERHEAD + sum(estimate_nbytes(v) for v in value)
+    if hasattr(value, "to_plotly_json"): # Plotly Figure / trace
+        return estimate_nbytes(value.to_plotly_json())
+    if hasattr(value, "__dict__"):
+        return _OBJECT_OVERHEAD + sum(estimate_nbytes(v) for v in vars(value).values())
+    return _OBJECT_OVERHEAD
+
+
+class ResultCache:
+    """메모리 예산이 있는 스레드 안전 LRU 캐시."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict() # key -> (value, nbytes)
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, nbytes=None):
+        """값을 저장합니다. 예산보다 큰 값은 저장하지 않고 False를 돌려줍니다."""
+        if nbytes is None:
+            nbytes = estimate_nbytes(value)
+        if nbytes > self.max_bytes:
+            return False
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._nbytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self._nbytes += nbytes
+            while self._nbytes > self.max_bytes:
+                _, (_, evicted_nbytes) = self._entries.popitem(last=False)
+                self._nbytes -= evicted_nbytes
+                self.evictions += 1
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    def stats(self):
+        """적중/미적중 횟수와 메모리 사용량."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "nbytes": self._nbytes,
+                "max_bytes": self.max_bytes,
+            }
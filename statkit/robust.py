@@ -0,0 +1,151 @@
+"""이상값에 강한 Theil–Sen 회귀선 (두 점씩 이은 모든 직선 기울기의 중앙값).
+
+잘못 입력한 값 하나가 최소제곱 회귀선은 크게 흔들어도 기울기들의 중앙값은 거의 바꾸지 못합니다.
+n이 작으면(EXACT_THRESHOLD 이하) 모든 기울기를 만들어 정확히 구하고, 그보다 크면 n²개의 기울기를
+만들지 않고 "기울기가 t 이하인 쌍의 개수"를 O(n log n)에 세는 방법으로 중앙값 위치를 찾아 들어갑니다.
+  - X 순서로 놓고 z = y - t·x로 바꾸면, 기울기 ≤ t인 쌍은 z의 순서가 뒤집힌 쌍과 같습니다.
+  - 무작위로 뽑은 쌍들의 기울기로 중앙값이 있을 좁은 구간을 먼저 정하고, 그 안에서 보간/이분법으로 좁힙니다.
+  - 구간 안에 기울기가 하나만 남으면 순서가 바뀌는 두 점을 찾아 그 기울기를 정확히 계산합니다.
+"""
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+from statkit.rank_corr import count_inversions, rank
+
+EXACT_THRESHOLD = 1_500 # 이 개수 이하면 모든 쌍의 기울기(약 n²/2개)를 직접 계산
+SAMPLE_PAIRS = 20_000 # 중앙값이 있을 구간을 정할 때 뽑는 쌍 개수
+RELATIVE_TOLERANCE = 1e-10 # 큰 n에서 기울기를 좁혀 들어가는 정밀도
+MAX_POINTS = 100_000 # 분석 화면/일괄 분석에서 계산하는 최대 개수 (10만 개에 약 3초, 100만 개면 20초 이상)
+
+
+class TheilSen(NamedTuple):
+    slope: float
+    intercept: float # y - 기울기·x 의 중앙값
+    exact: bool # False면 기울기가 상대 오차 RELATIVE_TOLERANCE 이내의 근사값 (큰 n에서 드물게)
+
+
+def theil_sen(x, y, exact_threshold=EXACT_THRESHOLD, seed=None):
+    """Theil–Sen 기울기와 절편. X 값이 모두 같으면(서로 다른 X 쌍이 없으면) None."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = x.size
+    if n < 2:
+        return None
+    if n <= exact_threshold:
+        slope = _exact_median_slope(x, y)
+        exact = True
+    else:
+        selector = _SlopeSelector(x, y, seed)
+        slope = selector.median()
+        exact = selector.exact
+    if slope is None:
+        return None
+    return TheilSen(slope, float(np.median(y - slope * x)), exact)
+
+
+def _exact_median_slope(x, y):
+    i, j = np.triu_indices(x.size, 1)
+    dx = x[j] - x[i]
+    valid = dx != 0
+    if not valid.any():
+        return None
+    return float(np.median((y[j] - y[i])[valid] / dx[valid]))
+
+
+class _SlopeSelector:
+    """기울기를 모두 만들지 않고 k번째로 작은 기울기를 찾습니다."""
+
+    def __init__(self, x, y, seed):
+        self.x = x
+        self.y = y
+        x_rank = rank(x)
+        self.x_dense = x_rank.dense
+        n = x.size
+        self.n_slopes = n * (n - 1) // 2 - x_rank.tied_pairs # X가 같은 쌍은 기울기가 없음
+        self.rng = np.random.default_rng(seed)
+        self.exact = True # 모든 선택이 구간 안의 유일한 기울기를 직접 찾아 끝났으면 True
+
+    def median(self):
+        if self.n_slopes == 0:
+            return None
+        low = self.select((self.n_slopes - 1) // 2)
+        high = low if self.n_slopes % 2 else self.select(self.n_slopes // 2)
+        return (low + high) / 2
+
+    def count_at_most(self, t):
+        """기울기가 t 이하인 쌍의 개수 (O(n log n))."""
+        n = self.x.size
+        z_rank = rank(self.y - t * self.x)
+        # X 오름차순, X가 같으면 z 내림차순으로 놓으면 X가 같은 쌍은 모두 "뒤집힌 쌍"으로 세어지므로 나중에 뺌
+        order = np.argsort(self.x_dense * n + (n - 1 - z_rank.dense), kind="stable")
+        at_most = count_inversions(z_rank.dense[order]) + z_rank.tied_pairs
+        return at_most - (n * (n - 1) // 2 - self.n_slopes)
+
+    def select(self, k):
+        """k번째(0부터)로 작은 기울기: count_at_most(t) ≥ k + 1 인 가장 작은 t."""
+        low, high = self._sample_bracket(k)
+        # low에서는 k+1개 미만, high에서는 k+1개 이상이 되도록 구간을 넓힘
+        width = max(high - low, abs(high) * RELATIVE_TOLERANCE, 1e-12)
+        while (count_low := self.count_at_most(low)) >= k + 1:
+            low -= width
+            width *= 2
+        width = max(high - low, 1e-12)
+        while (count_high := self.count_at_most(high)) < k + 1:
+            high += width
+            width *= 2
+
+        # 개수가 t에 대해 거의 직선으로 늘어나므로 보간으로 좁히고, 잘 줄지 않으면 이분법으로 한 번 좁힘
+        bisect = False
+        while high - low > RELATIVE_TOLERANCE * max(1.0, abs(low), abs(high)):
+            if count_high - count_low == 1: # 구간 안의 기울기가 하나뿐이면 그 쌍을 직접 찾음
+                slope = self._only_slope_between(low, high)
+                if slope is not None:
+                    return slope
+            if bisect:
+                middle = (low + high) / 2
+            else:
+                middle = low + (k + 0.5 - count_low) / (count_high - count_low) * (high - low)
+            if not low < middle < high:
+                middle = (low + high) / 2
+                if not low < middle < high: # 부동소수점 간격보다 좁아짐
+                    break
+            old_width = high - low
+            count = self.count_at_most(middle)
+            if count >= k + 1:
+                high, count_high = middle, count
+            else:
+                low, count_low = middle, count
+            bisect = high - low > old_width / 2
+        self.exact = False
+        return float(high)
+
+    def _only_slope_between(self, low, high):
+        # low와 high 사이에서 z 순서가 바뀌는 쌍은 하나뿐이고, 바뀌는 순간 서로 이웃해 있음
+        order_low = np.argsort(self.y - low * self.x, kind="stable")
+        order_high = np.argsort(self.y - high * self.x, kind="stable")
+        moved = np.flatnonzero(order_low != order_high)
+        if moved.size != 2 or moved[1] != moved[0] + 1:
+            return None
+        i, j = order_low[moved]
+        if self.x[i] == self.x[j]:
+            return None
+        slope = float((self.y[j] - self.y[i]) / (self.x[j] - self.x[i]))
+        return slope if low < slope <= high else None
+
+    def _sample_bracket(self, k):
+        # 무작위 쌍의 기울기 분포에서 k번째 순위 근처(표본오차의 약 3배 폭)를 잘라 시작 구간으로 사용
+        n = self.x.size
+        i = self.rng.integers(0, n, SAMPLE_PAIRS)
+        j = self.rng.integers(0, n, SAMPLE_PAIRS)
+        dx = self.x[j] - self.x[i]
+        valid = dx != 0
+        slopes = np.sort((self.y[j] - self.y[i])[valid] / dx[valid])
+        if slopes.size == 0:
+            return 0.0, 0.0
+        q = (k + 0.5) / self.n_slopes
+        margin = 3 * math.sqrt(q * (1 - q) / slopes.size) + 1 / slopes.size
+        low = slopes[int(max(0.0, q - margin) * (slopes.size - 1))]
+        high = slopes[int(math.ceil(min(1.0, q + margin) * (slopes.size - 1)))]
+        return float(low), float(high)
@@ -0,0 +1,246 @@
+"""두 변수(X, Y) 통계 계산 엔진.
+
+화면에 보이는 평균, 표준편차, 최솟값/최댓값, 상관계수, 회귀식을
+충분통계량(n, 평균, M2, 공편차합)으로 한 번에 계산합니다.
+데이터는 BLOCK_SIZE 크기의 블록 단위로 읽고, 블록 결과를 Welford/Chan 방식으로
+합치기 때문에 임시 메모리는 블록 크기만큼만 쓰고 큰 값에서도 수치적으로 안정적입니다.
+"""
+import math
+from dataclasses import dataclass
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+BLOCK_SIZE = 1 << 16 # 한 번에 처리할 원소 수 (CPU 캐시에 들어가는 크기)
+
+
+@dataclass
+class PairStats:
+    """X, Y 쌍 데이터의 충분통계량."""
+    n: int = 0
+    mean_x: float = 0.0
+    mean_y: float = 0.0
+    m2_x: float = 0.0 # X 편차제곱합
+    m2_y: float = 0.0 # Y 편차제곱합
+    c_xy: float = 0.0 # X, Y 편차곱의 합 (공편차합)
+    min_x: float = math.inf
+    max_x: float = -math.inf
+    min_y: float = math.inf
+    max_y: float = -math.inf
+    extremes_valid: bool = True # remove() 후 최솟값/최댓값을 다시 구해야 하면 False
+
+    @classmethod
+    def from_arrays(cls, x, y, block_size=BLOCK_SIZE):
+        result = cls()
+        result.update(x, y, block_size)
+        return result
+
+    def update(self, x, y, block_size=BLOCK_SIZE):
+        """새 데이터 쌍을 블록 단위로 더합니다."""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if x.shape != y.shape:
+            raise ValueError(f"X 개수({x.size})와 Y 개수({y.size})가 다릅니다.")
+        for start in range(0, x.size, block_size):
+            self.merge(_block_stats(x[start:start + block_size], y[start:start + block_size]))
+        return self
+
+    def merge(self, other):
+        """다른 PairStats를 합칩니다 (Chan et al. 병렬 분산 공식)."""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+        n = self.n + other.n
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        w = self.n * other.n / n
+        self.mean_x += dx * other.n / n
+        self.mean_y += dy * other.n / n
+        self.m2_x += other.m2_x + dx * dx * w
+        self.m2_y += other.m2_y + dy * dy * w
+        self.c_xy += other.c_xy + dx * dy * w
+        self.n = n
+        self.min_x = min(self.min_x, other.min_x)
+        self.max_x = max(self.max_x, other.max_x)
+        self.min_y = min(self.min_y, other.min_y)
+        self.max_y = max(self.max_y, other.max_y)
+        self.extremes_valid = self.extremes_valid and other.extremes_valid
+        return self
+
+    def remove(self, other):
+        """merge의 역연산: 이 통계량에서 other에 해당하는 데이터를 뺍니다.
+
+        최솟값/최댓값은 되돌릴 수 없으므로, 빠진 데이터가 극값을 포함했다면
+        extremes_valid가 False가 되고 호출한 쪽에서 다시 계산해야 합니다.
+        """
+        if other.n == 0:
+            return self
+        n = self.n - other.n
+        if n < 0:
+            raise ValueError("빼려는 데이터가 전체보다 많습니다.")
+        if n == 0:
+            self.__dict__.update(PairStats().__dict__)
+            return self
+        mean_x = (self.n * self.mean_x - other.n * other.mean_x) / n
+        mean_y = (self.n * self.mean_y - other.n * other.mean_y) / n
+        dx = other.mean_x - mean_x
+        dy = other.mean_y - mean_y
+        w = n * other.n / self.n
+        self.m2_x = max(self.m2_x - other.m2_x - dx * dx * w, 0.0)
+        self.m2_y = max(self.m2_y - other.m2_y - dy * dy * w, 0.0)
+        self.c_xy -= other.c_xy + dx * dy * w
+        self.mean_x = mean_x
+        self.mean_y = mean_y
+        self.n = n
+        if (other.min_x <= self.min_x or other.max_x >= self.max_x
+                or other.min_y <= self.min_y or other.max_y >= self.max_y):
+            self.extremes_valid = False
+        return self
+
+    def refresh_extremes(self, x, y):
+        """최솟값/최댓값을 배열에서 다시 구합니다."""
+        self.min_x, self.max_x = float(np.min(x)), float(np.max(x))
+        self.min_y, self.max_y = float(np.min(y)), float(np.max(y))
+        self.extremes_valid = True
+        return self
+
+    # --- 화면에 보이는 값 ---
+
+    @property
+    def std_x(self):
+        """표본 표준편차 (ddof=1). 데이터가 2개 미만이면 None."""
+        return math.sqrt(self.m2_x / (self.n - 1)) if self.n > 1 else None
+
+    @property
+    def std_y(self):
+        return math.sqrt(self.m2_y / (self.n - 1)) if self.n > 1 else None
+
+    # 값이 모두 같은지는 최솟값/최댓값으로 판단 (증분 갱신 후 편차제곱합에는 반올림 찌꺼기가 남아 0이 안 될 수 있음)
+    @property
+    def can_calculate_correlation(self):
+        return self.can_calculate_regression and self.min_y != self.max_y and self.m2_y > 0
+
+    @property
+    def can_calculate_regression(self):
+        return self.min_x != self.max_x and self.m2_x > 0
+
+    @property
+    def correlation(self):
+        """피어슨 상관계수 r. 분모가 0이면 None."""
+        if not self.can_calculate_correlation:
+            return None
+        r = self.c_xy / math.sqrt(self.m2_x * self.m2_y)
+        if math.isnan(r): # 값이 너무 커서 넘친 경우 등: 1로 바꾸지 않고 그대로 보여줌
+            return r
+        return max(-1.0, min(1.0, r)) # 반올림 오차로 1을 살짝 넘는 것 방지
+
+    @property
+    def slope(self):
+        """최소제곱 회귀선 기울기. X가 모두 같으면 None."""
+        return self.c_xy / self.m2_x if self.can_calculate_regression else None
+
+    @property
+    def intercept(self):
+        """회귀선 절편. 기울기를 구할 수 없으면 Y 평균."""
+        slope = self.slope
+        return self.mean_y if slope is None else self.mean_y - slope * self.mean_x
+
+
+def _block_stats(xb, yb):
+    # 블록 하나의 통계량: 블록 크기만큼의 편차 배열만 잠깐 만들고 내적으로 합을 구함
+    m = xb.size
+    if m == 0:
+        return PairStats()
+    mean_x = xb.sum() / m
+    mean_y = yb.sum() / m
+    dx = xb - mean_x
+    dy = yb - mean_y
+    return PairStats(
+        n=m,
+        mean_x=float(mean_x),
+        mean_y=float(mean_y),
+        m2_x=float(np.dot(dx, dx)),
+        m2_y=float(np.dot(dy, dy)),
+        c_xy=float(np.dot(dx, dy)),
+        min_x=float(xb.min()),
+        max_x=float(xb.max()),
+        min_y=float(yb.min()),
+        max_y=float(yb.max()),
+    )
+
+
+class ModeResult(NamedTuple):
+    """최빈값 결과. 여러 값이 같은 횟수로 가장 많이 나오면 modes에 모두 담깁니다 (오름차순)."""
+    modes: np.ndarray
+    count: int # 최빈값이 나온 횟수
+    n_unique: int # 서로 다른 값의 개수
+
+    @property
+    def has_mode(self):
+        """모든 값이 한 번씩만 나오면 최빈값이 없는 것으로 봅니다."""
+        return self.count > 1
+
+
+def mode_counts(sorted_values):
+    """정렬된 배열에서 같은 값끼리 묶어 개수를 세고, 가장 많은 값을 모두 찾습니다."""
+    n = sorted_values.size
+    if n == 0:
+        return ModeResult(np.empty(0), 0, 0)
+    starts = np.flatnonzero(np.concatenate(([True], sorted_values[1:] != sorted_values[:-1])))
+    counts = np.diff(np.append(starts, n))
+    count = int(counts.max())
+    return ModeResult(sorted_values[starts[counts == count]], count, int(starts.size))
+
+
+def mode(values):
+    """정렬하지 않은 배열의 최빈값 (정렬 한 번)."""
+    return mode_counts(np.sort(np.asarray(values, dtype=np.float64)))
+
+
+@dataclass
+class Summary:
+    """화면에 표시하는 기술 통계 전체."""
+    pair: PairStats
+    median_x: float
+    median_y: float
+    mode_x: Optional[ModeResult] = None # 값을 보관하지 않는 스트리밍 분석에서는 None
+    mode_y: Optional[ModeResult] = None
+    median_error_x: float = 0.0 # 근사 중앙값의 순위 오차 비율 (정확히 계산했으면 0)
+    median_error_y: float = 0.0
+
+    @classmethod
+    def from_sketches(cls, pair, x_sketch, y_sketch):
+        """스트리밍으로 모은 충분통계량과 분위수 스케치로 만듭니다 (최빈값 없음)."""
+        return cls(pair, x_sketch.median(), y_sketch.median(),
+                   median_error_x=x_sketch.rank_error, median_error_y=y_sketch.rank_error)
+
+
+def summarize(x, y, block_size=BLOCK_SIZE, pair=None):
+    """충분통계량, 중앙값, 최빈값을 함께 계산합니다.
+
+    중앙값과 최빈값은 변수마다 한 번 정렬한 복사본에서 같이 구합니다.
+    pair를 주면 (예: 증분 갱신으로 이미 구한 경우) 충분통계량은 다시 계산하지 않습니다.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x_sorted = np.sort(x)
+    y_sorted = np.sort(y)
+    return Summary(
+        pair=pair if pair is not None else PairStats.from_arrays(x, y, block_size),
+        median_x=_sorted_median(x_sorted),
+        median_y=_sorted_median(y_sorted),
+        mode_x=mode_counts(x_sorted),
+        mode_y=mode_counts(y_sorted),
+    )
+
+
+def _sorted_median(sorted_values):
+    n = sorted_values.size
+    if n == 0:
+        return math.nan
+    half = n // 2
+    if n % 2:
+        return float(sorted_values[half])
+    return float((sorted_values[half - 1] + sorted_values[half]) / 2)
@@ -0,0 +1,143 @@
+"""무거운 분석을 Streamlit 스크립트 스레드 밖(서버에 하나뿐인 작업 스레드 풀)에서 실행하기.
+
+- 스크립트는 작업을 맡긴 뒤 POLL_SECONDS마다 진행률만 확인하므로, 그 사이 학생이 입력을 바꾸면
+  Streamlit이 곧바로 페이지를 다시 실행할 수 있고, 다시 실행된 스크립트가 더 이상 필요 없는 작업을 취소합니다.
+- 작업 함수는 Job을 timer로 받아 단계가 끝날 때마다 lap()을 부르며(StageTimer와 같은 자리),
+  취소된 작업은 다음 lap()에서 Cancelled로 멈춥니다 (단계 하나가 도는 중간에는 멈추지 않음).
+- 실행 중 + 대기 중인 작업 수를 max_pending으로 제한해(입장 제한) 한 반이 한꺼번에 누르더라도
+  서버 전체의 CPU를 다 차지하지 못하게 하고, 넘치면 PoolBusy로 "잠시 후 다시"를 안내합니다.
+- 같은 입력(같은 결과 캐시 키)을 여러 세션이 동시에 맡기면 작업 하나를 같이 기다리고,
+  기다리는 세션이 모두 떠나야 취소합니다.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+DEFAULT_WORKERS = int(os.environ.get("STATS_WORKERS", min(4, os.cpu_count() or 1)))
+DEFAULT_MAX_PENDING = int(os.environ.get("STATS_MAX_PENDING", 4 * DEFAULT_WORKERS)) # 실행 중 + 대기 중
+POLL_SECONDS = 0.1 # 스크립트가 진행률을 확인하는 간격
+
+
+class Cancelled(BaseException):
+    """취소된 작업이 lap()에서 멈출 때 발생 (asyncio.CancelledError처럼 except Exception에 잡히지 않음)."""
+
+
+class PoolBusy(RuntimeError):
+    """입장 제한(max_pending)에 걸려 작업을 받을 수 없음."""
+
+
+class Job:
+    """풀에 맡긴 작업 하나의 진행 상태, 결과, 취소 표시."""
+
+    def __init__(self, key, timer=None, profile=None, total_steps=None):
+        self.key = key
+        self.timer = timer # 단계별 시간을 함께 기록할 StageTimer (없으면 None)
+        self.profile = profile # 작업 스레드에서 켜고 끌 ProfileCapture (없으면 None)
+        self.total_steps = total_steps # 진행률 계산용 예상 lap 횟수
+        self.steps_done = 0
+        self.message = "대기 중..."
+        self.future = None
+        self._cancel = threading.Event()
+        self._waiters = 1 # 이 작업을 기다리는 세션 수
+
+    def lap(self, stage):
+        """단계 하나가 끝났음을 알립니다. 취소되었으면 여기서 Cancelled로 멈춥니다."""
+        if self.timer is not None:
+            self.timer.lap(stage)
+        self.steps_done += 1
+        self.message = f"{stage} 완료"
+        self.check()
+
+    def report(self, message):
+        """단계 안에서의 진행 상황 (예: 파일 읽은 행 수). 취소되었으면 멈춥니다."""
+        self.message = message
+        self.check()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise Cancelled(self.key)
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def fraction(self):
+        """0~1 진행률 (예상 단계 수를 모르면 0)."""
+        if not self.total_steps:
+            return 0.0
+        return min(self.steps_done / self.total_steps, 1.0)
+
+    def done(self):
+        return self.future.done()
+
+    def wait(self, timeout):
+        """끝날 때까지 최대 timeout초 기다립니다 (끝나면 바로 돌아옴). 끝났으면 True."""
+        return bool(wait([self.future], timeout).done)
+
+    def result(self, timeout=None):
+        """작업 함수의 반환값. 작업에서 난 예외(입력 오류, Cancelled 등)는 그대로 다시 발생합니다."""
+        return self.future.result(timeout)
+
+
+class AnalysisPool:
+    """서버 프로세스 하나에 하나 (@st.cache_resource로 만들어 모든 세션이 공유), 스레드 안전."""
+
+    def __init__(self, max_workers=DEFAULT_WORKERS, max_pending=DEFAULT_MAX_PENDING):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis")
+        self._admission = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._jobs = {} # key -> 진행 중인 Job
+
+    def submit(self, key, task, timer=None, profile=None, total_steps=None):
+        """task(job)을 작업 스레드에서 실행합니다. 같은 key의 작업이 진행 중이면 그 작업을 같이 기다립니다."""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not job.cancelled:
+                job._waiters += 1
+                return job
+            if not self._admission.acquire(blocking=False):
+                raise PoolBusy(f"분석 요청이 {self.max_pending}개를 넘었습니다.")
+            job = Job(key, timer, profile, total_steps)
+            self._jobs[key] = job
+            job.future = self._executor.submit(self._run, job, task)
+            return job
+
+    def release(self, job):
+        """세션이 더 이상 job의 결과를 기다리지 않음. 기다리는 세션이 없으면 작업을 취소합니다."""
+        with self._lock:
+            job._waiters -= 1
+            if job._waiters > 0:
+                return
+            job.cancel()
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "jobs": len(self._jobs),
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+            }
+
+    def _run(self, job, task):
+        try:
+            job.check() # 기다리는 동안 취소되었으면 시작하지 않음
+            if job.profile is not None: # cProfile은 스레드마다 따로 켜야 하므로 작업 스레드에서 시작
+                job.profile.start()
+            try:
+                return task(job)
+            finally:
+                if job.profile is not None:
+                    job.profile.stop()
+        finally:
+            with self._lock:
+                if self._jobs.get(job.key) is job:
+                    del self._jobs[job.key]
+            self._admission.release()
@@ -0,0 +1,48 @@
+import os
+
+from statkit.analysis import AnalysisOptions
+from statkit.batch import find_jobs, run_batch
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_figure_files_do_not_overwrite_each_other(tmp_path):
+    data = tmp_path / "data"
+    write(data / "sub" / "a.csv", "x,y\n1,2\n2,4\n3,7\n")
+    write(data / "sub_a.csv", "x,y\n1,1\n2,1\n3,2\n")
+    write(data / "c0.csv", "x,y\n1,3\n2,2\n3,1\n")
+    write(data / "c0.tsv", "x\ty\n1\t5\n2\t6\n3\t9\n")
+    figures = tmp_path / "figures"
+    figures.mkdir()
+    jobs = find_jobs(str(data))
+    records = run_batch(jobs, AnalysisOptions(figure=False), n_workers=1, figure_dir=str(figures), png=True)
+    assert [record["error"] for record in records] == [None] * 4
+    paths = [record["png"] for record in records]
+    assert len(set(paths)) == 4
+    assert all(os.path.exists(path) for path in paths)
+    # 다시 실행해도 같은 이름 (보고서를 다시 만들 때 이전 그림을 덮어씀)
+    again = run_batch(jobs, AnalysisOptions(figure=False), n_workers=1, figure_dir=str(figures), png=True)
+    assert [record["png"] for record in again] == paths
+
+
+def test_single_column_file_is_an_error_not_perfect_correlation(tmp_path):
+    data = tmp_path / "data"
+    write(data / "scores.csv", "3\n1\n4\n1\n5\n9\n")
+    write(data / "notes.txt", "3\n1\n4\n1\n5\n9\n") # 폴더에서 찾을 때 .txt는 제외
+    jobs = find_jobs(str(data))
+    assert [job.dataset for job in jobs] == ["scores.csv"]
+    [record] = run_batch(jobs, AnalysisOptions(figure=False), n_workers=1)
+    assert record["error"].startswith("ValueError")
+    assert record["r"] is None and record["n"] is None
+
+
+def test_y_column_defaults_to_a_column_other_than_x(tmp_path):
+    write(tmp_path / "data.csv", "a,b,c\n1,2,9\n2,4,7\n3,7,8\n")
+    write(tmp_path / "manifest.csv", "path,x_column\ndata.csv,b\n")
+    [record] = run_batch(find_jobs(str(tmp_path / "manifest.csv")), AnalysisOptions(figure=False), n_workers=1)
+    assert (record["x_column"], record["y_column"]) == ("b", "a")
+    assert record["error"] is None and record["n"] == 3
@@ -0,0 +1,103 @@
+import json
+
+import numpy as np
+import plotly.io as pio
+
+from statkit.figures import (DECIMATE_BINS, DENSITY_THRESHOLD, PLOT_MODE_DECIMATE, WEBGL_THRESHOLD,
+                             build_group_figure, build_scatter_figure, decimate_extremes, density_heatmap)
+from statkit.grouped import grouped_stats
+from statkit.payload import figure_nbytes
+from statkit.stats_engine import PairStats
+
+
+def serialized_dtypes(fig):
+    # 직렬화된 trace 배열의 dtype ({"dtype": "f4", "bdata": ...})
+    traces = json.loads(pio.to_json(fig, validate=False))["data"]
+    return {(i, field): trace[field]["dtype"] for i, trace in enumerate(traces)
+            for field in ("x", "y", "z") if isinstance(trace.get(field), dict)}
+
+
+def test_density_heatmap_counts_match_histogram2d():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=50_000).round(2)
+    y = (x + rng.normal(size=50_000)).round(1)
+    pair = PairStats.from_arrays(x, y)
+    heatmap = density_heatmap(x, y, pair, bins=50)
+    x_edges = np.linspace(pair.min_x, pair.max_x, 51)
+    y_edges = np.linspace(pair.min_y, pair.max_y, 51)
+    expected, _, _ = np.histogram2d(x, y, bins=(x_edges, y_edges))
+    np.testing.assert_array_equal(np.nan_to_num(np.asarray(heatmap.z)), expected.T)
+
+
+def test_compact_scatter_sends_integer_data_as_float32():
+    # 리커트 점수/개수처럼 float32로 바꿔도 값이 같은 데이터도 f4로 보내야 함
+    rng = np.random.default_rng(0)
+    x = rng.integers(1, 6, 150_000).astype(np.float64)
+    y = rng.integers(0, 100, 150_000).astype(np.float64)
+    pair = PairStats.from_arrays(x, y)
+    full = build_scatter_figure(x, y, pair, "X", "Y")
+    compact = build_scatter_figure(x, y, pair, "X", "Y", compact=True)
+    assert serialized_dtypes(full)[0, "x"] == "f8"
+    assert serialized_dtypes(compact)[0, "x"] == serialized_dtypes(compact)[0, "y"] == "f4"
+    assert figure_nbytes(compact) < 0.6 * figure_nbytes(full)
+
+
+def test_compact_density_and_group_figures_use_float32():
+    rng = np.random.default_rng(0)
+    x = rng.integers(0, 50, 300_000).astype(np.float64)
+    y = rng.integers(0, 50, 300_000).astype(np.float64)
+    pair = PairStats.from_arrays(x, y)
+    density = build_scatter_figure(x, y, pair, "X", "Y", compact=True)
+    assert {serialized_dtypes(density)[0, field] for field in ("x", "y", "z")} == {"f4"}
+
+    groups = np.array(["A", "B", "C"])[rng.integers(0, 3, 300)]
+    group_fig = build_group_figure(x[:300], y[:300], grouped_stats(x[:300], y[:300], groups), "X", "Y", compact=True)
+    assert set(serialized_dtypes(group_fig).values()) == {"f4"}
+
+
+def test_decimate_extremes_keeps_min_and_max_of_every_bin():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=100_000).round(3)
+    y = (x ** 2 + rng.standard_t(2, size=100_000)).round(2)
+    bins = 50
+    keep = decimate_extremes(x, y, bins=bins)
+    assert keep.size <= 4 * bins # 구간마다 최대 4개 (X 구간의 Y 최솟값/최댓값, Y 구간의 X 최솟값/최댓값)
+    assert np.all(np.diff(keep) > 0)
+
+    kept = np.zeros(x.size, dtype=bool)
+    kept[keep] = True
+    for key, value in ((x, y), (y, x)):
+        width = (key.max() - key.min()) / bins
+        bin_index = np.minimum(((key - key.min()) / width).astype(np.int64), bins - 1)
+        for b in np.unique(bin_index):
+            members = bin_index == b
+            assert value[members & kept].min() == value[members].min()
+            assert value[members & kept].max() == value[members].max()
+
+
+def test_decimate_extremes_with_constant_column():
+    x = np.full(1_000, 3.0)
+    y = np.arange(1_000.0)
+    keep = decimate_extremes(x, y, bins=10)
+    assert {0, 999} <= set(keep.tolist())
+    assert keep.size <= 4 * 10
+
+
+def test_scatter_trace_type_follows_point_count_thresholds():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=DENSITY_THRESHOLD + 1)
+    y = x + rng.normal(size=x.size)
+
+    def first_trace(n, **kwargs):
+        pair = PairStats.from_arrays(x[:n], y[:n])
+        return build_scatter_figure(x[:n], y[:n], pair, "X", "Y", **kwargs).data[0]
+
+    assert first_trace(WEBGL_THRESHOLD).type == "scatter"
+    assert first_trace(WEBGL_THRESHOLD + 1).type == "scattergl"
+    assert first_trace(DENSITY_THRESHOLD).type == "scattergl"
+    assert len(first_trace(DENSITY_THRESHOLD).x) == DENSITY_THRESHOLD
+    assert first_trace(DENSITY_THRESHOLD + 1).type == "heatmap"
+    decimated = first_trace(DENSITY_THRESHOLD + 1, large_mode=PLOT_MODE_DECIMATE)
+    assert decimated.type == "scattergl"
+    assert len(decimated.x) <= 4 * DECIMATE_BINS
+    assert decimated.x.min() == x.min() and decimated.x.max() == x.max()
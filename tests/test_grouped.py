@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from statkit.grouped import EMPTY_LABEL, grouped_stats
+
+
+def brute_group(x, y):
+    # 그룹 하나를 직접 계산 (계산할 수 없는 값은 NaN)
+    n = x.size
+    std_x = np.std(x, ddof=1) if n > 1 else np.nan
+    std_y = np.std(y, ddof=1) if n > 1 else np.nan
+    slope = intercept = r = np.nan
+    if x.min() != x.max():
+        slope, intercept = np.polyfit(x, y, 1)
+        if y.min() != y.max():
+            r = np.corrcoef(x, y)[0, 1]
+    return {"n": n, "mean_x": x.mean(), "mean_y": y.mean(), "median_x": np.median(x), "median_y": np.median(y),
+            "std_x": std_x, "std_y": std_y, "min_x": x.min(), "max_x": x.max(),
+            "r": r, "slope": slope, "intercept": intercept}
+
+
+def test_grouped_stats_matches_per_group_loop():
+    rng = np.random.default_rng(0)
+    groups = np.array(["1반", "2반", "3반", "", " "])[rng.integers(0, 5, 400)] # 빈칸 두 종류는 한 그룹
+    x = rng.normal(170, 8, groups.size).round(1)
+    y = (0.5 * x + rng.normal(0, 5, groups.size)).round(1)
+    x[groups == "3반"] = 5.1 # X가 모두 같은 그룹 (평균이 반올림되어도 기울기/상관계수는 NaN)
+    groups = np.append(groups, "전학생") # 한 명뿐인 그룹
+    x, y = np.append(x, 160.0), np.append(y, 80.0)
+
+    stats = grouped_stats(x, y, groups)
+    labels = np.where(np.char.strip(groups) == "", EMPTY_LABEL, groups)
+    assert sorted(stats.labels.tolist()) == sorted(set(labels.tolist()))
+    np.testing.assert_array_equal(stats.labels[stats.codes], labels)
+    for g, label in enumerate(stats.labels):
+        members = labels == label
+        expected = brute_group(x[members], y[members])
+        for field, value in expected.items():
+            actual = getattr(stats, field)[g]
+            if np.isnan(value):
+                assert np.isnan(actual), (label, field)
+            else:
+                assert actual == pytest.approx(value, rel=1e-9, abs=1e-9), (label, field)
+
+    constant = list(stats.labels).index("3반")
+    assert np.isnan(stats.slope[constant]) and np.isnan(stats.r[constant])
+    single = list(stats.labels).index("전학생")
+    assert stats.n[single] == 1 and np.isnan(stats.std_x[single]) and np.isnan(stats.slope[single])
+    assert stats.n[list(stats.labels).index(EMPTY_LABEL)] == np.sum(np.char.strip(groups) == "")
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from statkit import incremental
+from statkit.analysis import AnalysisOptions, analyze_text
+
+OPTIONS = AnalysisOptions(figure=False)
+
+
+def random_edit(rng, x_lines, y_lines):
+    # 한 번에 몇 줄만 추가/수정/삭제/삽입 (증분 갱신 범위 안)
+    x_lines, y_lines = list(x_lines), list(y_lines)
+    n_lines = int(rng.integers(1, 4))
+    kind = rng.integers(4)
+    value = lambda: str(round(float(rng.normal(50, 10)), int(rng.integers(0, 3))))
+    if kind == 0:
+        for _ in range(n_lines):
+            x_lines.append(value())
+            y_lines.append(value())
+    elif kind == 1:
+        start = int(rng.integers(0, len(x_lines) - n_lines))
+        for i in range(start, start + n_lines):
+            if rng.integers(2):
+                x_lines[i] = value()
+            else:
+                y_lines[i] = value()
+    elif kind == 2:
+        start = int(rng.integers(0, len(x_lines) - n_lines))
+        del x_lines[start:start + n_lines], y_lines[start:start + n_lines]
+    else:
+        start = int(rng.integers(0, len(x_lines)))
+        x_lines[start:start] = [value() for _ in range(n_lines)]
+        y_lines[start:start] = [value() for _ in range(n_lines)]
+    return x_lines, y_lines
+
+
+def assert_same_summary(actual, expected):
+    a, e = actual.summary.pair, expected.summary.pair
+    assert a.n == e.n
+    for field in ("mean_x", "mean_y", "m2_x", "m2_y", "c_xy"):
+        assert getattr(a, field) == pytest.approx(getattr(e, field), rel=1e-9, abs=1e-9)
+    assert (a.min_x, a.max_x, a.min_y, a.max_y) == (e.min_x, e.max_x, e.min_y, e.max_y)
+    assert a.correlation == pytest.approx(e.correlation, rel=1e-9)
+    assert (actual.summary.median_x, actual.summary.median_y) == (expected.summary.median_x, expected.summary.median_y)
+    for axis in ("mode_x", "mode_y"):
+        assert getattr(actual.summary, axis).modes.tolist() == getattr(expected.summary, axis).modes.tolist()
+        assert getattr(actual.summary, axis).count == getattr(expected.summary, axis).count
+        assert getattr(actual.summary, axis).n_unique == getattr(expected.summary, axis).n_unique
+    np.testing.assert_array_equal(actual.x, expected.x)
+    np.testing.assert_array_equal(actual.y, expected.y)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_incremental_matches_full_recompute_over_random_edits(seed):
+    rng = np.random.default_rng(seed)
+    x_lines = [str(v) for v in rng.integers(0, 100, 200)]
+    y_lines = [str(v) for v in rng.integers(0, 100, 200)]
+    _, state = analyze_text("\n".join(x_lines), "\n".join(y_lines), "X", "Y", OPTIONS)
+    n_incremental = 0
+    for _ in range(120):
+        x_lines, y_lines = random_edit(rng, x_lines, y_lines)
+        x_text, y_text = "\n".join(x_lines), "\n".join(y_lines)
+        actual, next_state = analyze_text(x_text, y_text, "X", "Y", OPTIONS, state)
+        expected, _ = analyze_text(x_text, y_text, "X", "Y", OPTIONS)
+        assert_same_summary(actual, expected)
+        n_incremental += next_state is not None and next_state.steps > 0
+        state = next_state
+    assert n_incremental > 100 # 대부분 증분 경로를 탔는지 확인 (MAX_INCREMENTAL_STEPS마다 전체 재계산)
+
+
+def test_update_falls_back_to_full_recompute_for_large_or_invalid_edits():
+    x_lines = [str(i) for i in range(100)]
+    y_lines = [str(2 * i) for i in range(100)]
+    _, state = analyze_text("\n".join(x_lines), "\n".join(y_lines), "X", "Y", OPTIONS)
+    assert incremental.update(state, x_lines + ["1"] * 20, y_lines + ["1"] * 20) is None # 바뀐 줄이 10% 초과
+    assert incremental.update(state, x_lines + ["abc"], y_lines + ["1"]) is None # 오류 줄
+    assert incremental.update(state, x_lines + ["nan"], y_lines + ["1"]) is None
+    assert incremental.update(state, x_lines, y_lines) is state
+
+
+def test_edit_that_makes_every_x_equal_disables_regression():
+    # 증분 갱신 뒤 편차제곱합에 반올림 찌꺼기(약 1e-15)가 남아도 "X 값이 모두 같음"으로 판단해야 함
+    x_lines = ["5.1"] * 30 + ["3.7"]
+    y_lines = [str(i * 1.3) for i in range(31)]
+    _, state = analyze_text("\n".join(x_lines), "\n".join(y_lines), "X", "Y", OPTIONS)
+    analysis, next_state = analyze_text("\n".join(["5.1"] * 31), "\n".join(y_lines), "X", "Y", OPTIONS, state)
+    pair = analysis.summary.pair
+    assert next_state.steps == 1
+    assert pair.min_x == pair.max_x == 5.1
+    assert not pair.can_calculate_regression and pair.slope is None
+    assert not pair.can_calculate_correlation and pair.correlation is None
+    assert pair.intercept == pytest.approx(pair.mean_y)
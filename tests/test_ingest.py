@@ -0,0 +1,53 @@
+import io
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from statkit.analysis import AnalysisOptions, analyze_file
+from statkit.ingest import FORMAT_CSV, FORMAT_PARQUET, FORMAT_TSV, ingest
+
+COLUMNS = {"a": ["1", "2", "x", "4", "5"], "b": ["10", "20", "30", "", "50"], "c": ["1반", "2반", "1반", "2반", "1반"]}
+
+
+def as_bytes(fmt):
+    if fmt == FORMAT_PARQUET:
+        buffer = io.BytesIO()
+        pq.write_table(pa.table(COLUMNS), buffer)
+        return buffer.getvalue()
+    sep = "\t" if fmt == FORMAT_TSV else ","
+    rows = [sep.join(COLUMNS)] + [sep.join(values) for values in zip(*COLUMNS.values())]
+    return "\n".join(rows).encode("utf-8")
+
+
+@pytest.mark.parametrize("fmt", [FORMAT_CSV, FORMAT_TSV, FORMAT_PARQUET])
+def test_ingest_reads_columns_by_name_and_drops_bad_rows(fmt):
+    result = ingest(as_bytes(fmt), "b", "a", fmt, chunk_rows=2)
+    assert result.x.tolist() == [10.0, 20.0, 50.0]
+    assert result.y.tolist() == [1.0, 2.0, 5.0]
+    assert result.n_dropped == 2
+
+
+@pytest.mark.parametrize("fmt", [FORMAT_CSV, FORMAT_PARQUET])
+def test_ingest_same_column_for_x_and_y(fmt):
+    result = ingest(as_bytes(fmt), "a", "a", fmt, chunk_rows=2)
+    np.testing.assert_array_equal(result.x, [1.0, 2.0, 4.0, 5.0])
+    np.testing.assert_array_equal(result.x, result.y)
+    assert result.pair.correlation == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("fmt", [FORMAT_CSV, FORMAT_PARQUET])
+@pytest.mark.parametrize("group_col", ["a", "b"])
+def test_ingest_group_column_same_as_x_or_y(fmt, group_col):
+    result = ingest(as_bytes(fmt), "a", "b", fmt, chunk_rows=2, group_col=group_col)
+    assert result.x.tolist() == [1.0, 2.0, 5.0]
+    assert result.y.tolist() == [10.0, 20.0, 50.0]
+    assert result.groups.tolist() == (["1", "2", "5"] if group_col == "a" else ["10", "20", "50"])
+
+
+@pytest.mark.parametrize("fmt", [FORMAT_CSV, FORMAT_PARQUET])
+def test_analyze_file_groups_by_name_column(fmt):
+    analysis = analyze_file(as_bytes(fmt), fmt, "a", "b", "X", "Y", AnalysisOptions(figure=False), group_column="c")
+    assert analysis.groups.labels.tolist() == ["1반", "2반"]
+    assert analysis.groups.n.tolist() == [2, 1]
@@ -0,0 +1,31 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from statkit import mpl_render
+from statkit.stats_engine import PairStats
+
+
+@pytest.fixture
+def no_korean_font(monkeypatch):
+    monkeypatch.setattr(mpl_render, "KOREAN_FONT_CANDIDATES", ("No Such Korean Font",))
+    mpl_render.configure_korean_font.cache_clear()
+    with warnings.catch_warnings():
+        yield
+    mpl_render.configure_korean_font.cache_clear()
+
+
+def test_missing_korean_font_warns_once_and_silences_glyph_warnings(no_korean_font):
+    x = np.arange(5.0)
+    y = 2 * x
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        filters = list(warnings.filters)
+        assert mpl_render.configure_korean_font() is None
+        for _ in range(2):
+            png = mpl_render.render_scatter_png(x, y, PairStats.from_arrays(x, y), "키", "몸무게")
+        assert warnings.filters == filters # 경고 설정은 그리는 동안에만 바뀜
+    assert png.startswith(b"\x89PNG")
+    assert [str(w.message) for w in caught if "Glyph" in str(w.message)] == []
+    assert sum(issubclass(w.category, RuntimeWarning) for w in caught) == 1
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from statkit.multivar import CrossStats
+from statkit.stats_engine import PairStats
+
+
+def sample_table(n=1_000, k=4, seed=0):
+    rng = np.random.default_rng(seed)
+    data = rng.normal(size=(n, k)) @ rng.normal(size=(k, k)) + rng.normal(scale=100, size=k)
+    return data.round(3)
+
+
+@pytest.mark.parametrize("block_size", [4, 28, 1_000_000]) # 한 줄씩, 여러 줄씩(나머지 블록 포함), 한 번에
+def test_cross_stats_matches_numpy(block_size):
+    data = sample_table()
+    stats = CrossStats.from_matrix(data, block_size=block_size)
+    assert stats.n == data.shape[0]
+    np.testing.assert_allclose(stats.means, data.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(stats.correlation_matrix(), np.corrcoef(data, rowvar=False), rtol=1e-10, atol=1e-12)
+    np.testing.assert_array_equal(stats.mins, data.min(axis=0))
+    np.testing.assert_array_equal(stats.maxs, data.max(axis=0))
+
+    slopes, intercepts = stats.regression_matrices()
+    for i in range(data.shape[1]):
+        for j in range(data.shape[1]):
+            slope, intercept = np.polyfit(data[:, i], data[:, j], 1)
+            assert slopes[i, j] == pytest.approx(slope, rel=1e-9)
+            assert intercepts[i, j] == pytest.approx(intercept, rel=1e-9, abs=1e-9)
+
+
+def test_cross_stats_pair_matches_pair_stats():
+    data = sample_table(n=301, k=3)
+    pair = CrossStats.from_matrix(data, block_size=30).pair(2, 0)
+    expected = PairStats.from_arrays(data[:, 2], data[:, 0])
+    assert pair.correlation == pytest.approx(expected.correlation, rel=1e-12)
+    assert pair.slope == pytest.approx(expected.slope, rel=1e-12)
+    assert pair.intercept == pytest.approx(expected.intercept, rel=1e-12)
+    assert (pair.min_x, pair.max_x, pair.min_y, pair.max_y) == (expected.min_x, expected.max_x, expected.min_y, expected.max_y)
+
+
+def test_cross_stats_constant_column_is_nan():
+    data = sample_table(n=50, k=3)
+    data[:, 1] = 7.0
+    stats = CrossStats.from_matrix(data, block_size=9)
+    r = stats.correlation_matrix()
+    slopes, _ = stats.regression_matrices()
+    assert np.isnan(r[1]).all() and np.isnan(r[:, 1]).all()
+    assert np.isnan(slopes[1]).all()
+    assert not stats.pair(1, 0).can_calculate_regression
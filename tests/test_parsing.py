@@ -0,0 +1,60 @@
+import math
+
+import numpy as np
+import pytest
+
+from statkit.analysis import AnalysisOptions, InputError, analyze_text
+from statkit.ingest import FORMAT_CSV, ingest
+from statkit.parsing import parse_cells, parse_lines, parse_table
+from statkit.stats_engine import PairStats
+
+
+def test_parse_lines_rejects_nan_and_inf_with_line_numbers():
+    parsed = parse_lines(["1", "nan", "", "3", "-inf", "4"])
+    assert parsed.values.tolist() == [1.0, 3.0, 4.0]
+    assert parsed.bad_lines == [(2, "nan"), (5, "-inf")]
+
+
+def test_parse_table_rejects_non_finite_rows():
+    parsed = parse_table("a,b\n1,2\ninf,3\n4,5")
+    assert parsed.values.tolist() == [[1.0, 2.0], [4.0, 5.0]]
+    assert parsed.bad_lines == [(3, "inf,3")]
+
+
+def test_parse_table_reports_only_bad_lines_in_mixed_input():
+    # 탭 구분, 앞뒤 공백, 빈 줄, 지수 표기는 정상이고 칸 수가 다르거나 숫자가 아닌 줄만 오류 (줄 번호는 빈 줄 포함)
+    text = "키\t몸무게\t나이\n170\t 65.5\t17\n\n 1.8e2\t70\t18\n160\t55\n165\t쉰\t16\n-3\t0\t+2\n"
+    parsed = parse_table(text)
+    assert parsed.names == ["키", "몸무게", "나이"]
+    assert parsed.values.tolist() == [[170.0, 65.5, 17.0], [180.0, 70.0, 18.0], [-3.0, 0.0, 2.0]]
+    assert parsed.bad_lines == [(5, "160\t55"), (6, "165\t쉰\t16")]
+
+    valid = parse_table("a,b\n1, 2\n\n 3,4 \n-5.5,6e-1")
+    assert valid.bad_lines == []
+    assert valid.values.tolist() == [[1.0, 2.0], [3.0, 4.0], [-5.5, 0.6]]
+
+
+def test_parse_cells_rejects_non_finite_but_keeps_empty_rows():
+    parsed = parse_cells(np.array(["1", None, "NaN", "2", "inf"], dtype=object))
+    assert parsed.empty_rows.tolist() == [1]
+    assert parsed.bad_cells == [(2, "NaN"), (4, "inf")]
+    assert parsed.values[[0, 3]].tolist() == [1.0, 2.0]
+
+
+def test_analyze_text_reports_nan_line_instead_of_perfect_correlation():
+    with pytest.raises(InputError) as error:
+        analyze_text("1\nnan\n3\n4", "1\n2\n3\n4", "X", "Y", AnalysisOptions(figure=False))
+    assert len(error.value.messages) == 1
+    assert "줄 2" in error.value.messages[0]
+
+
+def test_ingest_drops_non_finite_rows():
+    data = b"x,y\n1,1\nnan,2\n3,inf\n4,4\n5,6\n"
+    result = ingest(data, "x", "y", FORMAT_CSV)
+    assert result.n_dropped == 2
+    assert result.x.tolist() == [1.0, 4.0, 5.0]
+
+
+def test_correlation_keeps_nan_through_clamp():
+    pair = PairStats(n=2, m2_x=math.inf, m2_y=math.inf, c_xy=math.inf)
+    assert math.isnan(pair.correlation)
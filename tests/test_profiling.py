@@ -0,0 +1,105 @@
+import json
+import threading
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from statkit.profiling import ProfileCapture, StageTimer, append_jsonl, stop_finished
+
+
+@pytest.fixture
+def no_tracing():
+    was_tracing = tracemalloc.is_tracing()
+    tracemalloc.stop()
+    yield
+    if was_tracing:
+        tracemalloc.start()
+    else:
+        tracemalloc.stop()
+
+
+class FakeJob:
+    def __init__(self, finished):
+        self.finished = finished
+
+    def done(self):
+        return self.finished
+
+
+def test_stage_timer_records_time_and_memory_per_lap(no_tracing):
+    timer = StageTimer()
+    assert tracemalloc.is_tracing()
+    kept = np.ones(1_000_000) # 8MB: 단계가 끝난 뒤에도 남는 할당
+    timer.lap("keep")
+    np.ones(2_000_000).sum() # 16MB: 단계 중에만 잠깐 쓰는 할당
+    timer.lap("temporary")
+    assert [r["stage"] for r in timer.records] == ["keep", "temporary"]
+    assert all(r["seconds"] >= 0 for r in timer.records)
+    assert timer.records[0]["allocated_bytes"] >= kept.nbytes
+    assert timer.records[1]["allocated_bytes"] < 1_000_000
+    assert timer.records[1]["peak_bytes"] >= 16_000_000
+    assert timer.total_seconds == pytest.approx(sum(r["seconds"] for r in timer.records))
+
+    record = timer.to_record(input_mode="text", n=3)
+    assert (record["input_mode"], record["n"], record["stages"]) == ("text", 3, timer.records)
+    timer.stop()
+    assert not tracemalloc.is_tracing()
+
+
+def test_disabled_stage_timer_does_nothing(no_tracing):
+    timer = StageTimer(enabled=False)
+    timer.lap("anything")
+    assert timer.records == [] and timer.total_seconds == 0
+    assert not tracemalloc.is_tracing()
+
+
+def test_stage_timer_leaves_tracing_it_did_not_start(no_tracing):
+    tracemalloc.start()
+    timer = StageTimer()
+    timer.lap("stage")
+    timer.stop()
+    assert tracemalloc.is_tracing()
+
+
+def test_stop_finished_keeps_timers_of_running_jobs(no_tracing):
+    running = StageTimer()
+    finished = StageTimer(trace_memory=False)
+    without_job = StageTimer(trace_memory=False)
+    running_job = FakeJob(finished=False)
+    active = [(running, running_job), (finished, FakeJob(finished=True)), (without_job, None)]
+    assert stop_finished(active) == [(running, running_job)]
+    assert tracemalloc.is_tracing() # 아직 작업이 기록 중인 측정기가 켠 tracemalloc은 그대로
+
+    running_job.finished = True
+    assert stop_finished([(running, running_job)]) == []
+    assert not tracemalloc.is_tracing()
+
+
+def test_append_jsonl_writes_whole_lines_from_many_threads(tmp_path):
+    path = tmp_path / "profile.jsonl"
+
+    def write(i):
+        for j in range(50):
+            append_jsonl({"thread": i, "j": j, "단계": "x" * 1_000}, path)
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert len(records) == 200
+    assert sorted((r["thread"], r["j"]) for r in records) == [(i, j) for i in range(4) for j in range(50)]
+
+
+def test_profile_capture_report_names_profiled_function(no_tracing):
+    def busy_function():
+        return np.sort(np.random.default_rng(0).normal(size=100_000))
+
+    capture = ProfileCapture().start()
+    busy_function()
+    report = capture.stop().report(top=20)
+    assert "busy_function" in report
+    assert "tracemalloc" in report
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from statkit.ingest import FORMAT_CSV, ingest
+from statkit.quantiles import QuantileSketch
+
+
+def assert_within_rank_error(sketch, data, q):
+    # 돌려준 값의 실제 순위 범위가 목표 순위에서 max_rank_error 이내
+    data = np.sort(data)
+    value = sketch.quantile(q)
+    lowest = np.searchsorted(data, value, side="left")
+    highest = np.searchsorted(data, value, side="right") - 1
+    target = q * (data.size - 1)
+    assert lowest - sketch.max_rank_error <= target <= highest + sketch.max_rank_error
+
+
+def test_even_count_without_compaction_interpolates_exact_median():
+    sketch = QuantileSketch().update([4.0, 1.0, 3.0, 2.0])
+    assert sketch.median() == 2.5
+    assert sketch.rank_error == 0
+    assert sketch.quantile(0.25) == np.quantile([1, 2, 3, 4], 0.25)
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("q", [0.01, 0.25, 0.5, 0.9])
+def test_quantile_within_rank_error_bound(seed, q):
+    rng = np.random.default_rng(seed)
+    data = rng.lognormal(size=300_000).round(2) # 동점이 많은 치우친 분포
+    sketch = QuantileSketch(capacity=256, seed=seed)
+    for start in range(0, data.size, 10_000):
+        sketch.update(data[start:start + 10_000])
+    assert 0 < sketch.rank_error < 0.05
+    assert_within_rank_error(sketch, data, q)
+
+
+def test_merge_keeps_count_and_rank_error_bound():
+    rng = np.random.default_rng(0)
+    parts = [rng.normal(loc, 1, size) for loc, size in ((0, 100_000), (5, 50_000), (-3, 70_000))]
+    sketches = [QuantileSketch(capacity=256, seed=i).update(part) for i, part in enumerate(parts)]
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+        merged.merge(sketch)
+    data = np.concatenate(parts)
+    assert merged.n == data.size
+    for q in (0.1, 0.5, 0.9):
+        assert_within_rank_error(merged, data, q)
+
+
+def test_merge_of_small_sketches_is_exact():
+    a = QuantileSketch().update([5.0, 1.0])
+    b = QuantileSketch().update([3.0, 2.0, 4.0, 6.0])
+    assert a.merge(b).median() == 3.5
+    assert a.rank_error == 0
+
+
+def test_streaming_ingest_median_is_deterministic():
+    values = np.random.default_rng(0).normal(size=50_000).round(3)
+    data = ("x,y\n" + "\n".join(f"{v},{-v}" for v in values)).encode()
+    first = ingest(data, "x", "y", FORMAT_CSV, chunk_rows=5_000, keep_arrays=False, sketch=True)
+    second = ingest(data, "x", "y", FORMAT_CSV, chunk_rows=5_000, keep_arrays=False, sketch=True)
+    assert first.x_sketch.rank_error > 0
+    assert first.x_sketch.median() == second.x_sketch.median()
+    assert first.y_sketch.median() == second.y_sketch.median()
@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+import pytest
+
+from statkit.analysis import AnalysisOptions, run_analysis
+from statkit.rank_corr import count_inversions, kendall_tau_b, rank, rank_correlations
+
+
+def brute_inversions(values):
+    return sum(values[i] > values[j] for i in range(len(values)) for j in range(i + 1, len(values)))
+
+
+def brute_kendall_tau_b(x, y):
+    n = len(x)
+    s = tied_x = tied_y = 0
+    for i in range(n):
+        for j in range(i + 1, n):
+            dx = np.sign(x[j] - x[i])
+            dy = np.sign(y[j] - y[i])
+            s += dx * dy
+            tied_x += dx == 0
+            tied_y += dy == 0
+    total = n * (n - 1) // 2
+    denominator = (total - tied_x) * (total - tied_y)
+    return None if denominator == 0 else s / math.sqrt(denominator)
+
+
+def brute_average_rank(values):
+    return np.array([(values < v).sum() + ((values == v).sum() + 1) / 2 for v in values])
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("n_distinct", [3, 20, 1000])
+def test_count_inversions_matches_brute_force(seed, n_distinct):
+    values = np.random.default_rng(seed).integers(0, n_distinct, 97)
+    assert count_inversions(values) == brute_inversions(values.tolist())
+
+
+def test_count_inversions_edge_cases():
+    assert count_inversions([]) == 0
+    assert count_inversions([5]) == 0
+    assert count_inversions([2, 2, 2]) == 0 # 같은 값은 세지 않음
+    assert count_inversions([3, 2, 1]) == 3
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("n_distinct", [2, 5, 1000])
+def test_kendall_tau_b_matches_brute_force_with_ties(seed, n_distinct):
+    rng = np.random.default_rng(seed)
+    x = rng.integers(0, n_distinct, 60).astype(np.float64)
+    y = (x + rng.integers(0, n_distinct, 60)).astype(np.float64)
+    assert kendall_tau_b(rank(x), rank(y)) == pytest.approx(brute_kendall_tau_b(x, y), abs=1e-12)
+
+
+def test_kendall_tau_b_is_none_when_a_variable_is_constant():
+    assert kendall_tau_b(rank([1.0, 1.0, 1.0]), rank([1.0, 2.0, 3.0])) is None
+
+
+def test_rank_averages_ties():
+    values = np.array([3.0, 1.0, 3.0, 2.0, 3.0])
+    ranking = rank(values)
+    assert ranking.average.tolist() == brute_average_rank(values).tolist()
+    assert ranking.dense.tolist() == [2, 0, 2, 1, 2]
+    assert ranking.tied_pairs == 3
+
+
+def test_spearman_is_pearson_of_average_ranks():
+    rng = np.random.default_rng(1)
+    x = rng.integers(0, 5, 50).astype(np.float64)
+    y = rng.integers(0, 5, 50).astype(np.float64)
+    expected = np.corrcoef(brute_average_rank(x), brute_average_rank(y))[0, 1]
+    assert rank_correlations(x, y).spearman == pytest.approx(expected, abs=1e-12)
+
+
+def test_run_analysis_computes_rank_correlation_only_when_selected():
+    x = np.arange(10, dtype=np.float64)
+    y = x ** 2
+    skipped = run_analysis(x, y, "X", "Y", AnalysisOptions(figure=False))
+    assert skipped.rank_correlation is None
+    selected = run_analysis(x, y, "X", "Y", AnalysisOptions(figure=False, rank_correlation=True))
+    assert selected.rank_correlation.spearman == pytest.approx(1.0)
+    assert selected.rank_correlation.kendall_tau_b == pytest.approx(1.0)
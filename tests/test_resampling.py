@@ -0,0 +1,114 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from statkit.resampling import ROUND_TASKS, TASK_SIZE, bootstrap_ci, permutation_test
+
+
+def sample_pair(n, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(50, 10, n).round(1)
+    y = (0.8 * x + rng.normal(0, 8, n)).round(1)
+    return x, y
+
+
+def loop_bootstrap(x, y, n_resamples, confidence, seed):
+    # 재표본 하나씩 np.corrcoef/np.polyfit으로 계산 (bootstrap_ci와 같은 작업별 난수 스트림 사용)
+    n = x.size
+    r, slope, intercept = [], [], []
+    task_sizes = [min(TASK_SIZE, n_resamples - start) for start in range(0, n_resamples, TASK_SIZE)]
+    for size, task_seed in zip(task_sizes, np.random.SeedSequence(seed).spawn(len(task_sizes))):
+        rng = np.random.default_rng(task_seed)
+        for _ in range(size):
+            index = rng.integers(0, n, size=n)
+            xs, ys = x[index], y[index]
+            r.append(np.corrcoef(xs, ys)[0, 1])
+            b, a = np.polyfit(xs, ys, 1)
+            slope.append(b)
+            intercept.append(a)
+    tail = (1 - confidence) / 2 * 100
+    return [tuple(np.percentile(values, (tail, 100 - tail))) for values in (r, slope, intercept)]
+
+
+def test_bootstrap_ci_matches_per_resample_loop():
+    x, y = sample_pair(60)
+    ci = bootstrap_ci(x, y, n_resamples=2_500, confidence=0.9, seed=7, block_bytes=24 * 60 * 300)
+    expected_r, expected_slope, expected_intercept = loop_bootstrap(x, y, 2_500, 0.9, seed=7)
+    assert ci.r == pytest.approx(expected_r, rel=1e-9)
+    assert ci.slope == pytest.approx(expected_slope, rel=1e-9)
+    assert ci.intercept == pytest.approx(expected_intercept, rel=1e-9)
+    assert (ci.confidence, ci.n_resamples) == (0.9, 2_500)
+
+
+def test_bootstrap_ci_is_reproducible_for_seed():
+    x, y = sample_pair(200)
+    first = bootstrap_ci(x, y, n_resamples=1_500, seed=3)
+    assert bootstrap_ci(x, y, n_resamples=1_500, seed=3) == first
+    assert bootstrap_ci(x, y, n_resamples=1_500, seed=4) != first
+
+
+def test_bootstrap_ci_does_not_depend_on_block_bytes_or_n_jobs():
+    x, y = sample_pair(200)
+    expected = bootstrap_ci(x, y, n_resamples=3_500, seed=11)
+    for block_bytes in (1, 24 * 200 * 7, 24 * 200 * 1_000):
+        assert bootstrap_ci(x, y, n_resamples=3_500, seed=11, block_bytes=block_bytes) == expected
+    assert bootstrap_ci(x, y, n_resamples=3_500, seed=11, n_jobs=2) == expected
+
+
+def loop_permutation_count(x, y, n_permutations, seed):
+    # 순열 하나씩 섞어 |Σ(x-x̄)(y-ȳ)|가 관측값 이상인 개수를 셈 (permutation_test와 같은 난수 스트림)
+    xd, yd = x - x.mean(), y - y.mean()
+    observed = abs(xd @ yd)
+    task_sizes = [min(TASK_SIZE, n_permutations - start) for start in range(0, n_permutations, TASK_SIZE)]
+    count = 0
+    for size, task_seed in zip(task_sizes, np.random.SeedSequence(seed).spawn(len(task_sizes))):
+        rng = np.random.default_rng(task_seed)
+        for _ in range(size):
+            count += abs(xd @ rng.permutation(yd)) >= observed * (1 - 1e-12)
+    return count
+
+
+def test_permutation_p_value_matches_per_permutation_loop():
+    x, y = sample_pair(15, seed=5)
+    y = y[::-1].copy() # 상관이 약해서 조기 종료하지 않고 끝까지 세는 데이터
+    result = permutation_test(x, y, max_permutations=3_000, seed=2, block_bytes=8 * 15 * 70, round_tasks=10)
+    count = loop_permutation_count(x, y, 3_000, seed=2)
+    assert result.n_permutations == 3_000 and not result.stopped_early
+    assert result.p_value == (count + 1) / 3_001
+    assert result.p_interval[0] <= result.p_value <= result.p_interval[1]
+
+
+def test_permutation_p_value_close_to_exact_enumeration():
+    x = np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0])
+    y = np.array([2.0, 1.0, 4.0, 3.0, 7.0, 5.0, 6.0])
+    xd, yd = x - x.mean(), y - y.mean()
+    observed = abs(xd @ yd)
+    exact = np.mean([abs(xd @ yd[list(p)]) >= observed * (1 - 1e-12) for p in itertools.permutations(range(7))])
+    result = permutation_test(x, y, max_permutations=20_000, seed=0, round_tasks=20)
+    assert result.p_value == pytest.approx(exact, abs=4 * np.sqrt(exact * (1 - exact) / 20_000))
+
+
+def test_permutation_test_stops_early_when_p_value_is_clear():
+    x, y = sample_pair(100)
+    strong = permutation_test(x, y, max_permutations=100_000, seed=0)
+    assert strong.stopped_early
+    assert strong.n_permutations == ROUND_TASKS * TASK_SIZE # 첫 라운드에서 이미 alpha보다 확실히 작음
+    assert strong.p_interval[1] < 0.05
+
+    rng = np.random.default_rng(1)
+    unrelated = permutation_test(x, rng.permutation(y), max_permutations=100_000, seed=0)
+    assert unrelated.stopped_early and unrelated.n_permutations < 100_000
+    assert unrelated.p_interval[0] > 0.05
+
+
+def test_permutation_test_does_not_depend_on_n_jobs():
+    x, y = sample_pair(80, seed=3)
+    y = y + np.random.default_rng(4).normal(0, 27, y.size) # p-값이 alpha 근처라 여러 라운드를 도는 데이터
+    single = permutation_test(x, y, max_permutations=12_000, seed=9)
+    parallel = permutation_test(x, y, max_permutations=12_000, seed=9, n_jobs=2)
+    assert parallel == single
+    assert single.n_permutations > ROUND_TASKS * TASK_SIZE
+
+    x, y = sample_pair(100)
+    assert permutation_test(x, y, seed=9, n_jobs=2) == permutation_test(x, y, seed=9) # 조기 종료하는 경우
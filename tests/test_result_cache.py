@@ -0,0 +1,54 @@
+import numpy as np
+
+from statkit.result_cache import ResultCache, content_key, estimate_nbytes
+
+
+def test_content_key_separates_parts_by_length():
+    assert content_key("ab", "c") != content_key("a", "bc")
+    assert content_key("ab", "c") == content_key("ab", "c")
+    assert content_key(b"ab") == content_key("ab") # 업로드 파일 바이트와 같은 내용의 글자는 같은 키
+
+
+def test_evicts_least_recently_used_first():
+    cache = ResultCache(max_bytes=300)
+    cache.put("a", "A", nbytes=100)
+    cache.put("b", "B", nbytes=100)
+    cache.put("c", "C", nbytes=100)
+    assert cache.get("a") == "A" # a를 최근에 씀 → 다음에 버릴 것은 b
+    cache.put("d", "D", nbytes=100)
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in "acd"] == ["A", "C", "D"]
+    cache.put("e", "E", nbytes=250) # a, c, d를 모두 버려야 들어감
+    assert len(cache) == 1 and cache.nbytes == 250
+    assert cache.stats()["evictions"] == 4
+
+
+def test_value_larger_than_budget_is_rejected():
+    cache = ResultCache(max_bytes=100)
+    cache.put("small", "s", nbytes=50)
+    assert cache.put("big", "b", nbytes=101) is False
+    assert cache.get("big") is None
+    assert cache.get("small") == "s" # 큰 값 때문에 다른 값이 밀려나지 않음
+    assert cache.nbytes == 50
+
+
+def test_replacing_a_key_updates_byte_total():
+    cache = ResultCache(max_bytes=1000)
+    cache.put("a", np.zeros(10)) # 80바이트
+    assert cache.nbytes == 80
+    cache.put("a", np.zeros(50))
+    assert cache.nbytes == 400 and len(cache) == 1
+    cache.put("a", "x", nbytes=5)
+    assert cache.nbytes == 5
+
+
+def test_hit_and_miss_counters():
+    cache = ResultCache(max_bytes=1000)
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("a")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+    assert stats["hit_rate"] == 2 / 3
+    assert stats["nbytes"] == estimate_nbytes(1)
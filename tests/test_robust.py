@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from statkit.analysis import AnalysisOptions, run_analysis
+from statkit.robust import EXACT_THRESHOLD, _exact_median_slope, theil_sen
+
+
+def make_data(seed, n, tied_x):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=n)
+    if tied_x: # 설문 점수처럼 X 값이 겹치는 경우
+        x = rng.integers(1, 8, n).astype(np.float64)
+    y = 1.5 * x + rng.standard_t(2, n) # 꼬리가 두꺼운 오차 (이상값)
+    return x, y
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("tied_x", [False, True])
+def test_selection_path_matches_exact_median_slope(seed, tied_x):
+    x, y = make_data(seed, EXACT_THRESHOLD + 100 + 7 * seed, tied_x) # 홀수/짝수 개수의 기울기 모두
+    expected = _exact_median_slope(x, y)
+    result = theil_sen(x, y, seed=seed)
+    assert result.slope == pytest.approx(expected, rel=1e-9, abs=1e-12)
+    assert result.intercept == pytest.approx(np.median(y - expected * x), rel=1e-9, abs=1e-9)
+
+
+def test_selection_path_with_only_a_few_distinct_x_values():
+    x, y = make_data(0, EXACT_THRESHOLD + 1, tied_x=True)
+    x = np.where(x > 4, 1.0, 0.0) # X 값 두 개: 기울기는 두 그룹 사이에서만 나옴
+    assert theil_sen(x, y, seed=0).slope == pytest.approx(_exact_median_slope(x, y), rel=1e-9)
+
+
+def test_constant_x_has_no_line():
+    assert theil_sen(np.ones(EXACT_THRESHOLD + 10), np.arange(EXACT_THRESHOLD + 10.0)) is None
+
+
+def test_run_analysis_skips_theil_sen_above_max_points(monkeypatch):
+    monkeypatch.setattr("statkit.analysis.ROBUST_MAX_POINTS", 50)
+    x, y = make_data(0, 60, tied_x=False)
+    options = AnalysisOptions(figure=False, robust=True)
+    assert run_analysis(x, y, "X", "Y", options).robust_line is None
+    assert run_analysis(x[:50], y[:50], "X", "Y", options).robust_line is not None
@@ -0,0 +1,43 @@
+from collections import Counter
+
+import numpy as np
+
+from statkit.stats_engine import mode, mode_counts
+
+
+def brute_mode(values):
+    counts = Counter(values)
+    top = max(counts.values())
+    return sorted(v for v, c in counts.items() if c == top), top, len(counts)
+
+
+def test_mode_counts_returns_every_tied_mode_in_order():
+    values = [3.0, 1.0, 2.0, 3.0, 1.0, 5.0, 2.0, 4.0]
+    result = mode(values)
+    assert result.modes.tolist() == [1.0, 2.0, 3.0]
+    assert (result.count, result.n_unique) == (2, 5)
+    assert result.has_mode
+
+
+def test_mode_counts_without_repeated_value():
+    result = mode_counts(np.array([1.0, 2.5, 4.0]))
+    assert result.modes.tolist() == [1.0, 2.5, 4.0]
+    assert (result.count, result.n_unique) == (1, 3)
+    assert not result.has_mode
+
+
+def test_mode_counts_of_empty_input():
+    result = mode_counts(np.empty(0))
+    assert result.modes.size == 0
+    assert (result.count, result.n_unique) == (0, 0)
+    assert not result.has_mode
+
+
+def test_mode_matches_counter():
+    rng = np.random.default_rng(0)
+    for n in (1, 2, 7, 100, 1_000):
+        values = rng.integers(0, 20, n).astype(np.float64)
+        result = mode(values)
+        modes, count, n_unique = brute_mode(values.tolist())
+        assert result.modes.tolist() == modes
+        assert (result.count, result.n_unique) == (count, n_unique)
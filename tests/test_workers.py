@@ -0,0 +1,50 @@
+import threading
+
+import numpy as np
+import pytest
+
+from statkit.analysis import AnalysisOptions, analyze_text
+from statkit.workers import AnalysisPool, Cancelled, PoolBusy
+
+
+def test_analyze_text_with_one_job_never_starts_processes(monkeypatch):
+    # 작업량이 커서 auto_jobs가 여러 프로세스를 고르더라도 n_jobs=1이면 프로세스 풀을 만들지 않음
+    def no_processes(*args, **kwargs):
+        raise AssertionError("ProcessPoolExecutor started")
+
+    monkeypatch.setattr("statkit.analysis.auto_jobs", lambda n, n_resamples: 4)
+    monkeypatch.setattr("concurrent.futures.ProcessPoolExecutor", no_processes)
+    x = np.random.default_rng(0).normal(size=100)
+    text = lambda values: "\n".join(map(str, values))
+    options = AnalysisOptions(figure=False, bootstrap=True, permutation=True, n_resamples=2_000)
+    analysis, _ = analyze_text(text(x), text(2 * x + 1), "X", "Y", options, n_jobs=1)
+    assert analysis.bootstrap.n_resamples == 2_000
+    assert analysis.permutation.p_value < 0.01
+
+
+def test_pool_admission_limit_stats_and_cancel():
+    pool = AnalysisPool(max_workers=1, max_pending=2)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking(job):
+        started.set()
+        release.wait(5)
+        job.lap("done")
+        return "finished"
+
+    first = pool.submit("a", blocking, total_steps=1)
+    started.wait(5)
+    assert pool.submit("a", blocking) is first # 같은 입력은 같은 작업을 같이 기다림
+    second = pool.submit("b", blocking)
+    assert pool.stats() == {"jobs": 2, "max_workers": 1, "max_pending": 2}
+    with pytest.raises(PoolBusy):
+        pool.submit("c", blocking)
+
+    pool.release(second) # 기다리는 세션이 없으므로 취소
+    pool.release(first) # 아직 한 세션이 기다리므로 계속 실행
+    release.set()
+    assert first.result(5) == "finished"
+    with pytest.raises(Cancelled):
+        second.result(5)
+    assert pool.stats()["jobs"] == 0